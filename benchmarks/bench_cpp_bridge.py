@@ -0,0 +1,141 @@
+"""
+C++ bridge latency benchmark for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+Compares per-request latency of the bridge backends: the original path
+(temp file plus a new compiler process per request), the persistent worker
+pool and, if it is built, the in-process shared library. All must return
+the same results. Then compares the JSON and CBOR result formats on a large
+program, and checks that library calls release the GIL. Needs the C++ core
+built at cpp_core/minilang_compiler.exe (and optionally the library).
+
+Usage:
+    python benchmarks/bench_cpp_bridge.py [requests] [lines]
+"""
+
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the project root to path to import the bridge
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir))
+
+from cpp_bridge import CPPCompilerBridge
+from bench_incremental import generate_source
+
+PROGRAMS = [
+    'int x = 42;\nprint(x);',
+    '''function int factorial(int n) {
+    if (n <= 1) {
+        return 1;
+    }
+    return n * factorial(n - 1);
+}
+int total = 0;
+for (int i = 1; i <= 10; i = i + 1) {
+    total = total + factorial(i);
+}
+print(total);''',
+    'int x = 5;\nfloat y = x + true;',
+    'int x = ;',
+]
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def measure(compile_source, requests):
+    latencies = []
+    for i in range(requests):
+        start = time.perf_counter()
+        compile_source(PROGRAMS[i % len(PROGRAMS)])
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+def compare_formats(line_count, repeats=5):
+    source = generate_source(line_count)
+    print(f"\nResult formats on a {line_count}-line program (best of {repeats})")
+    print(f"{'format':<8} {'bytes':>10} {'status ms':>10} {'full ms':>9}")
+    print("-" * 40)
+    results = {}
+    for result_format in ('json', 'cbor'):
+        bridge = CPPCompilerBridge('worker', pool_size=1, result_format=result_format)
+        try:
+            bridge.compile(PROGRAMS[0])
+            size = len(bridge.pool.request(source.encode('utf-8')))
+            status_times, full_times = [], []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                result = bridge.compile(source)
+                result["success"], result["errors"]
+                status_times.append(time.perf_counter() - start)
+                result["tokens"], result["ast"], result["symbol_table"]
+                full_times.append(time.perf_counter() - start)
+            results[result_format] = dict(result)
+        finally:
+            bridge.close()
+        print(f"{result_format:<8} {size:>10} {min(status_times) * 1000:>10.1f} "
+              f"{min(full_times) * 1000:>9.1f}")
+    assert results['json'] == results['cbor']
+
+def check_gil_released(line_count):
+    """Count Python loop iterations on another thread while the library compiles."""
+    bridge = CPPCompilerBridge('library')
+    source = generate_source(line_count)
+    done = threading.Event()
+    spins = 0
+
+    def spin():
+        nonlocal spins
+        while not done.is_set():
+            spins += 1
+
+    spinner = threading.Thread(target=spin)
+    spinner.start()
+    start = time.perf_counter()
+    bridge.library.compile(source.encode('utf-8'))  # Native call only, no decoding
+    elapsed = time.perf_counter() - start
+    done.set()
+    spinner.join()
+    print(f"\nPython thread ran {spins} iterations during a {elapsed * 1000:.0f} ms library compile "
+          f"({'GIL released' if spins > 1000 else 'GIL held'})")
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    line_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    bridges = {
+        "process per request": CPPCompilerBridge('subprocess'),
+        "worker pool": CPPCompilerBridge('worker', pool_size=1),
+        "in-process library": CPPCompilerBridge('library'),
+    }
+    bridges = {name: bridge for name, bridge in bridges.items() if bridge.is_cpp_available()}
+    if not bridges:
+        sys.exit("Build the C++ core first (see README_CPP.md)")
+
+    try:
+        reference = next(iter(bridges.values()))
+        for source in PROGRAMS + [""]:  # An empty source is an empty program on every path
+            for bridge in bridges.values():
+                assert bridge.compile(source) == reference.compile(source)
+
+        print(f"{'path':<22} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8}")
+        print("-" * 50)
+        for name, bridge in bridges.items():
+            latencies = measure(bridge.compile, requests)
+            print(f"{name:<22} {percentile(latencies, 0.50) * 1000:>8.2f} "
+                  f"{percentile(latencies, 0.99) * 1000:>8.2f} "
+                  f"{statistics.mean(latencies) * 1000:>8.2f}")
+    finally:
+        for bridge in bridges.values():
+            bridge.close()
+
+    compare_formats(line_count)
+    if "in-process library" in bridges:
+        check_gil_released(line_count)
+
+if __name__ == "__main__":
+    main()
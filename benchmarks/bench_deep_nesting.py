@@ -0,0 +1,66 @@
+"""
+Deep nesting benchmark for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+Parses and type-checks programs nested n levels deep in one construct each
+(blocks, loops, else-if chains, functions, parentheses, unary operators,
+calls and binary operators), with the interpreter's recursion limit left
+at its default. The parser and the type checker keep their nesting on
+explicit stacks, so every shape must go through without errors however
+far n exceeds that limit, and the time per level should stay flat as n
+grows.
+
+Usage:
+    python benchmarks/bench_deep_nesting.py [depth]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path to import our modules
+src_dir = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(src_dir))
+
+from parser import Parser
+from scanner import Scanner
+from semantic_analyzer import TypeChecker
+
+def shapes(n: int):
+    """name -> a valid program nested n deep in that construct."""
+    return {
+        'blocks': '{' * n + 'print(1);' + '}' * n,
+        'while': 'while (true) ' * n + 'print(1);',
+        'else-if': 'int x = 1;\n' + ''.join(f'if (x == {i}) print({i}); else ' for i in range(n)) + 'print(0);',
+        'for': 'for (int i = 0; i < 1; i = i + 1) {' * n + 'print(1);' + '}' * n,
+        'do-while': 'do { ' * n + 'print(1);' + ' } while (true);' * n,
+        'functions': 'function int f(int x) { ' * n + 'return 1; ' + '}' * n,
+        'parens': 'print(' + '(' * n + '1' + ')' * n + ');',
+        'unary': 'print(' + '-' * n + '1);',
+        'calls': 'function int f(int x) { return x; }\nprint(' + 'f(' * n + '1' + ')' * n + ');',
+        'left-assoc': 'print(1' + ' + 1' * n + ');',
+        'right-nested': 'print(' + '1 + (' * n + '1' + ')' * n + ');',
+    }
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    print(f"depth {depth}, recursion limit {sys.getrecursionlimit()}")
+    print(f"{'shape':<13} {'tokens':>8} {'parse ms':>9} {'check ms':>9} {'us/level':>9} {'errors':>7}")
+    print("-" * 60)
+    for name, source in shapes(depth).items():
+        tokens = Scanner(source).tokenize()
+        start = time.perf_counter()
+        parser = Parser(tokens)
+        ast = parser.parse()
+        parsed = time.perf_counter()
+        checker = TypeChecker()
+        checker.analyze(ast)
+        checked = time.perf_counter()
+        errors = len(parser.errors) + len(checker.errors)
+        print(f"{name:<13} {len(tokens):>8} {(parsed - start) * 1000:>9.1f} {(checked - parsed) * 1000:>9.1f} "
+              f"{(checked - start) / depth * 1e6:>9.2f} {errors:>7}")
+
+if __name__ == "__main__":
+    main()
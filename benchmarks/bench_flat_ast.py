@@ -0,0 +1,108 @@
+"""
+Flat AST benchmark for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+Compares the object tree the parser builds with the same program packed
+into a FlatAST, on a generated program of about a million nodes:
+  - retained memory of each form
+  - pickle size, dump and load time of each form
+  - type checking the tree vs the FlatAST views, and the memory each keeps
+    while it runs (the checker's memo; for the flat form also the views)
+  - packing the tree and rebuilding it
+
+Both forms must check with the same errors and round-trip to equal trees.
+
+Usage:
+    python benchmarks/bench_flat_ast.py [statements]
+"""
+
+import gc
+import pickle
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add src directory to path to import our modules
+src_dir = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(src_dir))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from flat_ast import FlatAST
+from parser import Parser
+from scanner import Scanner
+from semantic_analyzer import TypeChecker
+from program_generator import generate_program
+
+MB = 1024 * 1024
+
+def retained(build):
+    """Return (result, bytes still allocated by build once it returns)."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+def timed(run):
+    """Return (result, seconds)."""
+    start = time.perf_counter()
+    result = run()
+    return result, time.perf_counter() - start
+
+def check(root):
+    """Type-check root; returns the checker."""
+    checker = TypeChecker()
+    checker.analyze(root)
+    return checker
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 14000
+
+    source = generate_program(statements=statements, nesting_depth=4, functions=100,
+                              expression_depth=4, seed=0)
+    tokens = Scanner(source).tokenize()
+    # The tree is measured as to_tree() rebuilds it, without the tokens the parser keeps
+    packed = FlatAST.from_tree(Parser(tokens).parse())
+    del tokens
+    tree, tree_bytes = retained(packed.to_tree)
+    flat, flat_bytes = retained(lambda: FlatAST.from_tree(tree))
+    del packed
+    nodes = len(flat)
+
+    print(f"{statements} statements, {nodes:,} nodes, {len(flat.constants):,} constants")
+    print()
+    print(f"{'form':<6} {'retained':>10} {'bytes/node':>11} {'pickle':>10} {'dump s':>8} {'load s':>8}")
+    print("-" * 58)
+    for name, form, size in (('tree', tree, tree_bytes), ('flat', flat, flat_bytes)):
+        data, dump_time = timed(lambda: pickle.dumps(form, pickle.HIGHEST_PROTOCOL))
+        _, load_time = timed(lambda: pickle.loads(data))
+        print(f"{name:<6} {size / MB:>8.1f}MB {size / nodes:>11.1f} {len(data) / MB:>8.1f}MB "
+              f"{dump_time:>8.2f} {load_time:>8.2f}")
+    print(f"flat columns alone: {flat.nbytes() / MB:.1f} MB ({flat.nbytes() / nodes:.1f} bytes/node)")
+
+    tree_checker, tree_check_time = timed(lambda: check(tree))
+    flat_checker, flat_check_time = timed(lambda: check(flat.root))
+    if [str(error) for error in tree_checker.errors] != [str(error) for error in flat_checker.errors]:
+        sys.exit("The tree and the flat form checked with different errors")
+    del tree_checker, flat_checker
+    _, tree_check_bytes = retained(lambda: check(tree))
+    flat.release_views()
+    _, view_bytes = retained(lambda: check(flat.root))
+    flat.release_views()
+
+    _, pack_time = timed(lambda: FlatAST.from_tree(tree))
+    rebuilt, rebuild_time = timed(flat.to_tree)
+    if rebuilt != tree:
+        sys.exit("The flat form did not rebuild the same tree")
+
+    print()
+    print(f"type check tree  {tree_check_time:>8.2f} s ({tree_check_bytes / MB:.1f} MB allocated while checking)")
+    print(f"type check views {flat_check_time:>8.2f} s ({view_bytes / MB:.1f} MB allocated while checking, views included)")
+    print(f"from_tree        {pack_time:>8.2f} s")
+    print(f"to_tree          {rebuild_time:>8.2f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Hash-consing benchmark for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+Parses the same programs with and without Parser(hash_cons=True):
+  - a generated program, whose expressions rarely repeat
+  - programs of n statements that each add one of k constant expressions
+    to a variable, drawn with repetition (unrolled loops, lookup tables)
+
+For each it reports the node objects built, the memory the tree keeps,
+and the time to parse and to type-check it. Both parses must give equal
+trees, with equal structural hashes.
+
+Usage:
+    python benchmarks/bench_hash_cons.py [statements]
+"""
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add src directory to path to import our modules
+src_dir = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(src_dir))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from parser import Parser
+from scanner import Scanner
+from semantic_analyzer import TypeChecker
+from program_generator import GeneratorConfig, ProgramGenerator, generate_program
+
+MB = 1024 * 1024
+
+def repetitive_program(statements: int, distinct: int, depth: int = 4, seed: int = 0) -> str:
+    """statements additions of distinct constant expressions, drawn with repetition."""
+    generator = ProgramGenerator(GeneratorConfig(functions=0, expression_depth=depth, seed=seed))
+    # Only literals are visible in an empty scope, so every expression is constant
+    pool = [generator.expression([{}], 'int', depth) for _ in range(distinct)]
+    choose = random.Random(seed).choice
+    lines = ['int x = 0;']
+    lines += [f"x = x + {choose(pool)};" for _ in range(statements)]
+    lines.append('print(x);')
+    return '\n'.join(lines) + '\n'
+
+def node_objects(root) -> int:
+    """Distinct node objects reachable from root (a shared node counts once)."""
+    seen = {id(root)}
+    stack = [root]
+    while stack:
+        for child in stack.pop().subnodes():
+            if id(child) not in seen:
+                seen.add(id(child))
+                stack.append(child)
+    return len(seen)
+
+def parse(tokens, hash_cons: bool):
+    return Parser(tokens, hash_cons=hash_cons).parse()
+
+def retained(tokens, hash_cons: bool) -> int:
+    """Bytes the parsed tree keeps once the parser is gone."""
+    gc.collect()
+    tracemalloc.start()
+    ast = parse(tokens, hash_cons)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del ast
+    return size
+
+def best_time(run, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    workloads = {
+        'generated': generate_program(statements=statements // 4, nesting_depth=4, functions=50,
+                                      expression_depth=4, seed=0),
+    }
+    for distinct in (10, 100, 1000):
+        workloads[f'{distinct} constants'] = repetitive_program(statements, distinct)
+
+    print(f"{'program':<15} {'consing':<8} {'nodes':>9} {'retained':>10} {'parse s':>8} {'check s':>8}")
+    print("-" * 63)
+    for name, source in workloads.items():
+        tokens = Scanner(source).tokenize()
+        plain, shared = parse(tokens, False), parse(tokens, True)
+        if plain != shared or hash(plain) != hash(shared):
+            sys.exit(f"{name}: hash-consing changed the tree")
+        del plain, shared
+        for hash_cons in (False, True):
+            ast = parse(tokens, hash_cons)
+            nodes = node_objects(ast)
+            size = retained(tokens, hash_cons)
+            parse_time = best_time(lambda: parse(tokens, hash_cons))
+            check_time = best_time(lambda: TypeChecker().analyze(ast))
+            print(f"{name:<15} {'on' if hash_cons else 'off':<8} {nodes:>9,} {size / MB:>8.1f}MB "
+                  f"{parse_time:>8.3f} {check_time:>8.3f}")
+
+if __name__ == "__main__":
+    main()
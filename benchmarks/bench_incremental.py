@@ -0,0 +1,94 @@
+"""
+Incremental compilation benchmark for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+Times keystroke-sized edits on a large program with IncrementalCompiler
+against recompiling the whole text, and checks that both give the same
+tokens, AST and errors.
+
+Usage:
+    python benchmarks/bench_incremental.py [lines]
+"""
+
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path to import our modules
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+sys.path.insert(0, str(root_dir))
+
+from compiler import MiniLangCompiler
+from incremental import IncrementalCompiler, TextEdit
+
+def generate_source(line_count: int) -> str:
+    """A valid program of about line_count lines with no repeated names."""
+    lines = []
+    i = 0
+    while len(lines) < line_count:
+        lines.extend([
+            f"int value{i} = {i};",
+            f"function int scaled{i}(int n) {{",
+            f"    int result = n * 2 + value{i};",
+            f"    if (result > 100) {{",
+            f"        result = result - 100;",
+            f"    }}",
+            f"    return result;",
+            f"}}",
+            f"print(scaled{i}(value{i}));",
+            "",
+        ])
+        i += 1
+    return '\n'.join(lines)
+
+def same_result(incremental, full) -> bool:
+    def summary(record):
+        tokens = [(t.type, t.value, t.line, t.column) for t in record.tokens]
+        return record.failed_phase, tokens, record.ast, [str(e) for e in record.errors]
+    return summary(incremental) == summary(full)
+
+def main():
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    source = generate_source(line_count)
+    middle = (line_count // 20) * 10 + 1  # An 'int valueN = N;' line
+
+    with contextlib.redirect_stdout(io.StringIO()):  # Silence per-error console output
+        start = time.perf_counter()
+        compiler = IncrementalCompiler(source)
+        initial = time.perf_counter() - start
+
+    literal_column = compiler.lines[middle - 1].index('=') + 3
+    edits = [
+        ("type a digit", TextEdit(middle, literal_column, middle, literal_column, "7")),
+        ("delete the ';'", TextEdit(middle, len(compiler.lines[middle - 1]) + 1,
+                                    middle, len(compiler.lines[middle - 1]) + 2, "")),
+        ("retype the ';'", TextEdit(middle, len(compiler.lines[middle - 1]) + 1,
+                                    middle, len(compiler.lines[middle - 1]) + 1, ";")),
+        ("insert a line", TextEdit(middle, 1, middle, 1, "int extra = 1;\n")),
+        ("delete the line", TextEdit(middle, 1, middle + 1, 1, "")),
+        ("change a type", TextEdit(middle, 1, middle, 4, "float")),
+    ]
+
+    print(f"{line_count} lines, initial build {initial * 1000:.0f} ms")
+    print(f"{'edit':<16} {'incremental ms':>15} {'full ms':>9} {'speedup':>8}  phase")
+    print("-" * 62)
+    for name, edit in edits:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            record = compiler.apply_edit(edit)
+            incremental_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            full = MiniLangCompiler().compile(compiler.source)
+            full_time = time.perf_counter() - start
+
+        assert same_result(record, full), f"Results differ after '{name}'"
+        print(f"{name:<16} {incremental_time * 1000:>15.2f} {full_time * 1000:>9.0f} "
+              f"{full_time / incremental_time:>7.0f}x  {record.failed_phase or 'ok'}")
+
+if __name__ == "__main__":
+    main()
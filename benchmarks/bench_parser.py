@@ -0,0 +1,161 @@
+"""
+Expression parsing benchmark for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+Times Parser on expression-heavy programs against ChainParser, which parses
+expressions the way Parser did before its Pratt loop: one function per
+precedence level, each calling match(). Expressions are generated with
+few parentheses so that precedence and associativity do the work, and
+both parsers must build identical trees.
+
+Usage:
+    python benchmarks/bench_parser.py [statements] [rounds]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path to import our modules
+src_dir = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(src_dir))
+
+from ast_nodes import *
+from parser import Parser
+from scanner import Scanner
+from tokens import TokenType
+
+class ChainParser(Parser):
+    """Parser with the seven-level recursive descent expression chain (the baseline)."""
+
+    def parse_expression(self) -> Expression:
+        return self.parse_logical_or()
+
+    def parse_logical_or(self) -> Expression:
+        expr = self.parse_logical_and()
+        while self.match(TokenType.OR):
+            expr = BinaryOp(expr, 'or', self.parse_logical_and())
+        return expr
+
+    def parse_logical_and(self) -> Expression:
+        expr = self.parse_equality()
+        while self.match(TokenType.AND):
+            expr = BinaryOp(expr, 'and', self.parse_equality())
+        return expr
+
+    def parse_equality(self) -> Expression:
+        expr = self.parse_relational()
+        while self.match(TokenType.EQUAL, TokenType.NOT_EQUAL):
+            operator = '==' if self.previous_token().type == TokenType.EQUAL else '!='
+            expr = BinaryOp(expr, operator, self.parse_relational())
+        return expr
+
+    def parse_relational(self) -> Expression:
+        expr = self.parse_additive()
+        while self.match(TokenType.GREATER_THAN, TokenType.LESS_THAN,
+                         TokenType.GREATER_EQUAL, TokenType.LESS_EQUAL):
+            operator = {TokenType.GREATER_THAN: '>', TokenType.LESS_THAN: '<',
+                        TokenType.GREATER_EQUAL: '>=', TokenType.LESS_EQUAL: '<='}[self.previous_token().type]
+            expr = BinaryOp(expr, operator, self.parse_additive())
+        return expr
+
+    def parse_additive(self) -> Expression:
+        expr = self.parse_multiplicative()
+        while self.match(TokenType.PLUS, TokenType.MINUS):
+            operator = '+' if self.previous_token().type == TokenType.PLUS else '-'
+            expr = BinaryOp(expr, operator, self.parse_multiplicative())
+        return expr
+
+    def parse_multiplicative(self) -> Expression:
+        expr = self.parse_unary()
+        while self.match(TokenType.MULTIPLY, TokenType.DIVIDE):
+            operator = '*' if self.previous_token().type == TokenType.MULTIPLY else '/'
+            expr = BinaryOp(expr, operator, self.parse_unary())
+        return expr
+
+    def parse_unary(self) -> Expression:
+        if self.match(TokenType.NOT, TokenType.MINUS):
+            operator = 'not' if self.previous_token().type == TokenType.NOT else '-'
+            return UnaryOp(operator, self.parse_unary())
+        return self.parse_primary()
+
+    def parse_primary(self) -> Expression:
+        if self.check(TokenType.BOOLEAN_LITERAL):
+            return BooleanLiteral(self.advance().value)
+        if self.check(TokenType.INTEGER_LITERAL):
+            return IntegerLiteral(self.advance().value)
+        if self.check(TokenType.FLOAT_LITERAL):
+            return FloatLiteral(self.advance().value)
+        if self.check(TokenType.IDENTIFIER):
+            name = self.advance().value
+            if self.match(TokenType.LEFT_PAREN):
+                arguments = []
+                while not self.check(TokenType.RIGHT_PAREN) and not self.check(TokenType.EOF):
+                    arguments.append(self.parse_expression())
+                    if not self.check(TokenType.RIGHT_PAREN):
+                        self.consume(TokenType.COMMA, "Expected ',' between arguments")
+                self.consume(TokenType.RIGHT_PAREN, "Expected ')' after arguments")
+                return FunctionCall(name, arguments)
+            return Identifier(name)
+        if self.match(TokenType.LEFT_PAREN):
+            expr = self.parse_expression()
+            self.consume(TokenType.RIGHT_PAREN, "Expected ')' after expression")
+            return expr
+        return super().parse_primary()  # Reports the error
+
+OPERATORS = ('or', 'and', '==', '!=', '<', '>', '<=', '>=', '+', '-', '*', '/')
+
+def expression(rng: random.Random, depth: int) -> str:
+    """A random, mostly unparenthesized expression (types are not checked)."""
+    if depth <= 0 or rng.random() < 0.2:
+        choice = rng.random()
+        if choice < 0.4:
+            return str(rng.randint(0, 999))
+        if choice < 0.6:
+            return f"{rng.uniform(0, 100):.2f}"
+        if choice < 0.7:
+            return rng.choice(('true', 'false'))
+        if choice < 0.95:
+            return f"v{rng.randint(0, 50)}"
+        return f"f{rng.randint(0, 9)}({expression(rng, depth - 2)})"
+    if rng.random() < 0.1:
+        return f"{rng.choice(('-', 'not '))}{expression(rng, depth - 1)}"
+    left = expression(rng, depth - 1)
+    right = expression(rng, depth - 1)
+    text = f"{left} {rng.choice(OPERATORS)} {right}"
+    return f"({text})" if rng.random() < 0.1 else text
+
+def generate_source(statements: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return '\n'.join(f"x = {expression(rng, 5)};" for _ in range(statements)) + '\n'
+
+def best_time(parser_class, tokens, rounds: int) -> float:
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        parser_class(tokens).parse()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    tokens = Scanner(generate_source(statements)).tokenize()
+    pratt_parser, chain_parser = Parser(tokens), ChainParser(tokens)
+    if pratt_parser.parse() != chain_parser.parse() or pratt_parser.errors or chain_parser.errors:
+        sys.exit("The Pratt and chain parsers built different trees")
+
+    print(f"{statements} assignments, {len(tokens)} tokens")
+    print(f"{'parser':<8} {'ms':>9} {'tokens/s':>12}")
+    print("-" * 31)
+    times = {}
+    for name, parser_class in (('chain', ChainParser), ('pratt', Parser)):
+        times[name] = best_time(parser_class, tokens, rounds)
+        print(f"{name:<8} {times[name] * 1000:>9.2f} {len(tokens) / times[name]:>12,.0f}")
+    print(f"speedup  {times['chain'] / times['pratt']:>9.2f}x")
+
+if __name__ == "__main__":
+    main()
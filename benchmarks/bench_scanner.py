@@ -0,0 +1,113 @@
+"""
+Scanner throughput benchmark for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+Compares the character-level Scanner against the table-driven RegexScanner
+on multi-megabyte MiniLang sources and reports throughput in MB/s.
+
+Usage:
+    python benchmarks/bench_scanner.py [size_mb] [file.ml ...]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path to import our modules
+src_dir = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(src_dir))
+
+from scanner import SCANNER_ENGINES
+
+SAMPLE_PROGRAM = '''// Recursive factorial function
+function int factorial(int n) {
+    if (n <= 1) {
+        return 1;
+    } else {
+        int result = n * factorial(n - 1);
+        return result;
+    }
+}
+
+int sum = 0;
+float pi = 3.14159;
+bool flag = true;
+
+for (int i = 1; i <= 10; i = i + 1) {
+    sum = sum + i * 2 - 1;
+}
+
+while (sum > 0 and not flag) {
+    sum = sum - 1;
+}
+
+do {
+    print(sum);
+    sum = sum - 1;
+} while (sum >= 0 or flag == false);
+
+print(factorial(5));
+'''
+
+def generate_source(size_mb: float) -> str:
+    """Repeat the sample program until the source is at least size_mb megabytes."""
+    target = int(size_mb * 1024 * 1024)
+    repeats = target // len(SAMPLE_PROGRAM) + 1
+    return SAMPLE_PROGRAM * repeats
+
+def time_engine(engine: str, source: str, rounds: int = 3):
+    """Return (best seconds, tokens) for scanning source with engine."""
+    best = None
+    tokens = []
+    for _ in range(rounds):
+        scanner = SCANNER_ENGINES[engine](source)
+        start = time.perf_counter()
+        tokens = scanner.tokenize()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, tokens
+
+def run_benchmark(name: str, source: str):
+    """Benchmark every scanner engine on a single source."""
+    size_mb = len(source.encode('utf-8')) / (1024 * 1024)
+    print(f"{name}: {size_mb:.2f} MB")
+    print("-" * 60)
+
+    results = {}
+    for engine in SCANNER_ENGINES:
+        seconds, tokens = time_engine(engine, source)
+        results[engine] = (seconds, tokens)
+        print(f"  {engine:<8} {seconds:8.3f} s  {size_mb / seconds:8.2f} MB/s  "
+              f"{len(tokens):>10,} tokens")
+
+    reference = results['char'][1]
+    for engine, (seconds, tokens) in results.items():
+        same = [(t.type, t.value, t.line, t.column) for t in tokens] == \
+               [(t.type, t.value, t.line, t.column) for t in reference]
+        if not same:
+            print(f"  ✗ {engine} token stream differs from the char scanner!")
+
+    speedup = results['char'][0] / results['regex'][0]
+    print(f"  regex speedup: {speedup:.2f}x")
+    print()
+
+def main():
+    size_mb = 4.0
+    files = []
+    for arg in sys.argv[1:]:
+        if arg.endswith('.ml'):
+            files.append(arg)
+        else:
+            size_mb = float(arg)
+
+    if files:
+        for filename in files:
+            with open(filename, 'r', encoding='utf-8') as file:
+                run_benchmark(filename, file.read())
+    else:
+        run_benchmark("generated", generate_source(size_mb))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Streaming parser memory benchmark for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+Compares peak memory of the list-based front end (Scanner.tokenize() then
+Parser) against StreamingParser fed by Scanner.iter_tokens(). The AST is
+the same size in both cases, so the difference is the token list.
+
+Usage:
+    python benchmarks/bench_streaming.py [size_mb ...]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add src directory to path to import our modules
+src_dir = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(src_dir))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from scanner import create_scanner
+from parser import Parser, StreamingParser
+from bench_scanner import generate_source
+
+def parse_list(source: str):
+    tokens = create_scanner(source, 'regex').tokenize()
+    return Parser(tokens).parse()
+
+def parse_streaming(source: str):
+    scanner = create_scanner(source, 'regex')
+    return StreamingParser(scanner.iter_tokens()).parse()
+
+def measure(parse, source: str):
+    """Return (seconds, peak MB) for one front-end run."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    ast = parse(source)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert ast is not None
+    return elapsed, peak / (1024 * 1024)
+
+def main():
+    sizes = [float(arg) for arg in sys.argv[1:]] or [0.25, 0.5, 1.0]
+
+    print(f"{'size':>8}  {'list peak':>10}  {'stream peak':>11}  {'saved':>7}  {'list s':>7}  {'stream s':>8}")
+    print("-" * 64)
+    for size_mb in sizes:
+        source = generate_source(size_mb)
+        list_time, list_peak = measure(parse_list, source)
+        stream_time, stream_peak = measure(parse_streaming, source)
+        saved = 100 * (1 - stream_peak / list_peak)
+        print(f"{size_mb:>6.2f}MB  {list_peak:>8.1f}MB  {stream_peak:>9.1f}MB  {saved:>6.1f}%  "
+              f"{list_time:>7.2f}  {stream_time:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Benchmark suite for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+Generates a seeded corpus with program_generator and measures the
+throughput of the Python scanner, parser and type checker, Python
+end-to-end compilation of valid and invalid programs, and end-to-end
+compilation through every CPPCompilerBridge backend that is built.
+
+Results can be saved as JSON together with the commit they were measured
+on, and two result files can be compared to spot regressions.
+
+Usage:
+    python benchmarks/bench_suite.py [--size small|medium|large] [--rounds N] [--output FILE]
+    python benchmarks/bench_suite.py --compare BASELINE.json CURRENT.json [--threshold 0.1]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Add src directory to path to import our modules
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir / "src"))
+sys.path.insert(0, str(root_dir))
+
+from scanner import Scanner
+from parser import Parser
+from semantic_analyzer import TypeChecker
+from compiler import MiniLangCompiler
+from cpp_bridge import CPPCompilerBridge
+from program_generator import ERROR_KINDS, GeneratorConfig, ProgramGenerator
+
+# (corpus shape, number of valid programs)
+SIZES = {
+    'small': (GeneratorConfig(statements=50, nesting_depth=2, functions=5, expression_depth=2), 20),
+    'medium': (GeneratorConfig(statements=500, nesting_depth=3, functions=20, expression_depth=3), 10),
+    'large': (GeneratorConfig(statements=5000, nesting_depth=4, functions=100, expression_depth=4), 3),
+}
+CPP_BACKENDS = ('library', 'worker', 'subprocess')
+
+def build_corpus(config: GeneratorConfig, count: int):
+    """count valid programs plus one invalid program per error kind, seeded from config.seed."""
+    valid = [ProgramGenerator(replace(config, seed=config.seed + i)).generate() for i in range(count)]
+    generator = ProgramGenerator(config)
+    invalid = {kind: generator.generate(kind) for kind in ERROR_KINDS}
+    return valid, invalid
+
+def check_corpus(valid: List[str], invalid: Dict[str, str]) -> None:
+    """Make sure the corpus compiles the way the generator promises."""
+    compiler = MiniLangCompiler()
+    for source in valid:
+        result = compiler.compile(source)
+        if not result.success:
+            sys.exit(f"Generated program failed to compile: {result.diagnostics[0]}")
+    for kind, source in invalid.items():
+        result = compiler.compile(source)
+        if result.failed_phase != kind:
+            sys.exit(f"Program with a planted {kind} error failed in phase {result.failed_phase}")
+
+def time_rounds(run: Callable[[], None], rounds: int) -> List[float]:
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return times
+
+def summarize(times: List[float], size_bytes: int, token_count: int) -> Dict[str, float]:
+    best = min(times)
+    return {
+        'best_s': best,
+        'median_s': statistics.median(times),
+        'rounds': len(times),
+        'bytes': size_bytes,
+        'tokens': token_count,
+        'mb_per_s': size_bytes / 1_000_000 / best,
+        'tokens_per_s': token_count / best,
+    }
+
+def run_suite(valid: List[str], invalid: Dict[str, str], rounds: int) -> Dict[str, Dict[str, float]]:
+    """Time every benchmark over the whole corpus; returns name -> summary."""
+    size = sum(len(source.encode('utf-8')) for source in valid)
+    token_lists = [Scanner(source).tokenize() for source in valid]
+    token_count = sum(len(tokens) for tokens in token_lists)
+    asts = [Parser(tokens).parse() for tokens in token_lists]
+    invalid_sources = list(invalid.values())
+    invalid_size = sum(len(source.encode('utf-8')) for source in invalid_sources)
+    invalid_tokens = sum(len(Scanner(source).tokenize()) for source in invalid_sources)
+
+    benchmarks = {
+        'python.scanner': (lambda: [Scanner(source).tokenize() for source in valid], size, token_count),
+        'python.parser': (lambda: [Parser(tokens).parse() for tokens in token_lists], size, token_count),
+        'python.type_checker': (lambda: [TypeChecker().analyze(ast) for ast in asts], size, token_count),
+        'python.end_to_end': (lambda: [MiniLangCompiler().compile(source) for source in valid],
+                              size, token_count),
+        'python.end_to_end_invalid': (lambda: [MiniLangCompiler().compile(source) for source in invalid_sources],
+                                      invalid_size, invalid_tokens),
+    }
+
+    bridges = []
+    for backend in CPP_BACKENDS:
+        bridge = CPPCompilerBridge(backend, pool_size=1)
+        if not bridge.is_cpp_available():
+            bridge.close()
+            continue
+        bridges.append(bridge)
+        benchmarks[f'cpp.{backend}.end_to_end'] = (
+            lambda bridge=bridge: [bridge.compile(source) for source in valid], size, token_count)
+
+    results = {}
+    try:
+        for name, (run, size_bytes, tokens) in benchmarks.items():
+            run()  # Warm up caches, imports and worker processes
+            results[name] = summarize(time_rounds(run, rounds), size_bytes, tokens)
+            print(f"  {name:<30} {results[name]['best_s'] * 1000:>10.2f} ms "
+                  f"{results[name]['mb_per_s']:>8.2f} MB/s {results[name]['tokens_per_s']:>12,.0f} tokens/s")
+    finally:
+        for bridge in bridges:
+            bridge.close()
+    return results
+
+def current_commit() -> Dict[str, object]:
+    """The commit the suite ran on, if this is a git checkout."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=root_dir, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=root_dir,
+                                capture_output=True, text=True, check=True).stdout
+        return {'commit': commit, 'dirty': bool(status.strip())}
+    except (OSError, subprocess.CalledProcessError):
+        return {'commit': None, 'dirty': None}
+
+def compare(baseline_path: str, current_path: str, threshold: float) -> bool:
+    """Print the change in best time per benchmark; True if none got slower than threshold."""
+    with open(baseline_path, 'r', encoding='utf-8') as file:
+        baseline = json.load(file)
+    with open(current_path, 'r', encoding='utf-8') as file:
+        current = json.load(file)
+    if baseline['meta']['config'] != current['meta']['config']:
+        print("Warning: the two runs used different corpora; ratios are not comparable.")
+
+    print(f"{'benchmark':<30} {'baseline ms':>12} {'current ms':>12} {'change':>8}")
+    print("-" * 66)
+    ok = True
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            print(f"{name:<30} {'-':>12} {result['best_s'] * 1000:>12.2f} {'new':>8}")
+            continue
+        before = baseline['results'][name]['best_s']
+        change = result['best_s'] / before - 1
+        flag = ''
+        if change > threshold:
+            flag = '  slower'
+            ok = False
+        elif change < -threshold:
+            flag = '  faster'
+        print(f"{name:<30} {before * 1000:>12.2f} {result['best_s'] * 1000:>12.2f} {change:>+8.1%}{flag}")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="MiniLang compiler benchmark suite")
+    parser.add_argument('--size', choices=SIZES, default='medium')
+    parser.add_argument('--statements', type=int, help="Top-level statements per program")
+    parser.add_argument('--nesting-depth', type=int)
+    parser.add_argument('--functions', type=int)
+    parser.add_argument('--expression-depth', type=int)
+    parser.add_argument('--programs', type=int, help="Number of valid programs")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--output', help="Write results to this JSON file")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'))
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Relative slowdown reported as a regression (default: 0.10)")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(0 if compare(*args.compare, args.threshold) else 1)
+
+    config, count = SIZES[args.size]
+    overrides = {'seed': args.seed}
+    for name in ('statements', 'nesting_depth', 'functions', 'expression_depth'):
+        if getattr(args, name) is not None:
+            overrides[name] = getattr(args, name)
+    config = replace(config, **overrides)
+    count = args.programs or count
+
+    valid, invalid = build_corpus(config, count)
+    check_corpus(valid, invalid)
+    size_kb = sum(len(source) for source in valid) / 1024
+    print(f"Corpus: {count} valid programs ({size_kb:.0f} KB), {len(invalid)} invalid, {config}")
+    results = run_suite(valid, invalid, args.rounds)
+
+    if args.output:
+        report = {
+            'meta': {
+                **current_commit(),
+                'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'config': {**asdict(config), 'programs': count},
+            },
+            'results': results,
+        }
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Token representation benchmark for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+Compares retained memory and scan/parse time of three token stores:
+  dict     - the original @dataclass Token with a per-instance __dict__
+  slots    - the current slotted Token in a list
+  buffer   - TokenBuffer (struct-of-arrays, values sliced from the source)
+
+Usage:
+    python benchmarks/bench_tokens.py [size_mb]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Add src directory to path to import our modules
+src_dir = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(src_dir))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import scanner as scanner_module
+from scanner import RegexScanner
+from parser import Parser
+from tokens import Token, TokenType
+from bench_scanner import generate_source
+
+@dataclass
+class DictToken:
+    """The original Token layout, kept here only for comparison."""
+    type: TokenType
+    value: Any
+    line: int
+    column: int
+
+def scan_dict(source: str):
+    scanner_module.Token = DictToken
+    try:
+        return RegexScanner(source).tokenize()
+    finally:
+        scanner_module.Token = Token
+
+def scan_slots(source: str):
+    return RegexScanner(source).tokenize()
+
+def scan_buffer(source: str):
+    return RegexScanner(source).tokenize_compact()
+
+def measure(scan, source: str):
+    """Return (tokens, seconds, retained MB) for one scan."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    tokens = scan(source)
+    elapsed = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return tokens, elapsed, retained / (1024 * 1024)
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 1.4
+    source = generate_source(size_mb)
+    print(f"Source: {len(source) / (1024 * 1024):.2f} MB")
+    print(f"{'store':<8} {'tokens':>10} {'retained':>10} {'bytes/tok':>10} {'scan s':>8} {'parse s':>8}")
+    print("-" * 60)
+
+    for name, scan in (('dict', scan_dict), ('slots', scan_slots), ('buffer', scan_buffer)):
+        tokens, scan_time, retained = measure(scan, source)
+        start = time.perf_counter()
+        ast = Parser(tokens).parse()
+        parse_time = time.perf_counter() - start
+        assert ast is not None
+        per_token = retained * 1024 * 1024 / len(tokens)
+        print(f"{name:<8} {len(tokens):>10,} {retained:>8.1f}MB {per_token:>10.1f} "
+              f"{scan_time:>8.2f} {parse_time:>8.2f}")
+        del tokens, ast
+
+if __name__ == "__main__":
+    main()
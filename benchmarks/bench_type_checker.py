@@ -0,0 +1,73 @@
+"""
+Expression typing benchmark for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+Times TypeChecker on two kinds of expression that grow with n:
+  - call chains f(f(f(...f(1)...))) nested n deep
+  - sums whose two operands are the same node, n levels deep, so the tree
+    has 2^n paths through n + 1 nodes (what hash-consed subexpressions
+    look like to the checker)
+
+Every node must be typed exactly once, so the time per level should stay
+flat as n doubles and an error planted at the bottom is reported once.
+
+Usage:
+    python benchmarks/bench_type_checker.py [max_depth]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path to import our modules
+src_dir = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(src_dir))
+
+from ast_nodes import *
+from semantic_analyzer import TypeChecker
+
+def call_chain(depth: int, leaf: Expression) -> Program:
+    """function int f(int x) { return x; } print(f(f(...f(leaf)...)));"""
+    function = FunctionDeclaration('int', 'f', [('int', 'x')], [ReturnStatement(Identifier('x'))])
+    expr = leaf
+    for _ in range(depth):
+        expr = FunctionCall('f', [expr])
+    return Program([function, PrintStatement(expr)])
+
+def shared_sum(depth: int, leaf: Expression) -> Program:
+    """print(e_depth) where e_0 = leaf and e_k+1 = e_k + e_k (one shared node)."""
+    expr = leaf
+    for _ in range(depth):
+        expr = BinaryOp(expr, '+', expr)
+    return Program([PrintStatement(expr)])
+
+def check(program: Program):
+    """Return (seconds, expressions typed, errors) for one analysis."""
+    checker = TypeChecker()
+    start = time.perf_counter()
+    checker.analyze(program)
+    elapsed = time.perf_counter() - start
+    return elapsed, len(checker.expression_types), len(checker.errors)
+
+def main():
+    max_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 3200
+
+    shapes = {'call chain': call_chain, 'shared sum': shared_sum}
+    print(f"{'shape':<12} {'depth':>7} {'ms':>9} {'us/level':>9} {'typed':>7} {'errors':>7}")
+    print("-" * 56)
+    for name, build in shapes.items():
+        depth = 100
+        while depth <= max_depth:
+            elapsed, typed, _ = check(build(depth, IntegerLiteral(1)))
+            # The same shape with an undefined name at the bottom
+            _, _, errors = check(build(depth, Identifier('undefined')))
+            # Each node typed once: the chain's calls and leaf plus f's x, or the sums and leaf
+            assert typed == depth + (2 if build is call_chain else 1), (name, depth, typed)
+            assert errors == 1, (name, depth, errors)
+            print(f"{name:<12} {depth:>7} {elapsed * 1000:>9.2f} {elapsed / depth * 1e6:>9.2f} "
+                  f"{typed:>7} {errors:>7}")
+            depth *= 2
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Execution backend benchmark for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+Times the tree-walking Interpreter against the bytecode VirtualMachine on
+loop- and call-heavy programs. Bytecode compilation is timed separately
+from execution; outputs of both backends are checked to be identical.
+
+Usage:
+    python benchmarks/bench_vm.py [n]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path to import our modules
+src_dir = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(src_dir))
+
+from scanner import Scanner
+from parser import Parser
+from semantic_analyzer import TypeChecker
+from interpreter import Interpreter
+from bytecode import compile_to_bytecode
+from vm import VirtualMachine
+
+PROGRAMS = {
+    'sum loop': '''
+        int sum = 0;
+        for (int i = 1; i <= {n}; i = i + 1) {
+            sum = sum + i;
+        }
+        print(sum);
+    ''',
+    'mixed arithmetic': '''
+        float acc = 0;
+        int i = 0;
+        while (i < {n}) {
+            if (i / 3 * 3 == i and i > 0) {
+                acc = acc + i * 0.5;
+            } else {
+                acc = acc - 1;
+            }
+            i = i + 1;
+        }
+        print(acc);
+    ''',
+    'recursive calls': '''
+        function int fib(int n) {
+            if (n < 2) {
+                return n;
+            }
+            return fib(n - 1) + fib(n - 2);
+        }
+        print(fib({depth}));
+    ''',
+}
+
+def build(template: str, n: int):
+    code = template.replace('{n}', str(n)).replace('{depth}', str(max(n.bit_length() + 4, 10)))
+    ast = Parser(Scanner(code).tokenize()).parse()
+    assert ast is not None and TypeChecker().analyze(ast)
+    return ast
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    limits = dict(max_steps=0, time_limit=0)
+
+    print(f"{'program':<18} {'ast s':>8} {'compile s':>10} {'vm s':>8} {'speedup':>8}")
+    print("-" * 56)
+    for name, template in PROGRAMS.items():
+        ast = build(template, n)
+
+        interpreter = Interpreter(**limits)
+        start = time.perf_counter()
+        assert interpreter.execute(ast), interpreter.errors
+        ast_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        program = compile_to_bytecode(ast)
+        compile_time = time.perf_counter() - start
+
+        vm = VirtualMachine(**limits)
+        start = time.perf_counter()
+        assert vm.execute(program), vm.errors
+        vm_time = time.perf_counter() - start
+
+        assert vm.get_output() == interpreter.get_output()
+        print(f"{name:<18} {ast_time:>8.3f} {compile_time:>10.4f} {vm_time:>8.3f} "
+              f"{ast_time / vm_time:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
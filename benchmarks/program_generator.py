@@ -0,0 +1,225 @@
+"""
+Synthetic MiniLang program generator for benchmarks.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+ProgramGenerator builds random but reproducible programs from a seed. The
+shape is set by the number of top-level statements, the nesting depth of
+if/while/for/do-while bodies, the number of functions and the depth of
+expression trees.
+
+Valid programs type-check in both the Python front end and the C++ core:
+every name is unique, every variable is initialized, operands have
+exactly matching types and a variable declared in a nested body is never
+used after it. An invalid program is a valid one with a single lexical,
+syntax or semantic error planted in it. The programs are meant to be
+compiled, not run: loops need not terminate and divisions may be by zero.
+
+Usage:
+    python benchmarks/program_generator.py [seed] [statements] [lexical|syntax|semantic]
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+TYPES = ('int', 'float', 'bool')
+ERROR_KINDS = ('lexical', 'syntax', 'semantic')
+
+@dataclass
+class GeneratorConfig:
+    """Shape of a generated program."""
+    statements: int = 100  # Top-level statements after the function declarations
+    nesting_depth: int = 3  # Deepest if/while/for/do-while nesting
+    functions: int = 10
+    expression_depth: int = 3  # Deepest operator nesting in one expression
+    seed: int = 0
+
+class ProgramGenerator:
+    """Seeded generator of valid and invalid MiniLang programs."""
+
+    def __init__(self, config: Optional[GeneratorConfig] = None):
+        self.config = config or GeneratorConfig()
+        self.random = random.Random(self.config.seed)
+        self.counter = 0
+        self.lines: List[str] = []
+        self.functions: List[tuple] = []  # (name, return type, parameter types)
+
+    def generate(self, error: Optional[str] = None) -> str:
+        """A program; with error set, one error of that kind is planted."""
+        if error is not None and error not in ERROR_KINDS:
+            raise ValueError(f"Unknown error kind '{error}', expected one of {ERROR_KINDS}")
+        self.random.seed(self.config.seed)
+        self.counter = 0
+        self.lines = []
+        self.functions = []
+
+        for _ in range(self.config.functions):
+            self.function_declaration()
+        scope = [{}]
+        for _ in range(self.config.statements):
+            self.statement(scope, 0, self.config.nesting_depth)
+
+        if error is not None:
+            self.plant_error(error)
+        return '\n'.join(self.lines) + '\n'
+
+    # Names and scopes
+
+    def fresh_name(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def visible(self, scope: List[Dict[str, str]], var_type: str) -> List[str]:
+        return [name for names in scope for name, name_type in names.items() if name_type == var_type]
+
+    def emit(self, indent: int, text: str) -> None:
+        self.lines.append('    ' * indent + text)
+
+    # Statements
+
+    def function_declaration(self) -> None:
+        return_type = self.random.choice(TYPES)
+        param_types = [self.random.choice(TYPES) for _ in range(self.random.randint(0, 3))]
+        name = self.fresh_name('func')
+        params = {self.fresh_name('arg'): param_type for param_type in param_types}
+        signature = ', '.join(f"{param_type} {param}" for param, param_type in params.items())
+        self.emit(0, f"function {return_type} {name}({signature}) {{")
+
+        # Functions may only call the ones declared before them, so there is no recursion
+        scope = [dict(params)]
+        for _ in range(self.random.randint(1, 4)):
+            self.statement(scope, 1, max(0, self.config.nesting_depth - 1))
+        self.emit(1, f"return {self.expression(scope, return_type, self.config.expression_depth)};")
+        self.emit(0, "}")
+        self.functions.append((name, return_type, param_types))
+
+    def statement(self, scope: List[Dict[str, str]], indent: int, depth: int) -> None:
+        kinds = ['declare', 'declare', 'assign', 'print']
+        if depth > 0:
+            kinds += ['if', 'while', 'for', 'do']
+        kind = self.random.choice(kinds)
+        max_depth = self.config.expression_depth
+
+        if kind == 'assign':
+            var_type = self.random.choice(TYPES)
+            targets = self.visible(scope, var_type)
+            if targets:
+                target = self.random.choice(targets)
+                self.emit(indent, f"{target} = {self.expression(scope, var_type, max_depth)};")
+                return
+            kind = 'declare'
+
+        if kind == 'declare':
+            var_type = self.random.choice(TYPES)
+            value = self.expression(scope, var_type, max_depth)
+            name = self.fresh_name('var')
+            self.emit(indent, f"{var_type} {name} = {value};")
+            scope[-1][name] = var_type
+        elif kind == 'print':
+            var_type = self.random.choice(TYPES)
+            self.emit(indent, f"print({self.expression(scope, var_type, max_depth)});")
+        elif kind in ('if', 'while'):
+            condition = self.expression(scope, 'bool', max_depth)
+            self.emit(indent, f"{kind} ({condition}) {{")
+            self.body(scope, indent + 1, depth - 1)
+            if kind == 'if' and self.random.random() < 0.5:
+                self.emit(indent, "} else {")
+                self.body(scope, indent + 1, depth - 1)
+            self.emit(indent, "}")
+        elif kind == 'for':
+            counter = self.fresh_name('i')
+            limit = self.random.randint(1, 100)
+            self.emit(indent, f"for (int {counter} = 0; {counter} < {limit}; {counter} = {counter} + 1) {{")
+            scope.append({counter: 'int'})
+            self.body(scope, indent + 1, depth - 1)
+            scope.pop()
+            self.emit(indent, "}")
+        else:
+            self.emit(indent, "do {")
+            self.body(scope, indent + 1, depth - 1)
+            self.emit(indent, f"}} while ({self.expression(scope, 'bool', max_depth)});")
+
+    def body(self, scope: List[Dict[str, str]], indent: int, depth: int) -> None:
+        scope.append({})
+        for _ in range(self.random.randint(1, 3)):
+            self.statement(scope, indent, depth)
+        scope.pop()
+
+    # Expressions
+
+    def expression(self, scope: List[Dict[str, str]], var_type: str, depth: int) -> str:
+        """An expression of exactly var_type with at most depth nested operators."""
+        if depth <= 0 or self.random.random() < 0.3:
+            return self.operand(scope, var_type)
+
+        if var_type == 'bool':
+            choice = self.random.random()
+            if choice < 0.4:
+                operand_type = self.random.choice(('int', 'float'))
+                operator = self.random.choice(('<', '<=', '>', '>=', '==', '!='))
+                left = self.expression(scope, operand_type, depth - 1)
+                right = self.expression(scope, operand_type, depth - 1)
+                return f"({left} {operator} {right})"
+            if choice < 0.8:
+                operator = self.random.choice(('and', 'or'))
+                left = self.expression(scope, 'bool', depth - 1)
+                right = self.expression(scope, 'bool', depth - 1)
+                return f"({left} {operator} {right})"
+            return f"not {self.expression(scope, 'bool', depth - 1)}"
+
+        if self.random.random() < 0.1:
+            return f"-{self.expression(scope, var_type, depth - 1)}"
+        operator = self.random.choice(('+', '-', '*', '/'))
+        left = self.expression(scope, var_type, depth - 1)
+        right = self.expression(scope, var_type, depth - 1)
+        return f"({left} {operator} {right})"
+
+    def operand(self, scope: List[Dict[str, str]], var_type: str) -> str:
+        candidates = self.visible(scope, var_type)
+        functions = [function for function in self.functions if function[1] == var_type]
+        choice = self.random.random()
+        if functions and choice < 0.15:
+            name, _, param_types = self.random.choice(functions)
+            arguments = ', '.join(self.operand(scope, param_type) for param_type in param_types)
+            return f"{name}({arguments})"
+        if candidates and choice < 0.6:
+            return self.random.choice(candidates)
+        return self.literal(var_type)
+
+    def literal(self, var_type: str) -> str:
+        if var_type == 'int':
+            return str(self.random.randint(0, 1000))
+        if var_type == 'float':
+            return f"{self.random.uniform(0, 100):.2f}"
+        return self.random.choice(('true', 'false'))
+
+    # Errors
+
+    def plant_error(self, kind: str) -> None:
+        """Put one error of the given kind on a random statement line."""
+        candidates = [i for i, line in enumerate(self.lines) if line.rstrip().endswith(';')]
+        index = self.random.choice(candidates)
+        line = self.lines[index]
+        if kind == 'lexical':
+            cut = line.rindex(';')
+            self.lines[index] = line[:cut] + ' @' + line[cut:]
+        elif kind == 'syntax':
+            self.lines[index] = line.rstrip()[:-1] + ' )'
+        else:
+            indent = line[:len(line) - len(line.lstrip())]
+            self.lines.insert(index, f"{indent}int {self.fresh_name('bad')} = {self.fresh_name('undefined')};")
+
+def generate_program(statements: int = 100, nesting_depth: int = 3, functions: int = 10,
+                     expression_depth: int = 3, seed: int = 0, error: Optional[str] = None) -> str:
+    """Shortcut for ProgramGenerator(GeneratorConfig(...)).generate(error)."""
+    config = GeneratorConfig(statements, nesting_depth, functions, expression_depth, seed)
+    return ProgramGenerator(config).generate(error)
+
+if __name__ == "__main__":
+    import sys
+
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    statements = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    error = sys.argv[3] if len(sys.argv) > 3 else None
+    print(generate_program(statements, nesting_depth=2, functions=2, seed=seed, error=error), end='')
@@ -39,6 +39,7 @@ if not exist json.hpp (
 REM Compile
 echo [3/3] Compiling C++ compiler core...
 g++ -std=c++17 -O2 -o minilang_compiler.exe main.cpp
+if %errorlevel% equ 0 g++ -std=c++17 -O2 -shared -o minilang.dll minilang_api.cpp
 
 if %errorlevel% equ 0 (
     echo.
@@ -47,6 +48,7 @@ if %errorlevel% equ 0 (
     echo =====================================
     echo.
     echo Executable: cpp_core\minilang_compiler.exe
+    echo Library:    cpp_core\minilang.dll
     echo.
     echo Testing compiler...
     echo int x = 42; print(x); | minilang_compiler.exe -
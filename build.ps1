@@ -18,9 +18,12 @@ if (!(Test-Path "cpp_core\json.hpp")) {
 # Compile
 Write-Host "Compiling..." -ForegroundColor Yellow
 g++ -std=c++17 -Wall -Wextra -O2 -o cpp_core\minilang_compiler.exe cpp_core\main.cpp
+if ($LASTEXITCODE -eq 0) {
+    g++ -std=c++17 -Wall -Wextra -O2 -shared -o cpp_core\minilang.dll cpp_core\minilang_api.cpp
+}
 
 if ($LASTEXITCODE -eq 0) {
-    Write-Host "Build successful! Executable: cpp_core\minilang_compiler.exe" -ForegroundColor Green
+    Write-Host "Build successful! Executable: cpp_core\minilang_compiler.exe, library: cpp_core\minilang.dll" -ForegroundColor Green
 } else {
     Write-Host "Build failed!" -ForegroundColor Red
     exit 1
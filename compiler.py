@@ -6,39 +6,237 @@ Course: CS-4031 - Compiler Construction
 
 import sys
 import os
+from dataclasses import dataclass, field, fields, is_dataclass
 from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 # Add src directory to path to import our modules
 current_dir = Path(__file__).parent
 src_dir = current_dir / "src"
 sys.path.insert(0, str(src_dir))
 
-from scanner import Scanner, LexicalError
-from parser import Parser, ParseError
+from scanner import Scanner, LexicalError, SCANNER_ENGINES, create_scanner
+from parser import Parser, ParseError, StreamingParser
 from semantic_analyzer import TypeChecker, SemanticError
-from ast_nodes import ASTPrinter
+from interpreter import Interpreter
+from bytecode import compile_to_bytecode, BytecodeError
+from vm import VirtualMachine
+from optimizer import fold_constants, eliminate_dead_code
+from compile_cache import CompileCache, CompilationRecord
+from batch import run_batch, format_summary
+from instrumentation import CompilerHook, Instrumentation, PhaseProfiler
+from ast_nodes import ASTPrinter, Program
+from symbol_table import SymbolTable
+from tokens import Token
 from ast_visualizer import print_ast_tree
 from clean_vertical_ast import print_clean_vertical_ast
 
+@dataclass
+class Diagnostic:
+    """One error reported by a compilation phase."""
+    phase: str  # 'read', 'lexical', 'syntax' or 'semantic'
+    message: str  # Full message, including the position when the phase reports one
+    line: int = 0
+    column: int = 0
+    
+    @classmethod
+    def from_error(cls, phase: str, error: Any) -> 'Diagnostic':
+        # Semantic errors are exceptions with a position; the other phases keep strings
+        return cls(phase, str(error), getattr(error, 'line', 0), getattr(error, 'column', 0))
+    
+    def __str__(self) -> str:
+        return self.message
+
+@dataclass
+class CompilationResult:
+    """Everything one compilation produced. Building it does no console I/O."""
+    success: bool
+    tokens: Sequence[Token] = field(default_factory=list)  # Empty when streamed, a TokenBuffer when cached
+    ast: Optional[Program] = None
+    symbol_table: Optional[SymbolTable] = None
+    diagnostics: List[Diagnostic] = field(default_factory=list)
+    errors: List[Any] = field(default_factory=list)  # The failed phase's own error objects
+    failed_phase: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)  # Seconds per phase, in run order
+    nodes_removed: Dict[str, int] = field(default_factory=dict)  # Per optimization pass
+    token_count: int = 0
+    cached: bool = False
+    
+    @property
+    def total_time(self) -> float:
+        return sum(self.timings.values())
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-data view in the shape CPPCompilerBridge returns."""
+        symbols = {}
+        if self.symbol_table is not None:
+            for name, symbol in self.symbol_table.symbols.items():
+                symbols[name] = {'type': symbol.type, 'initialized': symbol.initialized}
+        return {
+            'success': self.success,
+            'errors': [diagnostic.message for diagnostic in self.diagnostics],
+            'tokens': [{'type': token.type.name, 'value': token.value,
+                        'line': token.line, 'column': token.column} for token in self.tokens],
+            'ast': node_to_dict(self.ast),
+            'symbol_table': symbols if self.symbol_table is not None else None,
+        }
+
+def node_to_dict(node: Any) -> Any:
+    """Convert an AST (dataclass nodes) into nested dicts tagged with the node type."""
+    # Containers are filled in from an explicit stack, so any nesting depth converts
+    result = [None]
+    stack = [(node, result, 0)]
+    while stack:
+        node, container, key = stack.pop()
+        if isinstance(node, list):
+            data = [None] * len(node)
+            stack.extend((item, data, index) for index, item in enumerate(node))
+        elif is_dataclass(node):
+            data = {'type': type(node).__name__}
+            for node_field in fields(node):
+                data[node_field.name] = None  # Keeps the field order
+                stack.append((getattr(node, node_field.name), data, node_field.name))
+        else:
+            data = node
+        container[key] = data
+    return result[0]
+
 class MiniLangCompiler:
     """Main compiler class that coordinates all compilation phases."""
     
-    def __init__(self):
+    def __init__(self, scanner_engine: str = 'char', streaming: bool = False,
+                 opt_level: int = 0, cache: Optional[CompileCache] = None,
+                 hooks: Iterable[CompilerHook] = ()):
+        self.scanner_engine = scanner_engine
+        self.streaming = streaming
+        self.opt_level = opt_level  # 0: none, 1: constant folding, 2: + dead code elimination
+        self.cache = cache
+        self.hooks = list(hooks)  # Also reported to: register_hook() and MINILANG_HOOKS
         self.source_code = ""
+        self.result: Optional[CompilationResult] = None
         self.tokens = []
         self.ast = None
         self.symbol_table = None
         self.errors = []
+        self.failed_phase = None  # Phase that stopped the last compilation
+    
+    def compile(self, source: str) -> CompilationResult:
+        """Compile source without printing anything, serving it from the cache when possible."""
+        self.source_code = source
+        result = None
+        if self.cache is not None and not self.streaming:
+            record = self.cache.get(source, self.opt_level)
+            if record is not None:
+                result = self.result_from_record(record)
+        
+        if result is None:
+            result = self.run_phases(source)
+            if self.cache is not None and not self.streaming:
+                self.cache.put(source, self.make_record(result), self.opt_level)
+        
+        self.result = result
+        self.tokens = result.tokens
+        self.ast = result.ast
+        self.symbol_table = result.symbol_table
+        self.errors = list(result.errors)
+        self.failed_phase = result.failed_phase
+        return result
+    
+    def run_phases(self, source: str) -> CompilationResult:
+        """Run every compilation phase on source, reporting each to the hooks."""
+        instrumentation = Instrumentation(self.hooks)
+        instrumentation.compile_started(source)
+        result = self.run_instrumented_phases(source, instrumentation)
+        result.timings = {metrics.phase: metrics.wall_time for metrics in instrumentation.phases}
+        instrumentation.compile_finished(result.success)
+        return result
+    
+    def run_instrumented_phases(self, source: str,
+                                instrumentation: Instrumentation) -> CompilationResult:
+        result = CompilationResult(success=False)
+        
+        if self.streaming:
+            # Scanning happens inside the parser, so both phases share one timing
+            instrumentation.start('syntax')
+            scanner = create_scanner(source, self.scanner_engine)
+            parser = StreamingParser(scanner.iter_tokens())
+            ast = parser.parse()
+            result.token_count = parser.current + 1
+            instrumentation.finish(tokens=result.token_count, ast=ast,
+                                   errors=len(parser.lexical_errors) + len(parser.errors))
+            if parser.lexical_errors:
+                return self.fail(result, 'lexical', parser.lexical_errors)
+            if parser.errors:
+                result.ast = ast  # Partial, with error nodes where the parser recovered
+                return self.fail(result, 'syntax', parser.errors)
+        else:
+            instrumentation.start('lexical')
+            scanner = create_scanner(source, self.scanner_engine)
+            result.tokens = scanner.tokenize()
+            result.token_count = len(result.tokens)
+            instrumentation.finish(tokens=result.token_count, errors=len(scanner.errors))
+            if not result.tokens:
+                return self.fail(result, 'lexical', scanner.errors)
+            
+            instrumentation.start('syntax')
+            parser = Parser(result.tokens)
+            ast = parser.parse()
+            instrumentation.finish(tokens=result.token_count, ast=ast, errors=len(parser.errors))
+            if parser.errors:
+                result.ast = ast  # Partial, with error nodes where the parser recovered
+                return self.fail(result, 'syntax', parser.errors)
+        
+        if self.opt_level >= 1:
+            instrumentation.start('constant_folding')
+            ast, result.nodes_removed['constant_folding'] = fold_constants(ast)
+            instrumentation.finish(ast=ast)
+        result.ast = ast
+        
+        instrumentation.start('semantic')
+        type_checker = TypeChecker()
+        success = type_checker.analyze(ast)
+        instrumentation.finish(ast=ast, symbol_table=type_checker.symbol_table,
+                               errors=len(type_checker.errors))
+        if not success:
+            return self.fail(result, 'semantic', type_checker.errors)
+        result.symbol_table = type_checker.symbol_table
+        
+        if self.opt_level >= 2:
+            instrumentation.start('dead_code')
+            result.ast, result.nodes_removed['dead_code'] = eliminate_dead_code(result.ast)
+            instrumentation.finish(ast=result.ast)
+        
+        result.success = True
+        return result
+    
+    @staticmethod
+    def fail(result: CompilationResult, phase: str, errors: list) -> CompilationResult:
+        result.failed_phase = phase
+        result.errors = list(errors)
+        result.diagnostics = [Diagnostic.from_error(phase, error) for error in errors]
+        return result
+    
+    def make_record(self, result: CompilationResult) -> CompilationRecord:
+        """Package a compilation for the cache."""
+        return CompilationRecord(result.tokens, result.ast, result.symbol_table,
+                                 result.errors, result.failed_phase)
+    
+    def result_from_record(self, record: CompilationRecord) -> CompilationResult:
+        """Rebuild a result from a cached compilation instead of running the phases."""
+        result = CompilationResult(record.success, record.tokens, record.ast, record.symbol_table,
+                                   token_count=len(record.tokens), cached=True)
+        if not record.success:
+            self.fail(result, record.failed_phase, record.errors)
+        return result
     
     def compile_file(self, filename: str, verbose: bool = False) -> bool:
-        """Compile a MiniLang source file."""
+        """Compile a MiniLang source file, reporting progress on the console."""
         print(f"Compiling {filename}...")
         print("=" * 60)
         
-        # Read source file
         try:
             with open(filename, 'r', encoding='utf-8') as file:
-                self.source_code = file.read()
+                source = file.read()
         except FileNotFoundError:
             print(f"Error: File '{filename}' not found.")
             return False
@@ -46,144 +244,149 @@ class MiniLangCompiler:
             print(f"Error reading file: {e}")
             return False
         
+        return self.compile_string(source, verbose, banner=False)
+    
+    def compile_string(self, source: str, verbose: bool = False, banner: bool = True) -> bool:
+        """Compile MiniLang source code from a string, reporting progress on the console."""
+        if banner:
+            print("Compiling source code...")
+            print("=" * 60)
+        
         if verbose:
             print("Source Code:")
             print("-" * 40)
-            print(self.source_code)
+            print(source)
             print()
         
-        # Phase 1: Lexical Analysis
-        print("Phase 1: Lexical Analysis")
-        print("-" * 30)
-        
-        scanner = Scanner(self.source_code)
-        self.tokens = scanner.tokenize()
-        
-        if not self.tokens:
-            print("✗ Lexical analysis failed!")
-            return False
-        
-        print("✓ Lexical analysis completed successfully!")
-        print(f"Generated {len(self.tokens)} tokens.")
-        
-        if verbose:
-            print("\\nTokens:")
-            for i, token in enumerate(self.tokens):
-                print(f"{i+1:3d}: {token}")
-        
-        print()
-        
-        # Phase 2: Syntax Analysis
-        print("Phase 2: Syntax Analysis")
+        result = self.compile(source)
+        print_result(result, self.streaming, verbose)
+        return result.success
+    
+    def execute(self, max_steps: int = 1_000_000, time_limit: float = 5.0,
+                backend: str = 'ast') -> bool:
+        """Run the compiled program with the tree-walking interpreter ('ast') or the bytecode VM ('vm')."""
+        print("Phase 4: Execution" + (" (bytecode VM)" if backend == 'vm' else ""))
         print("-" * 30)
         
-        parser = Parser(self.tokens)
-        self.ast = parser.parse()
-        
-        if self.ast is None:
-            print("✗ Syntax analysis failed!")
+        if self.ast is None or self.symbol_table is None:
+            print("✗ Nothing to run: compile the program successfully first.")
             return False
         
-        print("✓ Syntax analysis completed successfully!")
-        print("AST generated.")
-        
-        if verbose:
-            print("\\nAbstract Syntax Tree:")
-            print_clean_vertical_ast(self.ast, "simple")
-        
-        print()
-        
-        # Phase 3: Semantic Analysis
-        print("Phase 3: Semantic Analysis")
-        print("-" * 30)
-        
-        type_checker = TypeChecker()
-        success = type_checker.analyze(self.ast)
+        if backend == 'vm':
+            try:
+                program = compile_to_bytecode(self.ast)
+            except BytecodeError as e:
+                print("✗ Bytecode generation failed!")
+                print(f"  - {e}")
+                return False
+            runner = VirtualMachine(max_steps, time_limit)
+            success = runner.execute(program)
+        else:
+            runner = Interpreter(max_steps, time_limit)
+            success = runner.execute(self.ast)
+        
+        print("Program Output:")
+        print(runner.get_output(), end="")
         
         if not success:
-            print(f"✗ Semantic analysis failed!")
-            print(f"Found {len(type_checker.errors)} semantic errors.")
-            for error in type_checker.errors:
+            print("✗ Execution failed!")
+            for error in runner.errors:
                 print(f"  - {error}")
             return False
         
-        print("✓ Semantic analysis completed successfully!")
-        print("No semantic errors found.")
-        self.symbol_table = type_checker.symbol_table
-        
-        if verbose:
-            print(f"\\n{self.symbol_table}")
-        
+        print(f"✓ Execution completed successfully in {runner.steps} steps (loop iterations and calls)!")
+        return True
+
+def print_diagnostics(result: CompilationResult) -> None:
+    for diagnostic in result.diagnostics:
+        print(f"  - {diagnostic}")
+
+def print_result(result: CompilationResult, streaming: bool = False, verbose: bool = False) -> None:
+    """Report a compilation on the console, phase by phase."""
+    if result.cached:
+        print("Served from compile cache (no phases re-run).")
+        if not result.success:
+            print(f"✗ {result.failed_phase.capitalize()} analysis failed!")
+            print_diagnostics(result)
+            return
+        print(f"{len(result.tokens)} tokens, AST and symbol table restored.")
         print()
         print("✓ Compilation completed successfully!")
         print("=" * 60)
-        return True
+        return
     
-    def compile_string(self, source: str, verbose: bool = False) -> bool:
-        """Compile MiniLang source code from a string."""
-        print("Compiling source code...")
-        print("=" * 60)
-        
-        self.source_code = source
-        
-        if verbose:
-            print("Source Code:")
-            print("-" * 40)
-            print(self.source_code)
-            print()
-        
-        # Phase 1: Lexical Analysis
+    if streaming:
+        print("Phase 1-2: Lexical and Syntax Analysis (streaming)")
+        print("-" * 30)
+        if result.failed_phase in ('lexical', 'syntax'):
+            print(f"✗ {result.failed_phase.capitalize()} analysis failed!")
+            print_diagnostics(result)
+            return
+        print("✓ Lexical and syntax analysis completed successfully!")
+        print(f"Consumed {result.token_count} tokens.")
+        print("AST generated.")
+        print()
+    else:
         print("Phase 1: Lexical Analysis")
         print("-" * 30)
-        
-        scanner = Scanner(self.source_code)
-        self.tokens = scanner.tokenize()
-        
-        if not self.tokens:
+        if result.failed_phase == 'lexical':
             print("✗ Lexical analysis failed!")
-            return False
-        
+            print_diagnostics(result)
+            return
         print("✓ Lexical analysis completed successfully!")
-        print(f"Generated {len(self.tokens)} tokens.")
+        print(f"Generated {len(result.tokens)} tokens.")
+        if verbose:
+            print("\nTokens:")
+            for i, token in enumerate(result.tokens):
+                print(f"{i+1:3d}: {token}")
         print()
         
-        # Phase 2: Syntax Analysis
         print("Phase 2: Syntax Analysis")
         print("-" * 30)
-        
-        parser = Parser(self.tokens)
-        self.ast = parser.parse()
-        
-        if self.ast is None:
+        if result.failed_phase == 'syntax':
             print("✗ Syntax analysis failed!")
-            return False
-        
+            print_diagnostics(result)
+            return
         print("✓ Syntax analysis completed successfully!")
         print("AST generated.")
+        if verbose:
+            print("\nAbstract Syntax Tree:")
+            print_clean_vertical_ast(result.ast, "simple")
         print()
-        
-        # Phase 3: Semantic Analysis
-        print("Phase 3: Semantic Analysis")
+    
+    if 'constant_folding' in result.nodes_removed:
+        print("Optimization: Constant Folding")
         print("-" * 30)
-        
-        type_checker = TypeChecker()
-        success = type_checker.analyze(self.ast)
-        
-        if not success:
-            print(f"✗ Semantic analysis failed!")
-            print(f"Found {len(type_checker.errors)} semantic errors.")
-            for error in type_checker.errors:
-                print(f"  - {error}")
-            return False
-        
-        print("✓ Semantic analysis completed successfully!")
-        print("No semantic errors found.")
-        self.symbol_table = type_checker.symbol_table
-        
+        print(f"✓ Removed {result.nodes_removed['constant_folding']} AST nodes.")
         print()
-        print("✓ Compilation completed successfully!")
-        print("=" * 60)
-        return True
+    
+    print("Phase 3: Semantic Analysis")
+    print("-" * 30)
+    if result.failed_phase == 'semantic':
+        print("✗ Semantic analysis failed!")
+        print(f"Found {len(result.diagnostics)} semantic errors.")
+        print_diagnostics(result)
+        return
+    print("✓ Semantic analysis completed successfully!")
+    print("No semantic errors found.")
+    if verbose:
+        print(f"\n{result.symbol_table}")
+    print()
+    
+    if 'dead_code' in result.nodes_removed:
+        print("Optimization: Dead Code Elimination")
+        print("-" * 30)
+        print(f"✓ Removed {result.nodes_removed['dead_code']} AST nodes.")
+        print()
+    
+    if verbose:
+        print("Phase timings:")
+        for phase, seconds in result.timings.items():
+            print(f"  {phase:<18} {seconds * 1000:8.2f} ms")
+        print()
+    
+    print("✓ Compilation completed successfully!")
+    print("=" * 60)
 
 def print_usage():
     """Print usage information."""
@@ -193,14 +396,61 @@ def print_usage():
     print()
     print("Usage:")
     print("  python compiler.py <file.ml> [options]")
+    print("  python compiler.py --batch DIR [-j N] [-O0|-O1|-O2]")
     print()
     print("Options:")
     print("  -v, --verbose    Enable verbose output")
+    print("  -O0, -O1, -O2    Optimization level: none, constant folding (same as -O),")
+    print("                   constant folding and dead code elimination (default: -O0)")
+    print("  --stream         Parse tokens lazily as they are scanned")
+    print("  --run            Execute the program after a successful compile")
+    print("  --backend=NAME   Execution backend for --run: ast, vm (default: ast)")
+    print("                   Both count one step per loop iteration and per call")
+    print("  --cache-dir=DIR  Reuse results of identical compilations stored in DIR")
+    print("  --profile        Report time, peak memory and counts for each phase")
+    print(f"  --scanner=NAME   Scanner engine: {', '.join(SCANNER_ENGINES)} (default: char)")
+    print("  --batch DIR      Compile every .ml file under DIR, one JSON line per file")
+    print("  -j N             Worker processes for --batch (default: CPU count)")
     print("  -h, --help       Show this help message")
     print()
     print("Examples:")
     print("  python compiler.py examples/example1_basics.ml")
     print("  python compiler.py examples/example1_basics.ml -v")
+    print("  python compiler.py --batch submissions/ -j 8 > report.jsonl")
+
+def parse_opt_level(args) -> int:
+    """Optimization level from -O/-O0/-O1/-O2 flags."""
+    opt_level = 0
+    for arg in args:
+        if arg in ('-O', '--optimize'):
+            opt_level = 1
+        elif arg in ('-O0', '-O1', '-O2'):
+            opt_level = int(arg[2])
+    return opt_level
+
+def batch_main(args) -> None:
+    """Compile a whole directory: JSON lines on stdout, summary on stderr."""
+    if not args or not os.path.isdir(args[0]):
+        print("Error: --batch needs an existing directory.", file=sys.stderr)
+        sys.exit(2)
+    
+    jobs = None
+    for i, arg in enumerate(args):
+        value = None
+        if arg == '-j' and i + 1 < len(args):
+            value = args[i + 1]
+        elif arg.startswith('-j') and arg != '-j':
+            value = arg[2:]
+        if value is not None:
+            if not value.isdigit() or int(value) < 1:
+                print(f"Error: Invalid worker count '{value}'.", file=sys.stderr)
+                sys.exit(2)
+            jobs = int(value)
+    
+    summary = run_batch(args[0], jobs, parse_opt_level(args[1:]), sys.stdout)
+    sys.stdout.flush()
+    print(format_summary(summary), file=sys.stderr)
+    sys.exit(0 if summary.failed == 0 else 1)
 
 def main():
     """Main entry point."""
@@ -212,9 +462,29 @@ def main():
         print_usage()
         return
     
+    if sys.argv[1] == '--batch':
+        batch_main(sys.argv[2:])
+        return
+    
     filename = sys.argv[1]
     verbose = '-v' in sys.argv or '--verbose' in sys.argv
     
+    scanner_engine = 'char'
+    for arg in sys.argv[2:]:
+        if arg.startswith('--scanner='):
+            scanner_engine = arg.split('=', 1)[1]
+    if scanner_engine not in SCANNER_ENGINES:
+        print(f"Error: Unknown scanner engine '{scanner_engine}'.")
+        return
+    
+    backend = 'ast'
+    for arg in sys.argv[2:]:
+        if arg.startswith('--backend='):
+            backend = arg.split('=', 1)[1]
+    if backend not in ('ast', 'vm'):
+        print(f"Error: Unknown execution backend '{backend}'.")
+        return
+    
     # Check if file exists and has correct extension
     if not os.path.exists(filename):
         print(f"Error: File '{filename}' not found.")
@@ -224,9 +494,27 @@ def main():
         print("Warning: MiniLang files should have .ml extension.")
     
     # Compile the file
-    compiler = MiniLangCompiler()
+    streaming = '--stream' in sys.argv
+    opt_level = parse_opt_level(sys.argv[2:])
+    cache = None
+    for arg in sys.argv[2:]:
+        if arg.startswith('--cache-dir='):
+            cache = CompileCache(cache_dir=arg.split('=', 1)[1])
+    profiler = PhaseProfiler() if '--profile' in sys.argv else None
+    compiler = MiniLangCompiler(scanner_engine, streaming, opt_level, cache,
+                                [profiler] if profiler else [])
     success = compiler.compile_file(filename, verbose)
     
+    if profiler is not None:
+        print()
+        print("Phase Profile")
+        print("-" * 30)
+        print(profiler.report())
+    
+    if success and '--run' in sys.argv:
+        print()
+        success = compiler.execute(backend=backend)
+    
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
@@ -5,26 +5,458 @@ Course: CS-4031 - Compiler Construction
 
 This module bridges the Python web interface with the C++ compiler core.
 Falls back to Python implementation if C++ executable is not available.
+
+By default requests go to a pool of long-lived workers (`minilang_compiler
+--worker`) that exchange length-prefixed messages over stdin/stdout, so a
+compile costs a pipe round trip instead of a process start and a temp file.
+Workers that crash, hang past the timeout or fail a health check are killed
+and replaced.
+
+If the core is built as a shared library (minilang_api.cpp), compiles run
+in-process through ctypes instead: the source is passed as a pointer to the
+bytes object, the result comes back in a library-allocated buffer, and the
+GIL is released for the duration of the call, so threads compile in parallel.
+
+With result_format='cbor' the core answers in CBOR (`--format=cbor`) with a
+columnar token block and the AST as embedded JSON text. CBORResult decodes
+those two on first access, so callers that only read `success` and `errors`
+never pay for them.
 """
 
+import ctypes
 import subprocess
 import json
 import os
+import queue
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections.abc import Mapping
 from pathlib import Path
 import tempfile
 
+FRAME_HEADER = struct.Struct('>I')  # Big-endian payload length
+RESULT_FORMATS = ('json', 'cbor')
+BRIDGE_BACKENDS = ('auto', 'library', 'worker', 'subprocess')
+
+def library_filename():
+    """Platform-specific name of the shared library built from minilang_api.cpp."""
+    if sys.platform == 'win32':
+        return 'minilang.dll'
+    if sys.platform == 'darwin':
+        return 'libminilang.dylib'
+    return 'libminilang.so'
+
+def decode_cbor(data):
+    """Decode one CBOR item (the subset nlohmann::json::to_cbor writes)."""
+    value, end = _decode_cbor_item(memoryview(data), 0)
+    if end != len(data):
+        raise ValueError("Trailing bytes after CBOR item")
+    return value
+
+def _decode_cbor_item(data, pos):
+    initial = data[pos]
+    pos += 1
+    major, info = initial >> 5, initial & 0x1F
+
+    if major == 7:
+        if info == 20:
+            return False, pos
+        if info == 21:
+            return True, pos
+        if info in (22, 23):
+            return None, pos
+        if info == 25:
+            return struct.unpack_from('>e', data, pos)[0], pos + 2
+        if info == 26:
+            return struct.unpack_from('>f', data, pos)[0], pos + 4
+        if info == 27:
+            return struct.unpack_from('>d', data, pos)[0], pos + 8
+        raise ValueError(f"Unsupported CBOR simple value {info}")
+
+    if info < 24:
+        argument = info
+    elif info <= 27:
+        size = 1 << (info - 24)
+        argument = int.from_bytes(data[pos:pos + size], 'big')
+        pos += size
+    else:
+        raise ValueError("Indefinite-length CBOR items are not supported")
+
+    if major == 0:
+        return argument, pos
+    if major == 1:
+        return -1 - argument, pos
+    if major == 2:
+        return bytes(data[pos:pos + argument]), pos + argument
+    if major == 3:
+        return str(data[pos:pos + argument], 'utf-8', 'replace'), pos + argument
+    if major == 4:
+        items = []
+        for _ in range(argument):
+            item, pos = _decode_cbor_item(data, pos)
+            items.append(item)
+        return items, pos
+    if major == 5:
+        mapping = {}
+        for _ in range(argument):
+            key, pos = _decode_cbor_item(data, pos)
+            mapping[key], pos = _decode_cbor_item(data, pos)
+        return mapping, pos
+    # Major type 6: a tag, which only annotates the item after it
+    return _decode_cbor_item(data, pos)
+
+def _u32_column(data):
+    column = array('I')
+    column.frombytes(data)
+    if sys.byteorder == 'big':
+        column.byteswap()  # The core writes little-endian
+    return column
+
+def decode_token_columns(block):
+    """Expand the columnar token block into the JSON token list shape."""
+    names = block["names"]
+    lines = _u32_column(block["line"])
+    columns = _u32_column(block["column"])
+    value_ends = _u32_column(block["value_end"])
+    values = block["values"]
+    if values.isascii():
+        values = values.decode('ascii')  # Byte offsets are then character offsets too
+        slice_value = values.__getitem__
+    else:
+        slice_value = lambda span: values[span].decode('utf-8', 'replace')
+    tokens = []
+    start = 0
+    for type_index, line, column, end in zip(block["type"], lines, columns, value_ends):
+        tokens.append({
+            "type": names[type_index],
+            "value": slice_value(slice(start, end)),
+            "line": line,
+            "column": column
+        })
+        start = end
+    return tokens
+
+class CBORResult(Mapping):
+    """Compilation result decoded from CBOR; tokens and AST are expanded on first access."""
+
+    KEYS = ("success", "errors", "tokens", "ast", "symbol_table")
+
+    def __init__(self, data):
+        self.raw = decode_cbor(data)
+        self.decoded = {}
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        if key not in self.decoded:
+            value = self.raw.get(key)
+            if key == "tokens":
+                value = decode_token_columns(value) if value is not None else []
+            elif key == "ast" and value is not None:
+                value = json.loads(value)
+            elif key == "errors" and value is None:
+                value = []
+            elif key == "success":
+                value = bool(value)
+            self.decoded[key] = value
+        return self.decoded[key]
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __repr__(self):
+        return f"CBORResult(success={self['success']}, errors={self['errors']})"
+
+def error_result(message):
+    """Result dict for a compilation that never produced C++ output."""
+    return {
+        "success": False,
+        "errors": [message],
+        "tokens": [],
+        "ast": None,
+        "symbol_table": None
+    }
+
+class WorkerError(Exception):
+    """A worker crashed, hung or broke the protocol."""
+
+class CPPWorker:
+    """One `minilang_compiler --worker` process."""
+
+    def __init__(self, executable, result_format='json'):
+        try:
+            self.process = subprocess.Popen(
+                [str(executable), f'--format={result_format}', '--worker'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=0
+            )
+        except OSError as e:
+            raise WorkerError(f"cannot start {executable}: {e}")
+        self.responses = queue.Queue()
+        self.last_used = time.monotonic()
+        # Pipes cannot be read with a timeout portably, so a thread does the blocking reads
+        self.reader = threading.Thread(target=self._read_responses, daemon=True)
+        self.reader.start()
+
+    def _read_exactly(self, size):
+        data = b''
+        while len(data) < size:
+            chunk = self.process.stdout.read(size - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+    def _read_responses(self):
+        while True:
+            header = self._read_exactly(FRAME_HEADER.size)
+            if header is None:
+                self.responses.put(None)  # Worker exited
+                return
+            payload = self._read_exactly(FRAME_HEADER.unpack(header)[0])
+            self.responses.put(payload)
+            if payload is None:
+                return
+
+    def is_alive(self):
+        return self.process.poll() is None
+
+    def request(self, payload, timeout):
+        """Send one message and wait for the reply. Raises WorkerError."""
+        try:
+            self.process.stdin.write(FRAME_HEADER.pack(len(payload)) + payload)
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerError(f"worker is not accepting requests: {e}")
+        try:
+            response = self.responses.get(timeout=timeout)
+        except queue.Empty:
+            raise WorkerError(f"no response within {timeout}s")
+        if response is None:
+            raise WorkerError(f"worker exited with code {self.process.wait()}")
+        self.last_used = time.monotonic()
+        return response
+
+    def ping(self, timeout=1.0):
+        """Health check: an empty request must get an empty reply."""
+        try:
+            return self.request(b'', timeout) == b''
+        except WorkerError:
+            return False
+
+    def close(self):
+        """Ask the worker to exit (end of input), killing it if it does not."""
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+    def kill(self):
+        self.process.kill()
+        self.process.wait()
+
+class CPPWorkerPool:
+    """
+    Fixed-size pool of C++ workers, started on first use.
+
+    A worker that dies and cannot be restarted is dropped and the pool shrinks
+    by one; a None in the idle queue wakes a waiting request so it can start
+    a worker in the free place.
+    """
+
+    def __init__(self, executable, size=2, timeout=10.0, health_interval=30.0,
+                 result_format='json'):
+        self.executable = executable
+        self.result_format = result_format
+        self.size = size
+        self.timeout = timeout  # Per-request limit; a worker that exceeds it is replaced
+        self.health_interval = health_interval  # Ping workers idle for longer than this
+        self.idle = queue.LifoQueue()  # LIFO keeps the warmest workers busy
+        self.lock = threading.Lock()
+        self.started = 0
+        self.restarts = 0
+        self.closed = False
+
+    def _acquire(self):
+        woken = False
+        while True:
+            with self.lock:
+                if self.closed:
+                    raise WorkerError("pool is closed")
+                if self.idle.empty() and self.started < self.size:
+                    try:
+                        worker = CPPWorker(self.executable, self.result_format)
+                    except WorkerError:
+                        if woken:
+                            self.idle.put(None)  # Pass the wake-up on to the next waiting request
+                        raise
+                    self.started += 1
+                    return worker
+            worker = self.idle.get()
+            if worker is not None:
+                return worker
+            woken = True  # A worker was dropped: look again
+
+    def _release(self, worker):
+        if not self.closed:
+            self.idle.put(worker)
+        elif worker is not None:
+            worker.close()
+
+    def _replace(self, worker):
+        """Kill worker and start another in its place; None, shrinking the pool, if it does not start."""
+        worker.kill()
+        self.restarts += 1
+        try:
+            return CPPWorker(self.executable, self.result_format)
+        except WorkerError:
+            with self.lock:
+                self.started -= 1
+            return None
+
+    def _healthy(self, worker):
+        if not worker.is_alive():
+            return False
+        if time.monotonic() - worker.last_used > self.health_interval:
+            return worker.ping()
+        return True
+
+    def request(self, payload):
+        """Run one request on a healthy worker. Raises WorkerError."""
+        worker = self._acquire()
+        try:
+            if not self._healthy(worker):
+                worker = self._replace(worker)
+                if worker is None:
+                    raise WorkerError("cannot restart a worker that failed its health check")
+            try:
+                return worker.request(payload, self.timeout)
+            except WorkerError:
+                # Crashed or stuck on this input: start a fresh worker for the next request
+                worker = self._replace(worker)
+                raise
+        finally:
+            self._release(worker)
+
+    def health_check(self):
+        """Ping every idle worker, replacing those that do not answer. Returns the number replaced."""
+        replaced = 0
+        workers = []
+        while True:
+            try:
+                workers.append(self.idle.get_nowait())
+            except queue.Empty:
+                break
+        for worker in workers:
+            if worker is not None and not (worker.is_alive() and worker.ping()):
+                worker = self._replace(worker)
+                replaced += 1
+            self._release(worker)
+        return replaced
+
+    def close(self):
+        """Stop all idle workers; busy ones stop when they are released."""
+        self.closed = True
+        while True:
+            try:
+                worker = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            if worker is not None:
+                worker.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class LibraryError(Exception):
+    """The shared library rejected a call."""
+
+class CPPLibrary:
+    """The C++ core loaded in-process from its shared library."""
+
+    FORMAT_CODES = {'json': 0, 'cbor': 1}  # MINILANG_FORMAT_* in minilang_api.cpp
+    STATUS_MESSAGES = {1: "invalid argument", 2: "out of memory", 3: "internal error"}
+
+    def __init__(self, path):
+        # CDLL (unlike PyDLL) releases the GIL for the duration of every call
+        library = ctypes.CDLL(str(path))
+        self._compile = library.minilang_compile
+        self._compile.argtypes = [ctypes.c_char_p, ctypes.c_size_t, ctypes.c_int,
+                                  ctypes.POINTER(ctypes.POINTER(ctypes.c_ubyte)),
+                                  ctypes.POINTER(ctypes.c_size_t)]
+        self._compile.restype = ctypes.c_int
+        self._free = library.minilang_free
+        self._free.argtypes = [ctypes.POINTER(ctypes.c_ubyte)]
+        self._free.restype = None
+
+    def compile(self, source, result_format='json'):
+        """Compile UTF-8 source bytes; returns the serialised result. Raises LibraryError."""
+        buffer = ctypes.POINTER(ctypes.c_ubyte)()
+        length = ctypes.c_size_t()
+        # A bytes argument is passed as a pointer to its own storage, without copying
+        status = self._compile(source, len(source), self.FORMAT_CODES[result_format],
+                               ctypes.byref(buffer), ctypes.byref(length))
+        if status != 0:
+            raise LibraryError(self.STATUS_MESSAGES.get(status, f"status {status}"))
+        try:
+            return ctypes.string_at(buffer, length.value)
+        finally:
+            self._free(buffer)
+
 class CPPCompilerBridge:
     """Bridge to use C++ compiler core from Python."""
-    
-    def __init__(self):
-        self.cpp_executable = Path(__file__).parent / "cpp_core" / "minilang_compiler.exe"
-        self.cpp_available = self.cpp_executable.exists()
-        
+
+    def __init__(self, backend='auto', pool_size=2, timeout=10.0, result_format='json'):
+        """
+        backend: 'library' (in-process), 'worker' (persistent processes),
+        'subprocess' (one process per request) or 'auto' (library if built,
+        otherwise workers). The timeout does not apply to the library.
+        """
+        if backend not in BRIDGE_BACKENDS:
+            raise ValueError(f"Unknown bridge backend: {backend} "
+                             f"(expected one of {', '.join(BRIDGE_BACKENDS)})")
+        if result_format not in RESULT_FORMATS:
+            raise ValueError(f"Unknown result format: {result_format} "
+                             f"(expected one of {', '.join(RESULT_FORMATS)})")
+        cpp_dir = Path(__file__).parent / "cpp_core"
+        self.cpp_executable = cpp_dir / "minilang_compiler.exe"
+        self.cpp_library_path = cpp_dir / library_filename()
+        self.timeout = timeout
+        self.result_format = result_format
+        self.library = None
+        self.pool = None
+        self.backend = None  # The backend in use; None means the Python fallback
+
+        if backend in ('auto', 'library') and self.cpp_library_path.exists():
+            try:
+                self.library = CPPLibrary(self.cpp_library_path)
+                self.backend = 'library'
+            except (OSError, AttributeError) as e:
+                print(f"⚠️  Could not load {self.cpp_library_path}: {e}")
+        if self.backend is None and backend != 'library' and self.cpp_executable.exists():
+            self.backend = 'subprocess' if backend == 'subprocess' else 'worker'
+            if self.backend == 'worker':
+                self.pool = CPPWorkerPool(self.cpp_executable, size=pool_size, timeout=timeout,
+                                          result_format=result_format)
+        self.cpp_available = self.backend is not None
+
         if not self.cpp_available:
             print(f"⚠️  C++ compiler not found at {self.cpp_executable}")
             print("📝 Falling back to Python implementation")
             print("💡 To use C++ core, compile it with: g++ -std=c++17 -O2 -o cpp_core/minilang_compiler.exe cpp_core/main.cpp")
-    
+            print(f"💡 For in-process compiles, also build: g++ -std=c++17 -O2 -shared -fPIC -o cpp_core/{library_filename()} cpp_core/minilang_api.cpp")
+
     def compile(self, source_code):
         """
         Compile source code using C++ compiler.
@@ -33,64 +465,66 @@ class CPPCompilerBridge:
         if not self.cpp_available:
             # Fallback to Python implementation
             from compiler import MiniLangCompiler
-            py_compiler = MiniLangCompiler()
-            return py_compiler.compile(source_code)
-        
+            return MiniLangCompiler().compile(source_code).to_dict()
+
+        if self.library is not None:
+            try:
+                return self._decode_output(self.library.compile(source_code.encode('utf-8'),
+                                                                self.result_format))
+            except LibraryError as e:
+                return error_result(f"C++ compiler library failed: {e}")
+            except (ValueError, IndexError, struct.error) as e:
+                return error_result(f"Failed to parse C++ output: {str(e)}")
+
+        if self.pool is None or not source_code:
+            # An empty message is the worker health check, so empty sources use the one-shot
+            # path, which compiles them to an empty program like the library does
+            return self.compile_with_subprocess(source_code)
+
+        try:
+            return self._decode_output(self.pool.request(source_code.encode('utf-8')))
+        except WorkerError as e:
+            return error_result(f"C++ compiler worker failed: {e}")
+        except (ValueError, IndexError, struct.error) as e:
+            return error_result(f"Failed to parse C++ output: {str(e)}")
+
+    def compile_with_subprocess(self, source_code):
+        """Compile by starting one compiler process per request (the original path)."""
         try:
             # Create temporary file for source code
             with tempfile.NamedTemporaryFile(mode='w', suffix='.ml', delete=False) as f:
                 f.write(source_code)
                 temp_file = f.name
-            
+
             # Run C++ compiler
             result = subprocess.run(
-                [str(self.cpp_executable), temp_file],
+                [str(self.cpp_executable), f'--format={self.result_format}', temp_file],
                 capture_output=True,
-                text=True,
-                timeout=10
+                timeout=self.timeout
             )
-            
+
             # Clean up temp file
             os.unlink(temp_file)
-            
-            # Parse JSON output
+
+            # Parse the output
             if result.stdout:
-                cpp_result = json.loads(result.stdout)
-                return self._convert_cpp_result(cpp_result)
+                return self._decode_output(result.stdout)
             else:
-                return {
-                    "success": False,
-                    "errors": [f"C++ compiler error: {result.stderr}"],
-                    "tokens": [],
-                    "ast": None,
-                    "symbol_table": None
-                }
-                
+                return error_result(f"C++ compiler error: {result.stderr.decode(errors='replace')}")
+
         except subprocess.TimeoutExpired:
-            return {
-                "success": False,
-                "errors": ["Compilation timeout"],
-                "tokens": [],
-                "ast": None,
-                "symbol_table": None
-            }
-        except json.JSONDecodeError as e:
-            return {
-                "success": False,
-                "errors": [f"Failed to parse C++ output: {str(e)}"],
-                "tokens": [],
-                "ast": None,
-                "symbol_table": None
-            }
+            return error_result("Compilation timeout")
+        except (ValueError, IndexError, struct.error) as e:
+            return error_result(f"Failed to parse C++ output: {str(e)}")
         except Exception as e:
-            return {
-                "success": False,
-                "errors": [f"Unexpected error: {str(e)}"],
-                "tokens": [],
-                "ast": None,
-                "symbol_table": None
-            }
-    
+            return error_result(f"Unexpected error: {str(e)}")
+
+    def _decode_output(self, output):
+        """Turn raw compiler output (bytes) into a result mapping."""
+        if self.result_format == 'cbor':
+            return CBORResult(output)
+        return self._convert_cpp_result(json.loads(output))
+
     def _convert_cpp_result(self, cpp_result):
         """Convert C++ JSON result to Python format."""
         return {
@@ -100,7 +534,12 @@ class CPPCompilerBridge:
             "ast": cpp_result.get("ast"),
             "symbol_table": cpp_result.get("symbol_table")
         }
-    
+
     def is_cpp_available(self):
         """Check if C++ compiler is available."""
         return self.cpp_available
+
+    def close(self):
+        """Shut down the worker pool."""
+        if self.pool is not None:
+            self.pool.close()
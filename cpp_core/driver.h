@@ -0,0 +1,165 @@
+/*
+ * MiniLang Compiler - Compilation Driver
+ * Authors: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+ * Course: CS-4031 - Compiler Construction
+ *
+ * Runs the three phases on a source buffer and serialises the result.
+ * Shared by the command-line compiler (main.cpp) and the shared library
+ * (minilang_api.cpp).
+ *
+ * --format=cbor output packs the bulky parts so a reader can skip them
+ * until it needs them:
+ *   tokens: {"names": [type names], "type": bytes (u8 index into names per token),
+ *            "line", "column", "value_end": bytes (u32 little-endian per token),
+ *            "values": bytes (UTF-8 token values, back to back)}
+ *   ast:    bytes holding the AST as compact JSON (Python's json module
+ *           decodes it far faster than a CBOR decoder written in Python)
+ */
+
+#ifndef DRIVER_H
+#define DRIVER_H
+
+#include <cstdint>
+#include <map>
+#include <string>
+#include <string_view>
+#include <vector>
+#include "scanner.h"
+#include "parser.h"
+#include "semantic.h"
+#include "json.hpp"
+
+using json = nlohmann::json;
+
+inline json tokensToJSON(const std::vector<Token>& tokens) {
+    json tokensArray = json::array();
+    
+    for (const auto& token : tokens) {
+        if (token.type != TokenType::END_OF_FILE) {
+            json tokenObj;
+            tokenObj["type"] = TokenHelper::tokenTypeToString(token.type);
+            tokenObj["value"] = token.value;
+            tokenObj["line"] = token.line;
+            tokenObj["column"] = token.column;
+            tokensArray.push_back(tokenObj);
+        }
+    }
+    
+    return tokensArray;
+}
+
+enum class OutputFormat { JSON, CBOR };
+
+inline void appendU32(std::vector<std::uint8_t>& out, std::uint32_t value) {
+    for (int shift = 0; shift < 32; shift += 8) {
+        out.push_back(static_cast<std::uint8_t>(value >> shift));
+    }
+}
+
+inline json tokensToColumns(const std::vector<Token>& tokens) {
+    json names = json::array();
+    std::map<std::string, std::uint8_t> nameIndex;
+    std::vector<std::uint8_t> types, lines, columns, valueEnds, values;
+    
+    for (const auto& token : tokens) {
+        if (token.type == TokenType::END_OF_FILE) {
+            continue;
+        }
+        std::string name = TokenHelper::tokenTypeToString(token.type);
+        auto found = nameIndex.find(name);
+        if (found == nameIndex.end()) {
+            found = nameIndex.emplace(name, static_cast<std::uint8_t>(names.size())).first;
+            names.push_back(name);
+        }
+        types.push_back(found->second);
+        appendU32(lines, static_cast<std::uint32_t>(token.line));
+        appendU32(columns, static_cast<std::uint32_t>(token.column));
+        values.insert(values.end(), token.value.begin(), token.value.end());
+        appendU32(valueEnds, static_cast<std::uint32_t>(values.size()));
+    }
+    
+    json block;
+    block["names"] = names;
+    block["type"] = json::binary(std::move(types));
+    block["line"] = json::binary(std::move(lines));
+    block["column"] = json::binary(std::move(columns));
+    block["value_end"] = json::binary(std::move(valueEnds));
+    block["values"] = json::binary(std::move(values));
+    return block;
+}
+
+inline json symbolTableToJSON(const std::map<std::string, Symbol>& table) {
+    json symbolsObj;
+    
+    for (const auto& [name, symbol] : table) {
+        json symObj;
+        symObj["type"] = symbol.type;
+        symObj["initialized"] = symbol.initialized;
+        symbolsObj[name] = symObj;
+    }
+    
+    return symbolsObj;
+}
+
+inline json compileSource(std::string_view sourceCode, OutputFormat format) {
+    json result;
+    
+    try {
+        // Phase 1: Lexical Analysis
+        Scanner scanner(sourceCode);
+        std::vector<Token> tokens = scanner.tokenize();
+        
+        result["tokens"] = format == OutputFormat::CBOR ? tokensToColumns(tokens) : tokensToJSON(tokens);
+        
+        // Phase 2: Syntax Analysis
+        Parser parser(tokens);
+        auto ast = parser.parse();
+        
+        if (!ast || !parser.getErrors().empty()) {
+            result["success"] = false;
+            result["phase"] = "syntax";
+            result["errors"] = parser.getErrors();
+            return result;
+        }
+        
+        if (format == OutputFormat::CBOR) {
+            std::string astText = ast->toJSON().dump(-1, ' ', false, json::error_handler_t::replace);
+            result["ast"] = json::binary(std::vector<std::uint8_t>(astText.begin(), astText.end()));
+        } else {
+            result["ast"] = ast->toJSON();
+        }
+        
+        // Phase 3: Semantic Analysis
+        SemanticAnalyzer analyzer;
+        bool semanticSuccess = analyzer.analyze(ast.get());
+        
+        result["symbol_table"] = symbolTableToJSON(analyzer.getSymbolTable());
+        
+        if (!semanticSuccess) {
+            result["success"] = false;
+            result["phase"] = "semantic";
+            result["errors"] = analyzer.getErrors();
+        } else {
+            result["success"] = true;
+            result["errors"] = json::array();
+        }
+        
+    } catch (const std::exception& e) {
+        result["success"] = false;
+        result["phase"] = "unknown";
+        result["errors"] = json::array({e.what()});
+    }
+    
+    return result;
+}
+
+inline std::string serialize(const json& result, OutputFormat format, int indent) {
+    if (format == OutputFormat::CBOR) {
+        std::vector<std::uint8_t> bytes = json::to_cbor(result);
+        return std::string(bytes.begin(), bytes.end());
+    }
+    // Invalid UTF-8 in the source becomes U+FFFD instead of aborting the dump
+    return result.dump(indent, ' ', false, json::error_handler_t::replace);
+}
+
+#endif // DRIVER_H
@@ -5,133 +5,150 @@
  * 
  * This C++ core implements all three compiler phases and outputs JSON
  * for integration with the Python web interface.
+ *
+ * Usage:
+ *   minilang_compiler [--format=json|cbor] <source_file | ->   compile one program
+ *   minilang_compiler [--format=json|cbor] --worker            serve many programs over stdin/stdout
+ *
+ * --format=cbor writes the same result as CBOR instead of JSON (layout in
+ * driver.h).
+ *
+ * Worker protocol: every message is a 4-byte big-endian length followed by
+ * that many bytes. Requests carry source code, responses carry the result
+ * (compact JSON or CBOR). An empty request is a health check and gets an
+ * empty response.
  */
 
 #include <iostream>
 #include <fstream>
 #include <sstream>
 #include <string>
-#include "scanner.h"
-#include "parser.h"
-#include "semantic.h"
-#include "json.hpp"
+#include <cstdint>
+#ifdef _WIN32
+#include <io.h>
+#include <fcntl.h>
+#endif
+#include "driver.h"
 
-using json = nlohmann::json;
-
-std::string readFile(const std::string& filename) {
+bool readFile(const std::string& filename, std::string& contents) {
     std::ifstream file(filename);
     if (!file.is_open()) {
-        return "";
+        return false;
     }
     
+    // An empty file is an empty program, as it is for the library and the workers
     std::stringstream buffer;
     buffer << file.rdbuf();
-    return buffer.str();
+    contents = buffer.str();
+    return true;
 }
 
-json tokensToJSON(const std::vector<Token>& tokens) {
-    json tokensArray = json::array();
-    
-    for (const auto& token : tokens) {
-        if (token.type != TokenType::END_OF_FILE) {
-            json tokenObj;
-            tokenObj["type"] = TokenHelper::tokenTypeToString(token.type);
-            tokenObj["value"] = token.value;
-            tokenObj["line"] = token.line;
-            tokenObj["column"] = token.column;
-            tokensArray.push_back(tokenObj);
-        }
+void setBinaryMode() {
+#ifdef _WIN32
+    // Length prefixes and CBOR are binary; stop the runtime from translating line endings
+    _setmode(_fileno(stdin), _O_BINARY);
+    _setmode(_fileno(stdout), _O_BINARY);
+#endif
+}
+
+bool readFrame(std::string& payload) {
+    unsigned char header[4];
+    if (!std::cin.read(reinterpret_cast<char*>(header), 4)) {
+        return false;  // Parent closed the pipe
     }
-    
-    return tokensArray;
+    uint32_t length = (uint32_t(header[0]) << 24) | (uint32_t(header[1]) << 16) |
+                      (uint32_t(header[2]) << 8) | uint32_t(header[3]);
+    payload.resize(length);
+    return length == 0 || static_cast<bool>(std::cin.read(&payload[0], length));
+}
+
+void writeFrame(const std::string& payload) {
+    uint32_t length = static_cast<uint32_t>(payload.size());
+    unsigned char header[4] = {
+        static_cast<unsigned char>(length >> 24), static_cast<unsigned char>(length >> 16),
+        static_cast<unsigned char>(length >> 8), static_cast<unsigned char>(length)
+    };
+    std::cout.write(reinterpret_cast<const char*>(header), 4);
+    std::cout.write(payload.data(), payload.size());
+    std::cout.flush();
 }
 
-json symbolTableToJSON(const std::map<std::string, Symbol>& table) {
-    json symbolsObj;
+int runWorker(OutputFormat format) {
+    setBinaryMode();
+    std::ios::sync_with_stdio(false);
     
-    for (const auto& [name, symbol] : table) {
-        json symObj;
-        symObj["type"] = symbol.type;
-        symObj["initialized"] = symbol.initialized;
-        symbolsObj[name] = symObj;
+    std::string source;
+    while (readFrame(source)) {
+        if (source.empty()) {
+            writeFrame("");  // Health check
+            continue;
+        }
+        writeFrame(serialize(compileSource(source, format), format, -1));
     }
-    
-    return symbolsObj;
+    return 0;
 }
 
 int main(int argc, char* argv[]) {
-    json result;
+    OutputFormat format = OutputFormat::JSON;
+    bool worker = false;
+    std::string input;
     
-    try {
-        // Check arguments
-        if (argc < 2) {
-            std::cerr << "Usage: " << argv[0] << " <source_file>" << std::endl;
-            return 1;
-        }
-        
-        std::string sourceCode;
-        
-        // Read from file or stdin
-        if (std::string(argv[1]) == "-") {
-            // Read from stdin
-            std::stringstream buffer;
-            buffer << std::cin.rdbuf();
-            sourceCode = buffer.str();
+    for (int i = 1; i < argc; i++) {
+        std::string arg = argv[i];
+        if (arg == "--worker") {
+            worker = true;
+        } else if (arg == "--format=json") {
+            format = OutputFormat::JSON;
+        } else if (arg == "--format=cbor") {
+            format = OutputFormat::CBOR;
         } else {
-            // Read from file
-            sourceCode = readFile(argv[1]);
-            if (sourceCode.empty()) {
-                result["success"] = false;
-                result["phase"] = "file";
-                result["errors"] = json::array({"Failed to read source file"});
-                std::cout << result.dump(2) << std::endl;
-                return 1;
-            }
+            input = arg;
         }
-        
-        // Phase 1: Lexical Analysis
-        Scanner scanner(sourceCode);
-        std::vector<Token> tokens = scanner.tokenize();
-        
-        result["tokens"] = tokensToJSON(tokens);
-        
-        // Phase 2: Syntax Analysis
-        Parser parser(tokens);
-        auto ast = parser.parse();
-        
-        if (!ast || !parser.getErrors().empty()) {
+    }
+    
+    // Check arguments
+    if (!worker && input.empty()) {
+        std::cerr << "Usage: " << argv[0] << " [--format=json|cbor] <source_file | - | --worker>" << std::endl;
+        return 1;
+    }
+    
+    if (worker) {
+        return runWorker(format);
+    }
+    if (format == OutputFormat::CBOR) {
+        setBinaryMode();
+    }
+    
+    std::string sourceCode;
+    
+    // Read from file or stdin
+    if (input == "-") {
+        // Read from stdin
+        std::stringstream buffer;
+        buffer << std::cin.rdbuf();
+        sourceCode = buffer.str();
+    } else {
+        // Read from file
+        if (!readFile(input, sourceCode)) {
+            json result;
             result["success"] = false;
-            result["phase"] = "syntax";
-            result["errors"] = parser.getErrors();
-            std::cout << result.dump(2) << std::endl;
+            result["phase"] = "file";
+            result["errors"] = json::array({"Failed to read source file"});
+            std::cout << serialize(result, format, 2);
+            if (format == OutputFormat::JSON) {
+                std::cout << std::endl;
+            }
             return 1;
         }
-        
-        result["ast"] = ast->toJSON();
-        
-        // Phase 3: Semantic Analysis
-        SemanticAnalyzer analyzer;
-        bool semanticSuccess = analyzer.analyze(ast.get());
-        
-        result["symbol_table"] = symbolTableToJSON(analyzer.getSymbolTable());
-        
-        if (!semanticSuccess) {
-            result["success"] = false;
-            result["phase"] = "semantic";
-            result["errors"] = analyzer.getErrors();
-        } else {
-            result["success"] = true;
-            result["errors"] = json::array();
-        }
-        
-    } catch (const std::exception& e) {
-        result["success"] = false;
-        result["phase"] = "unknown";
-        result["errors"] = json::array({e.what()});
     }
     
-    // Output JSON result
-    std::cout << result.dump(2) << std::endl;
+    json result = compileSource(sourceCode, format);
+    
+    // Output the result
+    std::cout << serialize(result, format, 2);
+    if (format == OutputFormat::JSON) {
+        std::cout << std::endl;
+    }
     
     return result["success"].get<bool>() ? 0 : 1;
 }
@@ -0,0 +1,73 @@
+/*
+ * MiniLang Compiler - Shared Library Interface
+ * Authors: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+ * Course: CS-4031 - Compiler Construction
+ *
+ * Exposes the compiler through a C ABI so it can be loaded in-process
+ * (e.g. with Python's ctypes) instead of being run as a separate program.
+ * The source is read straight from the caller's buffer. The result is
+ * returned in a malloc'd buffer that the caller releases with
+ * minilang_free(). Calls share no state, so threads may compile
+ * concurrently.
+ *
+ * Build: g++ -std=c++17 -O2 -shared -fPIC -o libminilang.so minilang_api.cpp
+ *        (minilang.dll on Windows, libminilang.dylib on macOS)
+ */
+
+#include <cstdlib>
+#include <cstring>
+#include "driver.h"
+
+#ifdef _WIN32
+#define MINILANG_API extern "C" __declspec(dllexport)
+#else
+#define MINILANG_API extern "C" __attribute__((visibility("default")))
+#endif
+
+// Result formats
+#define MINILANG_FORMAT_JSON 0
+#define MINILANG_FORMAT_CBOR 1
+
+// Return codes
+#define MINILANG_OK 0
+#define MINILANG_ERROR_ARGUMENT 1
+#define MINILANG_ERROR_MEMORY 2
+#define MINILANG_ERROR_INTERNAL 3
+
+/*
+ * Compile length bytes of source. On MINILANG_OK, *result points to
+ * *result_length bytes of JSON or CBOR (the same document main.cpp prints
+ * with --format) and must be released with minilang_free().
+ */
+MINILANG_API int minilang_compile(const char* source, size_t length, int format,
+                                  unsigned char** result, size_t* result_length) {
+    if (result == nullptr || result_length == nullptr || (source == nullptr && length > 0) ||
+        (format != MINILANG_FORMAT_JSON && format != MINILANG_FORMAT_CBOR)) {
+        return MINILANG_ERROR_ARGUMENT;
+    }
+    *result = nullptr;
+    *result_length = 0;
+    
+    try {
+        OutputFormat outputFormat = format == MINILANG_FORMAT_CBOR ? OutputFormat::CBOR : OutputFormat::JSON;
+        std::string_view sourceCode(length > 0 ? source : "", length);
+        std::string output = serialize(compileSource(sourceCode, outputFormat), outputFormat, -1);
+        
+        auto* buffer = static_cast<unsigned char*>(std::malloc(output.size() > 0 ? output.size() : 1));
+        if (buffer == nullptr) {
+            return MINILANG_ERROR_MEMORY;
+        }
+        std::memcpy(buffer, output.data(), output.size());
+        *result = buffer;
+        *result_length = output.size();
+        return MINILANG_OK;
+    } catch (const std::bad_alloc&) {
+        return MINILANG_ERROR_MEMORY;
+    } catch (...) {
+        return MINILANG_ERROR_INTERNAL;
+    }
+}
+
+MINILANG_API void minilang_free(unsigned char* buffer) {
+    std::free(buffer);
+}
@@ -10,11 +10,12 @@
 #include "token.h"
 #include <vector>
 #include <string>
+#include <string_view>
 #include <cctype>
 
 class Scanner {
 private:
-    std::string source;
+    std::string_view source;  // Not owned: the caller's buffer must outlive the scanner
     size_t position;
     int line;
     int column;
@@ -103,7 +104,7 @@ private:
     }
     
 public:
-    Scanner(const std::string& src) 
+    Scanner(std::string_view src) 
         : source(src), position(0), line(1), column(1) {
         keywords = TokenHelper::getKeywords();
     }
@@ -4,45 +4,136 @@ Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
 Course: CS-4031 - Compiler Construction
 """
 
+import re
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional
-from dataclasses import dataclass
+from types import GeneratorType
+from typing import Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, fields
 
 class ASTNode(ABC):
-    """Base class for all AST nodes."""
-    pass
+    """
+    Base class for all AST nodes.
+    
+    Nodes are slotted dataclasses (see slotted) that compare by structure,
+    like any dataclass, and also hash by structure: equal nodes hash the
+    same, so nodes can key dicts and sets, e.g. to find repeated subtrees.
+    The hash is computed once, bottom-up, and cached in the node, so a
+    node must not be changed after it has been hashed.
+    """
+    __slots__ = ('_hash',)
+    _field_names: Tuple[str, ...] = ()  # Set by slotted
+    
+    def __hash__(self) -> int:
+        try:
+            return self._hash
+        except AttributeError:
+            pass
+        # Subtrees first, on an explicit stack, so deep trees do not recurse
+        stack = [self]
+        while stack:
+            node = stack[-1]
+            if hasattr(node, '_hash'):
+                stack.pop()
+                continue
+            unhashed = [child for child in node.subnodes() if not hasattr(child, '_hash')]
+            if unhashed:
+                stack += unhashed
+                continue
+            stack.pop()
+            values = [getattr(node, name) for name in node._field_names]
+            node._hash = hash((node.__class__, *[tuple(value) if value.__class__ is list else value
+                                                 for value in values]))
+        return self._hash
+    
+    def __getstate__(self):
+        # Without the cached hash, which is only valid in this process (string hashing is salted)
+        return None, {name: getattr(self, name)
+                      for name in self._field_names + getattr(self, 'annotation_slots', ())}
+    
+    def subnodes(self) -> List['ASTNode']:
+        """The nodes held in this node's fields, directly or in a list."""
+        nodes = []
+        for name in self._field_names:
+            value = getattr(self, name)
+            if value.__class__ is list:
+                nodes.extend(item for item in value if isinstance(item, ASTNode))
+            elif isinstance(value, ASTNode):
+                nodes.append(value)
+        return nodes
 
 class Statement(ASTNode):
     """Base class for all statement nodes."""
-    pass
+    __slots__ = ()
 
 class Expression(ASTNode):
     """Base class for all expression nodes."""
-    pass
+    __slots__ = ()
+    # Static type, recorded by TypeChecker (literals, identifiers and calls derive it)
+    inferred_type: Optional[str] = None
 
+class NamedNode:
+    """
+    Mixin for nodes that declare or use a name.
+    
+    TypeChecker records the Symbol the name resolves to in symbol (its
+    slot, frame depth and scope depth included), so later passes read the
+    binding instead of looking the name up again. Like inferred_type it is
+    a slot of its own, not a dataclass field, so it takes no part in node
+    equality, hashing or repr.
+    """
+    __slots__ = ()
+    annotation_slots = ('symbol',)
+    
+    def __post_init__(self):
+        self.symbol = None
+
+def slotted(cls: type) -> type:
+    """
+    Rebuild the dataclass node class cls with __slots__, as
+    dataclass(slots=True) does on Python 3.10 and later.
+    
+    The slots are its fields plus its annotation_slots, the attributes
+    TypeChecker fills in. Defaults move out of the class body, where they
+    would clash with the slots, and the hash dataclass() turned off for
+    the generated __eq__ is ASTNode's again.
+    """
+    names = tuple(field.name for field in fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in names + ('__dict__', '__weakref__'):
+        namespace.pop(name, None)
+    namespace['__hash__'] = ASTNode.__hash__
+    namespace['__slots__'] = names + getattr(cls, 'annotation_slots', ())
+    namespace['_field_names'] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+@slotted
 @dataclass
 class Program(ASTNode):
     """Root node representing the entire program."""
     statements: List[Statement]
 
+@slotted
 @dataclass
-class VarDeclaration(Statement):
+class VarDeclaration(Statement, NamedNode):
     """Variable declaration statement."""
     var_type: str  # 'int', 'float', 'bool'
     name: str
     value: Optional[Expression] = None
 
+@slotted
 @dataclass
-class Assignment(Statement):
+class Assignment(Statement, NamedNode):
     """Assignment statement."""
     name: str
     value: Expression
 
+@slotted
 @dataclass
 class PrintStatement(Statement):
     """Print statement."""
     expression: Expression
 
+@slotted
 @dataclass
 class IfStatement(Statement):
     """If statement with optional else clause."""
@@ -50,12 +141,14 @@ class IfStatement(Statement):
     then_statements: List[Statement]
     else_statements: Optional[List[Statement]] = None
 
+@slotted
 @dataclass
 class WhileStatement(Statement):
     """While loop statement."""
     condition: Expression
     body: List[Statement]
 
+@slotted
 @dataclass
 class ForStatement(Statement):
     """For loop statement."""
@@ -64,31 +157,40 @@ class ForStatement(Statement):
     update: Optional[Statement]
     body: List[Statement]
 
+@slotted
 @dataclass
 class DoWhileStatement(Statement):
     """Do-while loop statement."""
     body: List[Statement]
     condition: Expression
 
+@slotted
 @dataclass
-class FunctionDeclaration(Statement):
+class FunctionDeclaration(Statement, NamedNode):
     """Function declaration."""
     return_type: str
     name: str
     parameters: List[tuple]  # List of (type, name) tuples
     body: List[Statement]
 
+@slotted
 @dataclass
 class ReturnStatement(Statement):
     """Return statement."""
     value: Optional[Expression]
 
+@slotted
 @dataclass
-class FunctionCall(Expression):
+class FunctionCall(Expression, NamedNode):
     """Function call expression."""
     name: str
     arguments: List[Expression]
+    
+    @property
+    def inferred_type(self) -> Optional[str]:
+        return self.symbol.type if self.symbol is not None else None
 
+@slotted
 @dataclass
 class Block(Statement):
     """Block statement (group of statements in braces)."""
@@ -96,42 +198,171 @@ class Block(Statement):
 
 # Expression nodes
 
+@slotted
 @dataclass
 class BinaryOp(Expression):
     """Binary operation expression."""
+    annotation_slots = ('inferred_type',)
     left: Expression
     operator: str
     right: Expression
+    
+    def __post_init__(self):
+        self.inferred_type = None
 
+@slotted
 @dataclass
 class UnaryOp(Expression):
     """Unary operation expression."""
+    annotation_slots = ('inferred_type',)
     operator: str
     operand: Expression
+    
+    def __post_init__(self):
+        self.inferred_type = None
 
+@slotted
 @dataclass
-class Identifier(Expression):
+class Identifier(Expression, NamedNode):
     """Identifier (variable reference)."""
     name: str
+    
+    @property
+    def inferred_type(self) -> Optional[str]:
+        return self.symbol.type if self.symbol is not None else None
 
+@slotted
 @dataclass
 class IntegerLiteral(Expression):
     """Integer literal."""
     value: int
+    inferred_type = 'int'
 
+@slotted
 @dataclass
 class FloatLiteral(Expression):
     """Float literal."""
     value: float
+    inferred_type = 'float'
 
+@slotted
 @dataclass
 class BooleanLiteral(Expression):
     """Boolean literal."""
     value: bool
+    inferred_type = 'bool'
+
+# Placeholders left by parser error recovery (only in ASTs that failed to parse)
+
+@slotted
+@dataclass
+class ErrorStatement(Statement):
+    """A statement the parser skipped after a syntax error."""
+    message: str
+
+@slotted
+@dataclass
+class ErrorExpression(Expression):
+    """An expression the parser skipped after a syntax error."""
+    message: str
 
 # Visitor pattern for AST traversal
+def visit_method_name(node_class: type) -> str:
+    """Name of the visit method for a node class, e.g. BinaryOp -> visit_binary_op."""
+    return 'visit_' + re.sub('(?<!^)([A-Z])', r'_\1', node_class.__name__).lower()
+
 class ASTVisitor(ABC):
-    """Base class for AST visitors."""
+    """
+    Base class for AST visitors.
+    
+    visit() dispatches through a node class -> method table kept per visitor
+    class. Each entry is resolved once, the first time that visitor meets
+    that node class; nodes without a visit method go to generic_visit().
+    
+    A visit method may instead be a generator that yields the nodes nested
+    in its node. visit() then walks them on an explicit stack of the
+    generators still running rather than by recursion, so trees nested
+    deeper than the interpreter's recursion limit can be visited. Such a
+    method resumes after each yield once that node has been fully visited,
+    and the yield evaluates to that visit's result (value = yield node.left);
+    what the generator returns is its own result. Yielding None gives None.
+    An exception from a nested visit is raised at the yield, as a recursive
+    call would raise it, so try/except and try/finally around it work.
+    """
+    
+    _dispatch_table: Dict[type, Callable] = {}
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch_table = {}  # One table per visitor class
+    
+    @classmethod
+    def _resolve_visit_method(cls, node_class: type) -> Callable:
+        """Look up and cache the method that visits node_class."""
+        method = getattr(cls, visit_method_name(node_class), None)
+        if method is None:
+            method = cls.generic_visit
+        cls._dispatch_table[node_class] = method
+        return method
+    
+    def visit(self, node: ASTNode):
+        """Dispatch node to its visit method."""
+        try:
+            method = self._dispatch_table[node.__class__]
+        except KeyError:
+            method = self._resolve_visit_method(node.__class__)
+        visitor = method(self, node)
+        if type(visitor) is not GeneratorType:
+            return visitor
+        dispatch_table = self._dispatch_table
+        visitors = [visitor]
+        result = None  # Of the last finished visit, sent to the generator that yielded its node
+        error = None  # Raised by the last visit, thrown into the generator that yielded its node
+        while True:
+            visitor = visitors[-1]
+            try:
+                if error is not None:
+                    nested = visitor.throw(error)
+                    error = None
+                else:
+                    if result is not None:
+                        delegate = visitor.gi_yieldfrom
+                        if delegate is not None and type(delegate) is not GeneratorType:
+                            result = None  # yield from a plain list of nodes cannot take values
+                    nested = visitor.send(result)
+            except StopIteration as finished:
+                visitors.pop()
+                error = None
+                result = finished.value
+                if not visitors:
+                    return result
+                continue
+            except BaseException as raised:
+                # Not handled by this visit: hand it to the enclosing one
+                visitors.pop()
+                if not visitors:
+                    raise
+                error = raised
+                continue
+            if nested is None:
+                result = None
+                continue
+            try:
+                try:
+                    method = dispatch_table[nested.__class__]
+                except KeyError:
+                    method = self._resolve_visit_method(nested.__class__)
+                result = method(self, nested)
+            except BaseException as raised:
+                error = raised
+                continue
+            if type(result) is GeneratorType:
+                visitors.append(result)
+                result = None
+    
+    def generic_visit(self, node: ASTNode):
+        """Called for nodes that have no visit method."""
+        raise Exception(f"No visit method for {node.__class__.__name__}")
     
     @abstractmethod
     def visit_program(self, node: Program):
@@ -197,8 +428,7 @@ class ASTPrinter(ASTVisitor):
     def visit_program(self, node: Program):
         print(f"{self._indent()}Program:")
         self.indent_level += 1
-        for stmt in node.statements:
-            self.visit(stmt)
+        yield from node.statements
         self.indent_level -= 1
     
     def visit_var_declaration(self, node: VarDeclaration):
@@ -207,7 +437,7 @@ class ASTPrinter(ASTVisitor):
             self.indent_level += 1
             print(f"{self._indent()}Value:")
             self.indent_level += 1
-            self.visit(node.value)
+            yield node.value
             self.indent_level -= 2
     
     def visit_assignment(self, node: Assignment):
@@ -215,13 +445,13 @@ class ASTPrinter(ASTVisitor):
         self.indent_level += 1
         print(f"{self._indent()}Value:")
         self.indent_level += 1
-        self.visit(node.value)
+        yield node.value
         self.indent_level -= 2
     
     def visit_print_statement(self, node: PrintStatement):
         print(f"{self._indent()}PrintStatement:")
         self.indent_level += 1
-        self.visit(node.expression)
+        yield node.expression
         self.indent_level -= 1
     
     def visit_if_statement(self, node: IfStatement):
@@ -229,18 +459,16 @@ class ASTPrinter(ASTVisitor):
         self.indent_level += 1
         print(f"{self._indent()}Condition:")
         self.indent_level += 1
-        self.visit(node.condition)
+        yield node.condition
         self.indent_level -= 1
         print(f"{self._indent()}Then:")
         self.indent_level += 1
-        for stmt in node.then_statements:
-            self.visit(stmt)
+        yield from node.then_statements
         self.indent_level -= 1
         if node.else_statements:
             print(f"{self._indent()}Else:")
             self.indent_level += 1
-            for stmt in node.else_statements:
-                self.visit(stmt)
+            yield from node.else_statements
             self.indent_level -= 1
         self.indent_level -= 1
     
@@ -249,19 +477,17 @@ class ASTPrinter(ASTVisitor):
         self.indent_level += 1
         print(f"{self._indent()}Condition:")
         self.indent_level += 1
-        self.visit(node.condition)
+        yield node.condition
         self.indent_level -= 1
         print(f"{self._indent()}Body:")
         self.indent_level += 1
-        for stmt in node.body:
-            self.visit(stmt)
+        yield from node.body
         self.indent_level -= 2
     
     def visit_block(self, node: Block):
         print(f"{self._indent()}Block:")
         self.indent_level += 1
-        for stmt in node.statements:
-            self.visit(stmt)
+        yield from node.statements
         self.indent_level -= 1
     
     def visit_binary_op(self, node: BinaryOp):
@@ -269,17 +495,17 @@ class ASTPrinter(ASTVisitor):
         self.indent_level += 1
         print(f"{self._indent()}Left:")
         self.indent_level += 1
-        self.visit(node.left)
+        yield node.left
         self.indent_level -= 1
         print(f"{self._indent()}Right:")
         self.indent_level += 1
-        self.visit(node.right)
+        yield node.right
         self.indent_level -= 2
     
     def visit_unary_op(self, node: UnaryOp):
         print(f"{self._indent()}UnaryOp: {node.operator}")
         self.indent_level += 1
-        self.visit(node.operand)
+        yield node.operand
         self.indent_level -= 1
     
     def visit_identifier(self, node: Identifier):
@@ -294,16 +520,8 @@ class ASTPrinter(ASTVisitor):
     def visit_boolean_literal(self, node: BooleanLiteral):
         print(f"{self._indent()}BooleanLiteral: {node.value}")
     
-    def visit(self, node: ASTNode):
-        """Generic visit method that dispatches to specific visit methods."""
-        method_name = f"visit_{node.__class__.__name__.lower()}"
-        method_name = method_name.replace('literal', '_literal')
-        method_name = method_name.replace('statement', '_statement')
-        method_name = method_name.replace('declaration', '_declaration')
-        method_name = method_name.replace('binaryop', 'binary_op')
-        method_name = method_name.replace('unaryop', 'unary_op')
-        
-        if hasattr(self, method_name):
-            return getattr(self, method_name)(node)
-        else:
-            raise Exception(f"No visit method for {node.__class__.__name__}")
\ No newline at end of file
+    def visit_error_statement(self, node: ErrorStatement):
+        print(f"{self._indent()}ErrorStatement: {node.message}")
+    
+    def visit_error_expression(self, node: ErrorExpression):
+        print(f"{self._indent()}ErrorExpression: {node.message}")
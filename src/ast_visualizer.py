@@ -39,7 +39,7 @@ class TreeVisualizer(ASTVisitor):
         self.tree_lines.append(prefix + text)
     
     def _visit_children(self, children, labels=None):
-        """Visit a list of child nodes."""
+        """Visit a list of child nodes (use with yield from, see ASTVisitor)."""
         if not children:
             return
         
@@ -53,11 +53,11 @@ class TreeVisualizer(ASTVisitor):
                 self.tree_lines.append(label_prefix + labels[i] + ":")
                 self.current_depth += 1
                 if child:
-                    self.visit(child)
+                    yield child
                 self.current_depth -= 1
             else:
                 if child:
-                    self.visit(child)
+                    yield child
         self.current_depth -= 1
     
     def get_tree_string(self):
@@ -66,20 +66,20 @@ class TreeVisualizer(ASTVisitor):
     
     def visit_program(self, node: Program):
         self._add_line("PROGRAM")
-        self._visit_children(node.statements)
+        yield from self._visit_children(node.statements)
     
     def visit_var_declaration(self, node: VarDeclaration):
         self._add_line(f"VAR_DECL({node.var_type} {node.name})")
         if node.value:
-            self._visit_children([node.value], ["value"])
+            yield from self._visit_children([node.value], ["value"])
     
     def visit_assignment(self, node: Assignment):
         self._add_line(f"ASSIGN({node.name})")
-        self._visit_children([node.value], ["value"])
+        yield from self._visit_children([node.value], ["value"])
     
     def visit_print_statement(self, node: PrintStatement):
         self._add_line("PRINT")
-        self._visit_children([node.expression], ["expr"])
+        yield from self._visit_children([node.expression], ["expr"])
     
     def visit_if_statement(self, node: IfStatement):
         self._add_line("IF")
@@ -89,15 +89,14 @@ class TreeVisualizer(ASTVisitor):
         condition_prefix = self._get_prefix(False)
         self.tree_lines.append(condition_prefix + "condition:")
         self.current_depth += 1
-        self.visit(node.condition)
+        yield node.condition
         self.current_depth -= 1
         
         # Add then branch
         then_prefix = self._get_prefix(node.else_statements is None)
         self.tree_lines.append(then_prefix + "then:")
         self.current_depth += 1
-        for i, stmt in enumerate(node.then_statements):
-            self.visit(stmt)
+        yield from node.then_statements
         self.current_depth -= 1
         
         # Add else branch if present
@@ -105,8 +104,7 @@ class TreeVisualizer(ASTVisitor):
             else_prefix = self._get_prefix(True)
             self.tree_lines.append(else_prefix + "else:")
             self.current_depth += 1
-            for stmt in node.else_statements:
-                self.visit(stmt)
+            yield from node.else_statements
             self.current_depth -= 1
         
         self.current_depth -= 1
@@ -119,30 +117,29 @@ class TreeVisualizer(ASTVisitor):
         condition_prefix = self._get_prefix(False)
         self.tree_lines.append(condition_prefix + "condition:")
         self.current_depth += 1
-        self.visit(node.condition)
+        yield node.condition
         self.current_depth -= 1
         
         # Add body
         body_prefix = self._get_prefix(True)
         self.tree_lines.append(body_prefix + "body:")
         self.current_depth += 1
-        for stmt in node.body:
-            self.visit(stmt)
+        yield from node.body
         self.current_depth -= 1
         
         self.current_depth -= 1
     
     def visit_block(self, node: Block):
         self._add_line("BLOCK")
-        self._visit_children(node.statements)
+        yield from self._visit_children(node.statements)
     
     def visit_binary_op(self, node: BinaryOp):
         self._add_line(f"BINARY_OP({node.operator})")
-        self._visit_children([node.left, node.right], ["left", "right"])
+        yield from self._visit_children([node.left, node.right], ["left", "right"])
     
     def visit_unary_op(self, node: UnaryOp):
         self._add_line(f"UNARY_OP({node.operator})")
-        self._visit_children([node.operand], ["operand"])
+        yield from self._visit_children([node.operand], ["operand"])
     
     def visit_identifier(self, node: Identifier):
         self._add_line(f"IDENTIFIER({node.name})")
@@ -155,20 +152,6 @@ class TreeVisualizer(ASTVisitor):
     
     def visit_boolean_literal(self, node: BooleanLiteral):
         self._add_line(f"BOOL({node.value})")
-    
-    def visit(self, node: ASTNode):
-        """Generic visit method that dispatches to specific visit methods."""
-        method_name = f"visit_{node.__class__.__name__.lower()}"
-        method_name = method_name.replace('literal', '_literal')
-        method_name = method_name.replace('statement', '_statement')
-        method_name = method_name.replace('declaration', '_declaration')
-        method_name = method_name.replace('binaryop', 'binary_op')
-        method_name = method_name.replace('unaryop', 'unary_op')
-        
-        if hasattr(self, method_name):
-            return getattr(self, method_name)(node)
-        else:
-            raise Exception(f"No visit method for {node.__class__.__name__}")
 
 def print_ast_tree(ast: Program):
     """Print the AST as a tree structure."""
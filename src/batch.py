@@ -0,0 +1,132 @@
+"""
+Batch Compilation for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+Compiles every .ml file under a directory across a pool of worker
+processes and reports one JSON line per file. Files are dispatched in
+sorted path order and results are written back in that same order as they
+complete, so the report is identical for any number of workers. Timing
+data is kept out of the per-file lines and only shown in the summary.
+"""
+
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+@dataclass
+class BatchSummary:
+    """Aggregate figures for one batch run."""
+    files: int = 0
+    failed: int = 0
+    total_bytes: int = 0
+    elapsed: float = 0.0
+    timings: List[Tuple[float, str]] = field(default_factory=list)  # (seconds, path)
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.total_bytes / 1_000_000 / self.elapsed if self.elapsed else 0.0
+
+    def slowest(self, count: int = 5) -> List[Tuple[float, str]]:
+        return sorted(self.timings, key=lambda item: (-item[0], item[1]))[:count]
+
+def find_sources(directory: str) -> List[Path]:
+    """All .ml files below directory, in a stable order."""
+    return sorted(Path(directory).rglob('*.ml'))
+
+def compile_batch_file(path: str, root: str, opt_level: int = 0) -> Tuple[Dict[str, Any], float]:
+    """Compile one file; returns its report line and the time it took."""
+    from compiler import MiniLangCompiler  # Imported here because compiler.py imports this module
+    start = time.perf_counter()
+    line: Dict[str, Any] = {'file': Path(os.path.relpath(path, root)).as_posix()}
+    try:
+        data = Path(path).read_bytes()
+        source = data.decode('utf-8')
+    except (OSError, UnicodeDecodeError) as e:
+        line.update(success=False, phase='read', bytes=0, tokens=0, errors=[str(e)])
+        return line, time.perf_counter() - start
+
+    result = MiniLangCompiler(opt_level=opt_level).compile(source)
+    line.update(success=result.success, phase=result.failed_phase, bytes=len(data),
+                tokens=result.token_count, errors=[str(error) for error in result.errors])
+    return line, time.perf_counter() - start
+
+def compile_directory(directory: str, jobs: Optional[int] = None,
+                      opt_level: int = 0) -> Iterator[Tuple[Dict[str, Any], float]]:
+    """Yield (report line, seconds) for each source file, in path order."""
+    paths = [str(path) for path in find_sources(directory)]
+    roots = [directory] * len(paths)
+    levels = [opt_level] * len(paths)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(paths) <= 1:
+        yield from map(compile_batch_file, paths, roots, levels)
+        return
+
+    # Large chunks keep dispatch overhead low for thousands of small files
+    chunksize = max(1, len(paths) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(compile_batch_file, paths, roots, levels, chunksize=chunksize)
+
+def run_batch(directory: str, jobs: Optional[int] = None, opt_level: int = 0,
+              output: Optional[TextIO] = None) -> BatchSummary:
+    """Compile a directory, writing one JSON line per file to output."""
+    output = output or io.StringIO()
+    summary = BatchSummary()
+    start = time.perf_counter()
+    for line, seconds in compile_directory(directory, jobs, opt_level):
+        output.write(json.dumps(line, ensure_ascii=False) + '\n')
+        summary.files += 1
+        summary.failed += not line['success']
+        summary.total_bytes += line['bytes']
+        summary.timings.append((seconds, line['file']))
+    summary.elapsed = time.perf_counter() - start
+    return summary
+
+def format_summary(summary: BatchSummary, slowest: int = 5) -> str:
+    """Human-readable throughput report."""
+    lines = [
+        f"Compiled {summary.files} files ({summary.failed} failed) in {summary.elapsed:.2f} s",
+        f"Throughput: {summary.files_per_second:.1f} files/s, {summary.megabytes_per_second:.2f} MB/s",
+    ]
+    if summary.timings:
+        lines.append("Slowest files:")
+        for seconds, path in summary.slowest(slowest):
+            lines.append(f"  {seconds * 1000:8.2f} ms  {path}")
+    return "\n".join(lines)
+
+# Test batch compilation
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+    programs = {
+        'ok/basics.ml': "int x = 10; float y = 2.5; print(x + y);",
+        'ok/loop.ml': "int total = 0; for (int i = 0; i < 5; i = i + 1) { total = total + i; } print(total);",
+        'bad/lexical.ml': "int x = 5 @ 3;",
+        'bad/syntax.ml': "int x = ;",
+        'bad/semantic.ml': "int x = true; print(y);",
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for name, source in programs.items():
+            path = Path(directory) / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(source, encoding='utf-8')
+
+        report = io.StringIO()
+        summary = run_batch(directory, jobs=2, output=report)
+        sequential = io.StringIO()
+        run_batch(directory, jobs=1, output=sequential)
+
+        sys.stdout.write(report.getvalue())
+        print(format_summary(summary))
+        print(f"Same report with 1 and 2 workers: {report.getvalue() == sequential.getvalue()}")
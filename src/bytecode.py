@@ -0,0 +1,437 @@
+"""
+Bytecode Compiler for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+Lowers a type-checked AST into compact stack-machine bytecode:
+  - each function (and the top-level program) becomes a CodeObject whose
+    instructions are stored in an array('B'): one opcode byte, followed by
+    a 4-byte little-endian argument for opcodes that take one
+  - literals live in a constant pool shared by the whole program
+  - variables compile to the (depth, slot) numbers of the Symbols that
+    TypeChecker recorded on the AST, so no name is looked up again
+  - arithmetic is specialised on the static types TypeChecker inferred
+    (ADD_INT vs ADD_FLOAT), and int operands of float operations are
+    widened with I2F
+
+Variables declared by the top-level program are globals; everything else
+lives in the frame of the function that declares it. Functions may use
+their own locals and globals, but not the locals of an enclosing function.
+"""
+
+from array import array
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Tuple
+from ast_nodes import *
+from symbol_table import Symbol
+
+ARG_SIZE = 4  # Bytes per instruction argument
+
+class Op(IntEnum):
+    # Opcodes without an argument
+    POP = 1
+    PRINT = 2
+    RETURN = 3
+    HALT = 4
+    I2F = 5
+    ADD_INT = 6
+    SUB_INT = 7
+    MUL_INT = 8
+    DIV_INT = 9
+    ADD_FLOAT = 10
+    SUB_FLOAT = 11
+    MUL_FLOAT = 12
+    DIV_FLOAT = 13
+    NEG_INT = 14
+    NEG_FLOAT = 15
+    NOT = 16
+    LESS = 17
+    GREATER = 18
+    LESS_EQUAL = 19
+    GREATER_EQUAL = 20
+    EQUAL = 21
+    NOT_EQUAL = 22
+    I2F_LEFT = 23  # Widen the value below the top of the stack
+
+    # Opcodes taking an argument
+    LOAD_CONST = 64
+    LOAD_LOCAL = 65
+    STORE_LOCAL = 66
+    LOAD_GLOBAL = 67
+    STORE_GLOBAL = 68
+    JUMP = 69
+    JUMP_IF_FALSE = 70
+    JUMP_IF_FALSE_OR_POP = 71
+    JUMP_IF_TRUE_OR_POP = 72
+    CALL = 73
+
+HAS_ARG = Op.LOAD_CONST  # Opcodes >= this value carry an argument
+
+ARITHMETIC_OPS = {
+    ('+', 'int'): Op.ADD_INT, ('-', 'int'): Op.SUB_INT,
+    ('*', 'int'): Op.MUL_INT, ('/', 'int'): Op.DIV_INT,
+    ('+', 'float'): Op.ADD_FLOAT, ('-', 'float'): Op.SUB_FLOAT,
+    ('*', 'float'): Op.MUL_FLOAT, ('/', 'float'): Op.DIV_FLOAT,
+}
+
+COMPARISON_OPS = {
+    '<': Op.LESS, '>': Op.GREATER, '<=': Op.LESS_EQUAL,
+    '>=': Op.GREATER_EQUAL, '==': Op.EQUAL, '!=': Op.NOT_EQUAL,
+}
+
+# Value a variable holds before it is first assigned
+DEFAULT_VALUES = {'int': 0, 'float': 0.0, 'bool': False}
+
+class BytecodeError(Exception):
+    """Exception raised for programs the bytecode backend cannot compile."""
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(f"Bytecode Error: {message}")
+
+class CodeObject:
+    """Bytecode for one function (or the top-level program)."""
+
+    def __init__(self, name: str, return_type: Optional[str] = None, num_params: int = 0):
+        self.name = name
+        self.return_type = return_type
+        self.num_params = num_params
+        self.num_locals = num_params
+        self.slot_names: List[str] = []  # Variable name of each slot, for runtime errors
+        self.code = array('B')
+
+    def emit(self, op: Op, arg: Optional[int] = None) -> int:
+        """Append an instruction and return its offset."""
+        offset = len(self.code)
+        self.code.append(op)
+        if op >= HAS_ARG:
+            self.code.extend((arg or 0).to_bytes(ARG_SIZE, 'little'))
+        return offset
+
+    def patch(self, offset: int, target: int) -> None:
+        """Point the jump at offset to target."""
+        self.code[offset + 1:offset + 1 + ARG_SIZE] = array('B', target.to_bytes(ARG_SIZE, 'little'))
+
+    def add_local(self, slot: int, name: str) -> None:
+        """Record a variable slot numbered by TypeChecker (dead code elimination may leave gaps)."""
+        if slot >= len(self.slot_names):
+            self.slot_names.extend([''] * (slot + 1 - len(self.slot_names)))
+        self.slot_names[slot] = name
+        self.num_locals = max(self.num_locals, slot + 1)
+
+    def instructions(self) -> List[Tuple[int, Op, Optional[int]]]:
+        """Decode the bytecode into (offset, opcode, argument) triples."""
+        result = []
+        code = self.code
+        offset = 0
+        while offset < len(code):
+            op = Op(code[offset])
+            if op >= HAS_ARG:
+                arg = int.from_bytes(code[offset + 1:offset + 1 + ARG_SIZE], 'little')
+                result.append((offset, op, arg))
+                offset += 1 + ARG_SIZE
+            else:
+                result.append((offset, op, None))
+                offset += 1
+        return result
+
+class BytecodeProgram:
+    """A compiled program: function code objects plus the constant pool."""
+
+    def __init__(self):
+        self.functions: List[CodeObject] = []  # Index 0 is the top-level program
+        self.constants: List[Any] = []
+        self._constant_index: Dict[Tuple[type, Any], int] = {}
+
+    @property
+    def main(self) -> CodeObject:
+        return self.functions[0]
+
+    def add_constant(self, value: Any) -> int:
+        """Intern value in the constant pool and return its index."""
+        key = (type(value), repr(value))  # repr keeps 0.0 and -0.0 apart
+        if key not in self._constant_index:
+            self._constant_index[key] = len(self.constants)
+            self.constants.append(value)
+        return self._constant_index[key]
+
+    def code_size(self) -> int:
+        """Total bytes of bytecode across all functions."""
+        return sum(len(function.code) for function in self.functions)
+
+    def disassemble(self) -> str:
+        """Human-readable listing of every function."""
+        lines = []
+        for index, function in enumerate(self.functions):
+            lines.append(f"function {index}: {function.name} "
+                         f"(params={function.num_params}, locals={function.num_locals})")
+            for offset, op, arg in function.instructions():
+                if arg is None:
+                    lines.append(f"  {offset:5d}  {op.name}")
+                elif op == Op.LOAD_CONST:
+                    lines.append(f"  {offset:5d}  {op.name:<22}{arg} ({self.constants[arg]!r})")
+                elif op == Op.CALL:
+                    lines.append(f"  {offset:5d}  {op.name:<22}{arg} ({self.functions[arg].name})")
+                else:
+                    lines.append(f"  {offset:5d}  {op.name:<22}{arg}")
+            lines.append("")
+        return "\n".join(lines)
+
+class BytecodeCompiler(ASTVisitor):
+    """
+    Compiles a type-checked AST into a BytecodeProgram.
+
+    Visits of nodes with nested nodes are generators (see ASTVisitor), so
+    programs of any nesting depth can be compiled.
+    """
+
+    def __init__(self):
+        self.program = BytecodeProgram()
+        self.function: Optional[CodeObject] = None
+        self.frame_depth = 0  # Function nesting level of self.function
+
+    def compile(self, ast: Program) -> BytecodeProgram:
+        """Compile the whole program."""
+        self.program = BytecodeProgram()
+        self.frame_depth = 0
+        self.function = CodeObject('<main>')
+        self.program.functions.append(self.function)
+        self.visit(ast)
+        self.function.emit(Op.HALT)
+        return self.program
+
+    # Scopes and variables
+
+    def resolve(self, node: NamedNode) -> Tuple[Symbol, bool]:
+        """The variable TypeChecker resolved node's name to, as (symbol, is_global)."""
+        symbol = node.symbol
+        if symbol is None or symbol.is_function:
+            raise BytecodeError(f"Unresolved variable: {node.name} (type-check the program first)")
+        if symbol.depth == 0:
+            return symbol, True
+        if symbol.depth == self.frame_depth:
+            return symbol, False
+        raise BytecodeError(f"Function '{self.function.name}' uses '{node.name}' from an enclosing function")
+
+    def emit_load(self, node: NamedNode) -> str:
+        symbol, is_global = self.resolve(node)
+        self.function.emit(Op.LOAD_GLOBAL if is_global else Op.LOAD_LOCAL, symbol.slot)
+        return symbol.type
+
+    def emit_store(self, node: NamedNode, value_type: str) -> None:
+        symbol, is_global = self.resolve(node)
+        self.emit_widen(symbol.type, value_type)
+        self.function.emit(Op.STORE_GLOBAL if is_global else Op.STORE_LOCAL, symbol.slot)
+
+    def emit_widen(self, target_type: str, value_type: str) -> None:
+        """Convert the int on top of the stack when a float is expected."""
+        if target_type == 'float' and value_type == 'int':
+            self.function.emit(Op.I2F)
+
+    def emit_constant(self, value: Any) -> None:
+        self.function.emit(Op.LOAD_CONST, self.program.add_constant(value))
+
+    def emit_jump(self, op: Op) -> int:
+        return self.function.emit(op, 0)
+
+    def patch_here(self, jump: int) -> None:
+        self.function.patch(jump, len(self.function.code))
+
+    def compile_statements(self, statements: List[Statement]):
+        """Compile a statement list (use with yield from)."""
+        for stmt in statements:
+            yield stmt
+            if isinstance(stmt, FunctionCall):
+                self.function.emit(Op.POP)  # A call statement discards its return value
+
+    def compile_condition(self, condition: Expression):
+        """Compile a condition; yield from it for the offset of its exit jump."""
+        yield condition
+        return self.emit_jump(Op.JUMP_IF_FALSE)
+
+    # Statements
+
+    def visit_program(self, node: Program):
+        yield from self.compile_statements(node.statements)
+
+    def visit_var_declaration(self, node: VarDeclaration):
+        if node.value is not None:
+            value_type = yield node.value
+        else:
+            self.emit_constant(DEFAULT_VALUES[node.var_type])
+            value_type = node.var_type
+        symbol, _ = self.resolve(node)
+        self.function.add_local(symbol.slot, node.name)
+        self.emit_store(node, value_type)
+
+    def visit_assignment(self, node: Assignment):
+        self.emit_store(node, (yield node.value))
+
+    def visit_print_statement(self, node: PrintStatement):
+        yield node.expression
+        self.function.emit(Op.PRINT)
+
+    def visit_if_statement(self, node: IfStatement):
+        exit_then = yield from self.compile_condition(node.condition)
+        yield from self.compile_statements(node.then_statements)
+        if node.else_statements:
+            skip_else = self.emit_jump(Op.JUMP)
+            self.patch_here(exit_then)
+            yield from self.compile_statements(node.else_statements)
+            self.patch_here(skip_else)
+        else:
+            self.patch_here(exit_then)
+
+    def visit_while_statement(self, node: WhileStatement):
+        loop_start = len(self.function.code)
+        exit_loop = yield from self.compile_condition(node.condition)
+        yield from self.compile_statements(node.body)
+        self.function.emit(Op.JUMP, loop_start)
+        self.patch_here(exit_loop)
+
+    def visit_for_statement(self, node: ForStatement):
+        if node.init:
+            yield node.init
+        loop_start = len(self.function.code)
+        exit_loop = (yield from self.compile_condition(node.condition)) if node.condition else None
+        yield from self.compile_statements(node.body)
+        if node.update:
+            yield node.update
+        self.function.emit(Op.JUMP, loop_start)
+        if exit_loop is not None:
+            self.patch_here(exit_loop)
+
+    def visit_do_while_statement(self, node: DoWhileStatement):
+        loop_start = len(self.function.code)
+        yield from self.compile_statements(node.body)
+        exit_loop = yield from self.compile_condition(node.condition)
+        self.function.emit(Op.JUMP, loop_start)
+        self.patch_here(exit_loop)
+
+    def visit_block(self, node: Block):
+        yield from self.compile_statements(node.statements)
+
+    def visit_function_declaration(self, node: FunctionDeclaration):
+        # The function symbol's slot is its index in the function table
+        if node.symbol is None:
+            raise BytecodeError(f"Unresolved function: {node.name} (type-check the program first)")
+        function = CodeObject(node.name, node.return_type, len(node.parameters))
+        node.symbol.slot = len(self.program.functions)
+        self.program.functions.append(function)
+
+        old_function = self.function
+        self.function = function
+        self.frame_depth += 1
+        try:
+            # Parameters occupy the first slots, filled in by CALL
+            for slot, (_, param_name) in enumerate(node.parameters):
+                function.add_local(slot, param_name)
+            yield from self.compile_statements(node.body)
+            # Falling off the end returns the return type's default value
+            self.emit_constant(DEFAULT_VALUES[node.return_type])
+            function.emit(Op.RETURN)
+        finally:
+            self.function = old_function
+            self.frame_depth -= 1
+
+    def visit_return_statement(self, node: ReturnStatement):
+        return_type = self.function.return_type
+        if node.value is not None:
+            self.emit_widen(return_type, (yield node.value))
+        else:
+            self.emit_constant(DEFAULT_VALUES.get(return_type, 0))
+        self.function.emit(Op.RETURN)
+
+    # Expressions (each returns its static type)
+
+    def visit_function_call(self, node: FunctionCall) -> str:
+        symbol = node.symbol
+        if symbol is None:
+            raise BytecodeError(f"Unresolved function: {node.name} (type-check the program first)")
+        for param_type, arg in zip(symbol.param_types, node.arguments):
+            self.emit_widen(param_type, (yield arg))
+        self.function.emit(Op.CALL, symbol.slot)
+        return symbol.type
+
+    def visit_binary_op(self, node: BinaryOp) -> str:
+        operator = node.operator
+
+        # Logical operators short-circuit, leaving the deciding operand on the stack
+        if operator == 'and' or operator == 'or':
+            yield node.left
+            jump = self.emit_jump(Op.JUMP_IF_FALSE_OR_POP if operator == 'and' else Op.JUMP_IF_TRUE_OR_POP)
+            yield node.right
+            self.patch_here(jump)
+            return 'bool'
+
+        if operator in COMPARISON_OPS:
+            yield node.left
+            yield node.right
+            self.function.emit(COMPARISON_OPS[operator])
+            return 'bool'
+
+        # Arithmetic: widen int operands of a float operation
+        left_type = yield node.left
+        right_type = yield node.right
+        result_type = node.inferred_type
+        self.emit_widen(result_type, right_type)
+        if result_type == 'float' and left_type == 'int':
+            self.function.emit(Op.I2F_LEFT)
+        self.function.emit(ARITHMETIC_OPS[(operator, result_type)])
+        return result_type
+
+    def visit_unary_op(self, node: UnaryOp) -> str:
+        yield node.operand
+        if node.operator == 'not':
+            self.function.emit(Op.NOT)
+        else:
+            self.function.emit(Op.NEG_FLOAT if node.inferred_type == 'float' else Op.NEG_INT)
+        return node.inferred_type
+
+    def visit_identifier(self, node: Identifier) -> str:
+        return self.emit_load(node)
+
+    def visit_integer_literal(self, node: IntegerLiteral) -> str:
+        self.emit_constant(node.value)
+        return 'int'
+
+    def visit_float_literal(self, node: FloatLiteral) -> str:
+        self.emit_constant(node.value)
+        return 'float'
+
+    def visit_boolean_literal(self, node: BooleanLiteral) -> str:
+        self.emit_constant(node.value)
+        return 'bool'
+
+def compile_to_bytecode(ast: Program) -> BytecodeProgram:
+    """Compile a type-checked AST into bytecode."""
+    return BytecodeCompiler().compile(ast)
+
+# Test the bytecode compiler
+if __name__ == "__main__":
+    from scanner import Scanner
+    from parser import Parser
+    from semantic_analyzer import TypeChecker
+
+    test_code = '''
+    function int factorial(int n) {
+        if (n <= 1) {
+            return 1;
+        }
+        return n * factorial(n - 1);
+    }
+
+    float total = 0;
+    for (int i = 1; i <= 3; i = i + 1) {
+        total = total + i * 0.5;
+    }
+    print(total);
+    print(factorial(5));
+    '''
+
+    tokens = Scanner(test_code).tokenize()
+    ast = Parser(tokens).parse()
+
+    if ast and TypeChecker().analyze(ast):
+        program = compile_to_bytecode(ast)
+        print(program.disassemble())
+        print(f"Code size: {program.code_size()} bytes, {len(program.constants)} constants")
@@ -54,89 +54,96 @@ class CleanVerticalTreeVisualizer:
             return ""
     
     def _create_simple_tree(self, node, level=0, is_last=True, prefix=""):
-        """Create a clean vertical tree representation."""
-        # Get node display info
-        name = self._get_node_name(node)
-        details = self._get_node_details(node)
-        full_name = name + details
-        
-        # Create the line for this node with proper alignment
-        if level == 0:
-            # Root node - center it
-            line = full_name
-        else:
-            # Child nodes - use tree connectors
-            if is_last:
-                connector = "└── "
-                child_prefix_addition = "    "
-            else:
-                connector = "├── "
-                child_prefix_addition = "│   "
-            line = prefix + connector + full_name
-        
-        self.output.append(line)
-        
-        # Get children
-        children = self._get_children(node)
-        
-        if children:
-            # Prepare prefix for children
+        """Create a clean vertical tree representation (on an explicit stack, so any depth works)."""
+        stack = [(node, level, is_last, prefix)]
+        while stack:
+            node, level, is_last, prefix = stack.pop()
+            # Get node display info
+            name = self._get_node_name(node)
+            details = self._get_node_details(node)
+            full_name = name + details
+            
+            # Create the line for this node with proper alignment
             if level == 0:
-                child_prefix = ""
+                # Root node - center it
+                line = full_name
             else:
-                child_prefix = prefix + child_prefix_addition
+                # Child nodes - use tree connectors
+                if is_last:
+                    connector = "└── "
+                    child_prefix_addition = "    "
+                else:
+                    connector = "├── "
+                    child_prefix_addition = "│   "
+                line = prefix + connector + full_name
+            
+            self.output.append(line)
+            
+            # Get children
+            children = self._get_children(node)
             
-            # Process children
-            for i, child in enumerate(children):
-                is_last_child = (i == len(children) - 1)
-                self._create_simple_tree(child, level + 1, is_last_child, child_prefix)
+            if children:
+                # Prepare prefix for children
+                if level == 0:
+                    child_prefix = ""
+                else:
+                    child_prefix = prefix + child_prefix_addition
+                
+                # Push children last first, so the first is drawn next
+                last = len(children) - 1
+                for i in range(last, -1, -1):
+                    stack.append((children[i], level + 1, i == last, child_prefix))
     
     def _create_boxed_tree(self, node, level=0):
-        """Create a boxed tree representation."""
-        indent = "    " * level
-        name = self._get_node_name(node)
-        details = self._get_node_details(node)
-        full_name = name + details
-        
-        # Create box
-        box_width = max(len(full_name) + 4, 12)
-        padding = (box_width - len(full_name) - 2) // 2
-        
-        top_line = indent + "┌" + "─" * (box_width - 2) + "┐"
-        middle_line = indent + "│" + " " * padding + full_name + " " * (box_width - len(full_name) - padding - 2) + "│"
-        bottom_line = indent + "└" + "─" * (box_width - 2) + "┘"
-        
-        self.output.append(top_line)
-        self.output.append(middle_line) 
-        self.output.append(bottom_line)
-        
-        # Get children
-        children = self._get_children(node)
-        
-        if children:
-            # Add vertical connector
-            connector_pos = box_width // 2
-            self.output.append(indent + " " * connector_pos + "│")
+        """Create a boxed tree representation (on an explicit stack, so any depth works)."""
+        stack = [(node, level)]
+        while stack:
+            node, level = stack.pop()
+            if level > 0:
+                self.output.append("")  # Add spacing before each child
+            indent = "    " * level
+            name = self._get_node_name(node)
+            details = self._get_node_details(node)
+            full_name = name + details
+            
+            # Create box
+            box_width = max(len(full_name) + 4, 12)
+            padding = (box_width - len(full_name) - 2) // 2
+            
+            top_line = indent + "┌" + "─" * (box_width - 2) + "┐"
+            middle_line = indent + "│" + " " * padding + full_name + " " * (box_width - len(full_name) - padding - 2) + "│"
+            bottom_line = indent + "└" + "─" * (box_width - 2) + "┘"
+            
+            self.output.append(top_line)
+            self.output.append(middle_line) 
+            self.output.append(bottom_line)
             
-            # Add horizontal line if multiple children
-            if len(children) > 1:
-                # Calculate positions
-                total_children_width = sum(max(len(self._get_node_name(child) + self._get_node_details(child)) + 4, 12) for child in children)
-                spacing = max(4, (80 - total_children_width) // len(children))
+            # Get children
+            children = self._get_children(node)
+            
+            if children:
+                # Add vertical connector
+                connector_pos = box_width // 2
+                self.output.append(indent + " " * connector_pos + "│")
                 
-                horizontal_line = indent + " " * connector_pos + "┼"
-                for i in range(len(children) - 1):
-                    horizontal_line += "─" * spacing + "┬"
+                # Add horizontal line if multiple children
+                if len(children) > 1:
+                    # Calculate positions
+                    total_children_width = sum(max(len(self._get_node_name(child) + self._get_node_details(child)) + 4, 12) for child in children)
+                    spacing = max(4, (80 - total_children_width) // len(children))
+                    
+                    horizontal_line = indent + " " * connector_pos + "┼"
+                    for i in range(len(children) - 1):
+                        horizontal_line += "─" * spacing + "┬"
+                    
+                    self.output.append(horizontal_line)
+                    self.output.append(indent + " " * connector_pos + "│" + "│" * (len(horizontal_line) - len(indent) - connector_pos - 1))
+                else:
+                    self.output.append(indent + " " * connector_pos + "│")
                 
-                self.output.append(horizontal_line)
-                self.output.append(indent + " " * connector_pos + "│" + "│" * (len(horizontal_line) - len(indent) - connector_pos - 1))
-            else:
-                self.output.append(indent + " " * connector_pos + "│")
-            
-            # Process children
-            for child in children:
-                self.output.append("")  # Add spacing
-                self._create_boxed_tree(child, level + 1)
+                # Push children last first, so the first is drawn next
+                for child in reversed(children):
+                    stack.append((child, level + 1))
     
     def _get_children(self, node):
         """Get child nodes."""
@@ -0,0 +1,225 @@
+"""
+Compilation Cache for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+Stores the result of the front end (tokens, AST, symbol table and errors)
+under a hash of the source text, the compiler version and the optimization
+level, so an identical submission is served without re-running any phase.
+MiniLangCompiler(cache=...).compile() looks records up and stores them.
+
+There are two tiers: an in-memory LRU and an optional on-disk store. Both
+keep the tokens as a TokenBuffer, about a fifth of the memory of a list of
+Tokens. Disk entries are zlib-compressed pickles that also hold the AST as
+a FlatAST, so trees of any depth can be stored.
+Cached records are shared between callers and must be treated as read-only.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from ast_nodes import Program
+from flat_ast import FlatAST
+from symbol_table import SymbolTable
+from tokens import Token, TokenBuffer
+
+# Modules whose behaviour determines what a compilation produces (the optimizer
+# folds with the interpreter's arithmetic, so interpreter.py counts too)
+FRONT_END_MODULES = ('tokens.py', 'scanner.py', 'parser.py', 'ast_nodes.py', 'flat_ast.py',
+                     'semantic_analyzer.py', 'symbol_table.py', 'optimizer.py', 'interpreter.py')
+
+def compiler_version() -> str:
+    """Fingerprint of the front-end sources, so any change to them invalidates the cache."""
+    digest = hashlib.sha256()
+    src_dir = Path(__file__).resolve().parent
+    for name in FRONT_END_MODULES:
+        digest.update((src_dir / name).read_bytes())
+    return digest.hexdigest()[:16]
+
+COMPILER_VERSION = compiler_version()
+
+@dataclass
+class CompilationRecord:
+    """Everything the front end produced for one source text."""
+    tokens: Sequence[Token]  # A TokenBuffer once stored in a CompileCache
+    ast: Optional[Program]
+    symbol_table: Optional[SymbolTable]
+    errors: List[Any] = field(default_factory=list)  # Errors of the phase that failed
+    failed_phase: Optional[str] = None  # 'lexical', 'syntax', 'semantic' or None
+
+    @property
+    def success(self) -> bool:
+        return self.failed_phase is None
+
+def cache_key(source: str, opt_level: int = 0) -> str:
+    """Content address of a compilation."""
+    digest = hashlib.sha256()
+    digest.update(f"{COMPILER_VERSION}\0{opt_level}\0".encode('utf-8'))
+    digest.update(source.encode('utf-8'))
+    return digest.hexdigest()
+
+def pack_tokens(tokens: Sequence[Token], source: str) -> TokenBuffer:
+    """tokens as a TokenBuffer over source (as is if they already are one)."""
+    if isinstance(tokens, TokenBuffer):
+        return tokens
+    return TokenBuffer.from_tokens(tokens, source)
+
+def encode_record(record: CompilationRecord, source: str) -> bytes:
+    """Serialise a record for the disk tier."""
+    payload = (pack_tokens(record.tokens, source) if record.tokens else None,
+               FlatAST.from_tree(record.ast) if record.ast is not None else None,
+               record.symbol_table, record.errors, record.failed_phase)
+    return zlib.compress(pickle.dumps(payload, pickle.HIGHEST_PROTOCOL))
+
+def decode_record(data: bytes) -> CompilationRecord:
+    buffer, flat_ast, symbol_table, errors, failed_phase = pickle.loads(zlib.decompress(data))
+    tokens = buffer if buffer is not None else []
+    ast = flat_ast.to_tree() if flat_ast is not None else None
+    return CompilationRecord(tokens, ast, symbol_table, errors, failed_phase)
+
+class CompileCache:
+    """Two-tier (memory LRU, optional disk) cache of compilation records."""
+
+    def __init__(self, max_entries: int = 128, cache_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.entries: 'OrderedDict[str, CompilationRecord]' = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def get(self, source: str, opt_level: int = 0) -> Optional[CompilationRecord]:
+        """Look up a compilation, promoting disk hits into memory."""
+        key = cache_key(source, opt_level)
+        record = self.entries.get(key)
+        if record is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return record
+
+        record = self.read_disk(key)
+        if record is not None:
+            self.disk_hits += 1
+            self.remember(key, record)
+            return record
+
+        self.misses += 1
+        return None
+
+    def put(self, source: str, record: CompilationRecord, opt_level: int = 0) -> None:
+        """Store a compilation in memory and, if enabled, on disk."""
+        key = cache_key(source, opt_level)
+        if record.tokens:
+            record = replace(record, tokens=pack_tokens(record.tokens, source))
+        self.remember(key, record)
+        self.write_disk(key, record, source)
+
+    def remember(self, key: str, record: CompilationRecord) -> None:
+        self.entries[key] = record
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def disk_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.mlc"
+
+    def read_disk(self, key: str) -> Optional[CompilationRecord]:
+        if self.cache_dir is None:
+            return None
+        path = self.disk_path(key)
+        try:
+            return decode_record(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Unreadable entry (truncated write, old format): drop it and recompile
+            path.unlink(missing_ok=True)
+            return None
+
+    def write_disk(self, key: str, record: CompilationRecord, source: str) -> None:
+        if self.cache_dir is None:
+            return
+        try:
+            data = encode_record(record, source)
+        except Exception:
+            return  # Records that cannot be encoded stay memory-only
+        # Write to a temporary file first so readers never see a partial entry
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(temp_path, self.disk_path(key))
+        except OSError:
+            # Disk full or read-only: the entry stays memory-only
+            if temp_path is not None:
+                Path(temp_path).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Drop the memory tier (the disk tier is left in place)."""
+        self.entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters."""
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+# Test the compile cache
+if __name__ == "__main__":
+    import sys
+    import time
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from compiler import MiniLangCompiler
+
+    test_code = '''
+    function int factorial(int n) {
+        if (n <= 1) {
+            return 1;
+        }
+        return n * factorial(n - 1);
+    }
+    int total = 0;
+    for (int i = 1; i <= 10; i = i + 1) {
+        total = total + factorial(i);
+    }
+    print(total);
+    '''
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = CompileCache(max_entries=2, cache_dir=directory)
+        compiler = MiniLangCompiler(cache=cache)
+
+        start = time.perf_counter()
+        compiler.compile(test_code)
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = compiler.compile(test_code)
+        warm = time.perf_counter() - start
+
+        # Push the program out of memory, then serve it from disk
+        compiler.compile("int a = 1;")
+        compiler.compile("int b = 2;")
+        start = time.perf_counter()
+        compiler.compile(test_code)
+        disk = time.perf_counter() - start
+
+        print(f"Compiler version: {COMPILER_VERSION}")
+        print(f"Success: {result.success}, tokens: {len(result.tokens)}, cached: {result.cached}")
+        print(f"Cold: {cold * 1000:.2f} ms, memory hit: {warm * 1000:.3f} ms, disk hit: {disk * 1000:.2f} ms")
+        print(f"Stats: {cache.stats()}")
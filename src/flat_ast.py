@@ -0,0 +1,526 @@
+"""
+Flat AST for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+FlatAST stores a whole tree in parallel array columns instead of one
+object per node. Node i is described by:
+
+    kinds[i]    index of its class in NODE_CLASSES
+    codes[i]    operator (OPERATORS) or declared type (DECLARED_TYPES)
+    values[i]   index into constants of its name, literal value or message
+                (a function's (name, parameters) pair), NO_NODE if none
+    types[i]    inferred type of an operator (TYPE_NAMES), 0 if not typed
+    links[link_starts[i]:link_starts[i + 1]]
+                indices of its children, NO_NODE for an absent one:
+
+    Program, Block          statements...
+    VarDeclaration          value
+    Assignment              value
+    PrintStatement          expression
+    IfStatement             condition, then..., [NO_NODE, else...]
+    WhileStatement          condition, body...
+    ForStatement            init, condition, update, body...
+    DoWhileStatement        condition, body...
+    FunctionDeclaration     body...
+    ReturnStatement         value
+    FunctionCall            arguments...
+    BinaryOp                left, right
+    UnaryOp                 operand
+
+Nodes are stored in pre-order: the root is node 0 and a parent always has
+a lower index than its children. A node object reached twice (a shared
+subtree) is stored once. Constants are interned, and the symbols
+TypeChecker resolved are kept in a dict by node index.
+
+FlatAST.node() wraps an index in a view: an object of a subclass of the
+node's class that reads its fields from the columns on access and
+reports the node class itself as __class__. Visitors, isinstance()
+checks and the type checker work on views as on the nodes they stand
+for, so TypeChecker().analyze(flat.root) checks the flat form directly
+and records its annotations in the columns. Views are created on demand
+and kept, so each index always has the same view.
+
+Building, rebuilding and pickling a FlatAST never recurse, so trees of any
+depth can be converted and serialized.
+"""
+
+from array import array
+from typing import Any, Dict, Iterator, List, Optional
+from ast_nodes import *
+
+NODE_CLASSES = (Program, VarDeclaration, Assignment, PrintStatement, IfStatement,
+                WhileStatement, ForStatement, DoWhileStatement, FunctionDeclaration,
+                ReturnStatement, FunctionCall, Block, BinaryOp, UnaryOp, Identifier,
+                IntegerLiteral, FloatLiteral, BooleanLiteral, ErrorStatement, ErrorExpression)
+KINDS = {node_class: kind for kind, node_class in enumerate(NODE_CLASSES)}
+
+OPERATORS = ('+', '-', '*', '/', '==', '!=', '<', '>', '<=', '>=', 'and', 'or', 'not')
+OPERATOR_CODES = {operator: code for code, operator in enumerate(OPERATORS)}
+DECLARED_TYPES = ('int', 'float', 'bool')
+DECLARED_TYPE_CODES = {type_name: code for code, type_name in enumerate(DECLARED_TYPES)}
+TYPE_NAMES = (None, 'int', 'float', 'bool')
+TYPE_CODES = {type_name: code for code, type_name in enumerate(TYPE_NAMES)}
+
+NO_NODE = -1
+
+def constant_key(value: Any) -> tuple:
+    """Key of value in FlatAST.constant_indices."""
+    # Keyed by type too, since 1 == 1.0 == True; floats by repr to keep -0.0 and nan
+    return (value.__class__, repr(value) if value.__class__ is float else value)
+
+class FlatAST:
+    """
+    Compact struct-of-arrays AST (see the module docstring for the layout).
+
+    Each node costs a few bytes of columns plus four bytes per child,
+    instead of a dataclass object, its slots and its lists.
+    from_tree() packs a tree, to_tree() rebuilds the objects, and node(),
+    root and len() give the view layer.
+    """
+
+    __slots__ = ('kinds', 'codes', 'values', 'types', 'link_starts', 'links',
+                 'constants', 'constant_indices', 'symbols', '_views')
+
+    def __init__(self):
+        self.kinds = array('B')
+        self.codes = array('B')
+        self.values = array('i')
+        self.types = array('B')
+        self.link_starts = array('I', [0])
+        self.links = array('i')
+        self.constants: List[Any] = []
+        self.constant_indices: Dict[Any, int] = {}
+        self.symbols: Dict[int, Any] = {}  # Node index -> Symbol resolved by TypeChecker
+        self._views: Optional[List[Optional[ASTNode]]] = None  # By index, filled on demand
+
+    @classmethod
+    def from_tree(cls, program: Program) -> 'FlatAST':
+        """Pack a tree, with the annotations TypeChecker left on it."""
+        flat = cls()
+        kinds, codes, values, types = flat.kinds, flat.codes, flat.values, flat.types
+        link_starts, links, symbols, intern = flat.link_starts, flat.links, flat.symbols, flat.intern
+        indices: Dict[int, int] = {}  # id(node) -> index
+        # (node, position in links to write its index to); pre-order, leftmost first
+        stack = [(program, NO_NODE)]
+        while stack:
+            node, slot = stack.pop()
+            index = indices.get(id(node))
+            if index is None:
+                index = indices[id(node)] = len(kinds)
+                node_class = node.__class__
+                code = 0
+                value = NO_NODE
+                type_code = 0
+                symbol = None
+                children = ()  # In link order, None where one is absent
+                if node_class is BinaryOp:
+                    code = OPERATOR_CODES[node.operator]
+                    type_code = TYPE_CODES[node.inferred_type]
+                    children = (node.left, node.right)
+                elif node_class is Identifier:
+                    value = intern(node.name)
+                    symbol = node.symbol
+                elif (node_class is IntegerLiteral or node_class is FloatLiteral
+                      or node_class is BooleanLiteral):
+                    value = intern(node.value)
+                elif node_class is UnaryOp:
+                    code = OPERATOR_CODES[node.operator]
+                    type_code = TYPE_CODES[node.inferred_type]
+                    children = (node.operand,)
+                elif node_class is FunctionCall:
+                    value = intern(node.name)
+                    symbol = node.symbol
+                    children = node.arguments
+                elif node_class is Assignment:
+                    value = intern(node.name)
+                    symbol = node.symbol
+                    children = (node.value,)
+                elif node_class is VarDeclaration:
+                    code = DECLARED_TYPE_CODES[node.var_type]
+                    value = intern(node.name)
+                    symbol = node.symbol
+                    children = (node.value,)
+                elif node_class is PrintStatement:
+                    children = (node.expression,)
+                elif node_class is ReturnStatement:
+                    children = (node.value,)
+                elif node_class is Program or node_class is Block:
+                    children = node.statements
+                elif node_class is IfStatement:
+                    children = [node.condition, *node.then_statements]
+                    if node.else_statements is not None:
+                        children.append(None)
+                        children.extend(node.else_statements)
+                elif node_class is WhileStatement or node_class is DoWhileStatement:
+                    children = [node.condition, *node.body]
+                elif node_class is ForStatement:
+                    children = [node.init, node.condition, node.update, *node.body]
+                elif node_class is FunctionDeclaration:
+                    code = DECLARED_TYPE_CODES[node.return_type]
+                    value = intern((node.name, tuple(tuple(parameter) for parameter in node.parameters)))
+                    symbol = node.symbol
+                    children = node.body
+                elif node_class is ErrorStatement or node_class is ErrorExpression:
+                    value = intern(node.message)
+                else:
+                    raise TypeError(f"Cannot flatten {node_class.__name__}")
+                kinds.append(KINDS[node_class])
+                codes.append(code)
+                values.append(value)
+                types.append(type_code)
+                if symbol is not None:
+                    symbols[index] = symbol
+                
+                if children:
+                    # Reserve the links; each child fills in its slot once it has an index
+                    start = len(links)
+                    links.extend([NO_NODE] * len(children))
+                    for position in range(len(children) - 1, -1, -1):
+                        child = children[position]
+                        if child is not None:
+                            stack.append((child, start + position))
+                link_starts.append(len(links))
+            if slot != NO_NODE:
+                links[slot] = index
+        return flat
+
+    def intern(self, value: Any) -> int:
+        """Index of value in the constant table, adding it if new."""
+        key = constant_key(value)
+        index = self.constant_indices.get(key)
+        if index is None:
+            index = self.constant_indices[key] = len(self.constants)
+            self.constants.append(value)
+        return index
+
+    def to_tree(self) -> Program:
+        """Rebuild the node objects, annotations and shared subtrees included."""
+        kinds, codes, values, types = self.kinds, self.codes, self.values, self.types
+        link_starts, links, constants, symbols = self.link_starts, self.links, self.constants, self.symbols
+        nodes: List[Optional[ASTNode]] = [None] * len(kinds)
+        for index in range(len(kinds) - 1, -1, -1):
+            # Children have higher indices, so they are already built
+            children = [None if link == NO_NODE else nodes[link]
+                        for link in links[link_starts[index]:link_starts[index + 1]]]
+            value = constants[values[index]] if values[index] != NO_NODE else None
+            node_class = NODE_CLASSES[kinds[index]]
+            if node_class is BinaryOp:
+                node = BinaryOp(children[0], OPERATORS[codes[index]], children[1])
+            elif node_class is UnaryOp:
+                node = UnaryOp(OPERATORS[codes[index]], children[0])
+            elif (node_class is Identifier or node_class is IntegerLiteral
+                  or node_class is FloatLiteral or node_class is BooleanLiteral):
+                node = node_class(value)
+            elif node_class is FunctionCall:
+                node = FunctionCall(value, children)
+            elif node_class is Program or node_class is Block:
+                node = node_class(children)
+            elif node_class is VarDeclaration:
+                node = VarDeclaration(DECLARED_TYPES[codes[index]], value, children[0])
+            elif node_class is Assignment:
+                node = Assignment(value, children[0])
+            elif node_class is PrintStatement or node_class is ReturnStatement:
+                node = node_class(children[0])
+            elif node_class is IfStatement:
+                if None in children:
+                    split = children.index(None)
+                    node = IfStatement(children[0], children[1:split], children[split + 1:])
+                else:
+                    node = IfStatement(children[0], children[1:])
+            elif node_class is WhileStatement:
+                node = WhileStatement(children[0], children[1:])
+            elif node_class is DoWhileStatement:
+                node = DoWhileStatement(children[1:], children[0])
+            elif node_class is ForStatement:
+                node = ForStatement(children[0], children[1], children[2], children[3:])
+            elif node_class is FunctionDeclaration:
+                node = FunctionDeclaration(DECLARED_TYPES[codes[index]], value[0],
+                                           list(value[1]), children)
+            else:
+                node = node_class(value)  # Error placeholders
+            if types[index]:
+                node.inferred_type = TYPE_NAMES[types[index]]
+            symbol = symbols.get(index)
+            if symbol is not None:
+                node.symbol = symbol
+            nodes[index] = node
+        return nodes[0]
+
+    # View layer
+
+    def node(self, index: int) -> ASTNode:
+        """The view of the node at index (the same object on every call)."""
+        views = self._views
+        if views is None:
+            views = self._views = [None] * len(self.kinds)
+        view = views[index]
+        if view is None:
+            view = views[index] = VIEW_CLASSES[self.kinds[index]](self, index)
+        return view
+
+    @property
+    def root(self) -> Program:
+        return self.node(0)
+
+    def link(self, index: int, position: int) -> Optional[ASTNode]:
+        """View of the child at position among node index's links, None if absent."""
+        link = self.links[self.link_starts[index] + position]
+        if link == NO_NODE:
+            return None
+        views = self._views
+        view = views[link] if views is not None else None
+        return view if view is not None else self.node(link)
+
+    def link_range(self, index: int, start: int = 0, stop: Optional[int] = None) -> List[ASTNode]:
+        """Views of node index's links from position start up to stop (default: the last)."""
+        first = self.link_starts[index]
+        last = self.link_starts[index + 1] if stop is None else first + stop
+        node = self.node
+        return [node(link) for link in self.links[first + start:last]]
+
+    def release_views(self) -> None:
+        """Drop the views handed out so far (annotations stay in the columns)."""
+        self._views = None
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __iter__(self) -> Iterator[ASTNode]:
+        for index in range(len(self.kinds)):
+            yield self.node(index)
+
+    def nbytes(self) -> int:
+        """Bytes used by the node columns (excluding constants and symbols)."""
+        return sum(column.itemsize * len(column)
+                   for column in (self.kinds, self.codes, self.values, self.types,
+                                  self.link_starts, self.links))
+
+    def __getstate__(self):
+        # Views are not part of the state: they are rebuilt on demand
+        return (self.kinds, self.codes, self.values, self.types, self.link_starts,
+                self.links, self.constants, self.symbols)
+
+    def __setstate__(self, state):
+        (self.kinds, self.codes, self.values, self.types, self.link_starts,
+         self.links, self.constants, self.symbols) = state
+        self.constant_indices = {constant_key(value): index for index, value in enumerate(self.constants)}
+        self._views = None
+
+class NodeView:
+    """
+    Base of the view classes: a node of a FlatAST, read from its columns.
+
+    Each view class subclasses the node class it stands for and sets
+    __class__ to it, so that views dispatch, compare and type-check as
+    those nodes. The Symbol TypeChecker assigns is kept in flat.symbols.
+    The flat and index slots are declared by each view class, since the
+    node classes are slotted and only one base may bring slots.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, flat: FlatAST, index: int):
+        self.flat = flat
+        self.index = index
+
+    @property
+    def symbol(self):
+        return self.flat.symbols.get(self.index)
+
+    @symbol.setter
+    def symbol(self, symbol):
+        if symbol is None:
+            self.flat.symbols.pop(self.index, None)
+        else:
+            self.flat.symbols[self.index] = symbol
+
+    @property
+    def value(self):
+        """Value of a literal (statements with a value field override this)."""
+        return self.flat.constants[self.flat.values[self.index]]
+
+    @property
+    def name(self) -> str:
+        return self.flat.constants[self.flat.values[self.index]]
+
+class OperationView(NodeView):
+    """View of an operator, whose inferred type is kept in flat.types."""
+
+    __slots__ = ()
+
+    @property
+    def operator(self) -> str:
+        return OPERATORS[self.flat.codes[self.index]]
+
+    @property
+    def inferred_type(self) -> Optional[str]:
+        return TYPE_NAMES[self.flat.types[self.index]]
+
+    @inferred_type.setter
+    def inferred_type(self, type_name: Optional[str]):
+        self.flat.types[self.index] = TYPE_CODES[type_name]
+
+class ProgramView(NodeView, Program):
+    __slots__ = ('flat', 'index')
+    __class__ = Program
+    statements = property(lambda self: self.flat.link_range(self.index))
+
+class BlockView(NodeView, Block):
+    __slots__ = ('flat', 'index')
+    __class__ = Block
+    statements = property(lambda self: self.flat.link_range(self.index))
+
+class VarDeclarationView(NodeView, VarDeclaration):
+    __slots__ = ('flat', 'index')
+    __class__ = VarDeclaration
+    var_type = property(lambda self: DECLARED_TYPES[self.flat.codes[self.index]])
+    value = property(lambda self: self.flat.link(self.index, 0))
+
+class AssignmentView(NodeView, Assignment):
+    __slots__ = ('flat', 'index')
+    __class__ = Assignment
+    value = property(lambda self: self.flat.link(self.index, 0))
+
+class PrintStatementView(NodeView, PrintStatement):
+    __slots__ = ('flat', 'index')
+    __class__ = PrintStatement
+    expression = property(lambda self: self.flat.link(self.index, 0))
+
+class ReturnStatementView(NodeView, ReturnStatement):
+    __slots__ = ('flat', 'index')
+    __class__ = ReturnStatement
+    value = property(lambda self: self.flat.link(self.index, 0))
+
+class IfStatementView(NodeView, IfStatement):
+    __slots__ = ('flat', 'index')
+    __class__ = IfStatement
+    condition = property(lambda self: self.flat.link(self.index, 0))
+
+    def _else_position(self) -> Optional[int]:
+        """Position of the NO_NODE that separates the branches, None without an else."""
+        flat = self.flat
+        first = flat.link_starts[self.index]
+        try:
+            return flat.links.index(NO_NODE, first + 1, flat.link_starts[self.index + 1]) - first
+        except ValueError:
+            return None
+
+    @property
+    def then_statements(self) -> List[Statement]:
+        return self.flat.link_range(self.index, 1, self._else_position())
+
+    @property
+    def else_statements(self) -> Optional[List[Statement]]:
+        position = self._else_position()
+        return None if position is None else self.flat.link_range(self.index, position + 1)
+
+class WhileStatementView(NodeView, WhileStatement):
+    __slots__ = ('flat', 'index')
+    __class__ = WhileStatement
+    condition = property(lambda self: self.flat.link(self.index, 0))
+    body = property(lambda self: self.flat.link_range(self.index, 1))
+
+class DoWhileStatementView(NodeView, DoWhileStatement):
+    __slots__ = ('flat', 'index')
+    __class__ = DoWhileStatement
+    condition = property(lambda self: self.flat.link(self.index, 0))
+    body = property(lambda self: self.flat.link_range(self.index, 1))
+
+class ForStatementView(NodeView, ForStatement):
+    __slots__ = ('flat', 'index')
+    __class__ = ForStatement
+    init = property(lambda self: self.flat.link(self.index, 0))
+    condition = property(lambda self: self.flat.link(self.index, 1))
+    update = property(lambda self: self.flat.link(self.index, 2))
+    body = property(lambda self: self.flat.link_range(self.index, 3))
+
+class FunctionDeclarationView(NodeView, FunctionDeclaration):
+    __slots__ = ('flat', 'index')
+    __class__ = FunctionDeclaration
+    return_type = property(lambda self: DECLARED_TYPES[self.flat.codes[self.index]])
+    name = property(lambda self: self.flat.constants[self.flat.values[self.index]][0])
+    parameters = property(lambda self: list(self.flat.constants[self.flat.values[self.index]][1]))
+    body = property(lambda self: self.flat.link_range(self.index))
+
+class FunctionCallView(NodeView, FunctionCall):
+    __slots__ = ('flat', 'index')
+    __class__ = FunctionCall
+    arguments = property(lambda self: self.flat.link_range(self.index))
+
+class BinaryOpView(OperationView, BinaryOp):
+    __slots__ = ('flat', 'index')
+    __class__ = BinaryOp
+    left = property(lambda self: self.flat.link(self.index, 0))
+    right = property(lambda self: self.flat.link(self.index, 1))
+
+class UnaryOpView(OperationView, UnaryOp):
+    __slots__ = ('flat', 'index')
+    __class__ = UnaryOp
+    operand = property(lambda self: self.flat.link(self.index, 0))
+
+class IdentifierView(NodeView, Identifier):
+    __slots__ = ('flat', 'index')
+    __class__ = Identifier
+
+class IntegerLiteralView(NodeView, IntegerLiteral):
+    __slots__ = ('flat', 'index')
+    __class__ = IntegerLiteral
+
+class FloatLiteralView(NodeView, FloatLiteral):
+    __slots__ = ('flat', 'index')
+    __class__ = FloatLiteral
+
+class BooleanLiteralView(NodeView, BooleanLiteral):
+    __slots__ = ('flat', 'index')
+    __class__ = BooleanLiteral
+
+class ErrorStatementView(NodeView, ErrorStatement):
+    __slots__ = ('flat', 'index')
+    __class__ = ErrorStatement
+    message = property(lambda self: self.flat.constants[self.flat.values[self.index]])
+
+class ErrorExpressionView(NodeView, ErrorExpression):
+    __slots__ = ('flat', 'index')
+    __class__ = ErrorExpression
+    message = property(lambda self: self.flat.constants[self.flat.values[self.index]])
+
+VIEW_CLASSES = (ProgramView, VarDeclarationView, AssignmentView, PrintStatementView,
+                IfStatementView, WhileStatementView, ForStatementView, DoWhileStatementView,
+                FunctionDeclarationView, ReturnStatementView, FunctionCallView, BlockView,
+                BinaryOpView, UnaryOpView, IdentifierView, IntegerLiteralView, FloatLiteralView,
+                BooleanLiteralView, ErrorStatementView, ErrorExpressionView)
+
+# Test the flat AST
+if __name__ == "__main__":
+    import pickle
+    from scanner import Scanner
+    from parser import Parser
+    from semantic_analyzer import TypeChecker
+
+    test_code = '''
+    function int square(int n) {
+        return n * n;
+    }
+    int total = 0;
+    for (int i = 1; i <= 10; i = i + 1) {
+        if (i > 5) {
+            total = total + square(i);
+        } else {
+            print(-i);
+        }
+    }
+    print(total);
+    '''
+
+    ast = Parser(Scanner(test_code).tokenize()).parse()
+    flat = FlatAST.from_tree(ast)
+    print(f"Nodes: {len(flat)}, column bytes: {flat.nbytes()}, constants: {flat.constants}")
+    print(f"Round trip equal: {flat.to_tree() == ast}, views equal: {flat.root == ast}")
+
+    checker = TypeChecker()
+    print(f"Type check over the flat form: {checker.analyze(flat.root)}, errors: {checker.errors}")
+
+    restored = pickle.loads(pickle.dumps(flat)).to_tree()
+    print(f"Pickled round trip equal: {restored == ast}")
+    print(f"Typed operators: {[(node.operator, node.inferred_type) for node in flat if isinstance(node, BinaryOp)]}")
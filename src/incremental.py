@@ -0,0 +1,489 @@
+"""
+Incremental Compilation for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+Keeps the tokens, top-level statements and symbols of one source text and
+updates them after an edit instead of recompiling from scratch:
+
+- Lexing: only the edited line range is re-scanned; tokens after it are
+  reused with their line numbers shifted.
+- Parsing: top-level statements that end before the edit are kept. Parsing
+  restarts at the first one that reaches it and stops as soon as it lands
+  back on the start of an old statement past the edit.
+- Semantics: a statement is re-checked only if it is new or mentions a
+  name that a changed statement declares or assigns. Everything else
+  contributes the global symbols it recorded last time.
+
+The result is a CompilationRecord with the same tokens, AST, symbol table
+and errors that MiniLangCompiler.compile() produces for the full text (at -O0). Records share tokens and nodes with the compiler
+state, so they are only valid until the next edit.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from ast_nodes import (ASTNode, ASTVisitor, Program, Statement, VarDeclaration, FunctionDeclaration,
+                       Assignment, Identifier, FunctionCall, Block, ForStatement)
+from tokens import Token, TokenType
+from scanner import LexicalError, create_scanner
+from parser import Parser, ParseError
+from symbol_table import Symbol
+from semantic_analyzer import TypeChecker
+from optimizer import collect_names
+from compile_cache import CompilationRecord
+
+@dataclass
+class TextEdit:
+    """Replace the text between two positions (1-based lines and columns) with text."""
+    start_line: int
+    start_column: int
+    end_line: int
+    end_column: int
+    text: str
+
+def bisect_by(items: list, key: Callable[[Any], int], value: int, lo: int = 0) -> int:
+    """
+    First index from lo at which key(item) >= value, items being sorted by
+    key (bisect_left's key argument needs Python 3.10).
+    """
+    hi = len(items)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if key(items[mid]) < value:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+class NodeWalker(ASTVisitor):
+    """
+    Visits every node under the one it is given, in source order.
+
+    Each visit is a generator that yields the node's subnodes (see
+    ASTVisitor), so statements of any nesting depth can be walked.
+    Subclasses override the visits of the nodes they look at, and
+    generic_visit to change what is walked below the others.
+    """
+
+    def generic_visit(self, node: ASTNode):
+        yield from node.subnodes()
+
+    def visit_subnodes(self, node: ASTNode):
+        return self.generic_visit(node)
+
+    visit_program = visit_var_declaration = visit_assignment = visit_print_statement = \
+        visit_if_statement = visit_while_statement = visit_block = visit_binary_op = \
+        visit_unary_op = visit_identifier = visit_integer_literal = visit_float_literal = \
+        visit_boolean_literal = visit_subnodes
+
+    def walk(self, node: Any) -> None:
+        """Visit a node or each node in a list; anything else (None) is skipped."""
+        for item in node if isinstance(node, list) else [node]:
+            if isinstance(item, ASTNode):
+                self.visit(item)
+
+class DeclaredNames(NodeWalker):
+    """Collects every name declared at any depth."""
+
+    def __init__(self, declared: Set[str]):
+        self.declared = declared
+
+    def visit_var_declaration(self, node: VarDeclaration):
+        self.declared.add(node.name)
+        return self.generic_visit(node)
+
+    visit_function_declaration = visit_var_declaration
+
+def declared_names(node: Any, declared: Set[str]) -> Set[str]:
+    """Collect every name a statement declares, at any depth."""
+    DeclaredNames(declared).walk(node)
+    return declared
+
+class FreeNames(NodeWalker):
+    """Collects the names resolved in the global scope; see free_names."""
+
+    def __init__(self, scopes: List[Set[str]], names: Set[str]):
+        self.scopes = scopes
+        self.names = names
+
+    def bind(self, name: str):
+        if self.scopes:
+            self.scopes[-1].add(name)
+        else:
+            self.names.add(name)
+
+    def resolve(self, name: str):
+        if not any(name in scope for scope in self.scopes):
+            self.names.add(name)
+
+    def visit_var_declaration(self, node: VarDeclaration):
+        yield node.value
+        self.bind(node.name)
+
+    def visit_function_declaration(self, node: FunctionDeclaration):
+        self.bind(node.name)
+        self.scopes.append({name for _, name in node.parameters})
+        yield from node.body
+        self.scopes.pop()
+
+    def visit_block(self, node: Block):
+        self.scopes.append(set())
+        yield from node.subnodes()
+        self.scopes.pop()
+
+    visit_for_statement = visit_block
+
+    def visit_identifier(self, node: Identifier):
+        self.resolve(node.name)
+
+    def visit_assignment(self, node: Assignment):
+        self.resolve(node.name)
+        return self.generic_visit(node)
+
+    visit_function_call = visit_assignment
+
+def free_names(node: Any, scopes: List[Set[str]], names: Set[str]) -> Set[str]:
+    """Collect the names a statement resolves in the global scope, following TypeChecker's scoping.
+
+    scopes holds the names bound by enclosing function, block and for scopes.
+    This is exact only if every local declaration succeeded, i.e. the
+    statement type-checked without errors.
+    """
+    FreeNames(scopes, names).walk(node)
+    return names
+
+class NestedGlobals(NodeWalker):
+    """Collects the global-frame variables declared in nested scopes; see nested_globals."""
+
+    def __init__(self, found: List[Symbol]):
+        self.found = found
+
+    def generic_visit(self, node: ASTNode):
+        # Only statements declare variables, and function bodies have frames of their own
+        yield from [item for item in node.subnodes()
+                    if isinstance(item, Statement) and not isinstance(item, FunctionDeclaration)]
+
+    def visit_var_declaration(self, node: VarDeclaration):
+        symbol = node.symbol
+        if symbol is not None and symbol.depth == 0 and symbol.scope_depth:
+            self.found.append(symbol)
+
+    def visit_function_declaration(self, node: FunctionDeclaration):
+        return None
+
+def nested_globals(node: Any, found: List[Symbol]) -> List[Symbol]:
+    """Collect the global-frame variables a top-level statement declares inside nested scopes.
+
+    They take global slots without being global symbols, e.g. the counter
+    of a top-level for loop. Reads the Symbols TypeChecker recorded.
+    """
+    NestedGlobals(found).walk(node)
+    return found
+
+def symbol_signature(symbols: Dict[str, Symbol]) -> Dict[str, Tuple]:
+    """What later statements can observe about a set of global symbols."""
+    return {name: (symbol.type, symbol.is_function, tuple(symbol.param_types or ()),
+                   symbol.initialized)
+            for name, symbol in symbols.items()}
+
+def format_parse_error(error: ParseError) -> str:
+    # Formatted on demand: the offending token's line may have shifted since
+    return f"Parse Error at line {error.token.line}, column {error.token.column}: {error.message}"
+
+UNASSIGNED = object()  # Stands in for Symbol.value (never read by TypeChecker) to spot assignments
+
+class TopLevelStep:
+    """One iteration of Parser.parse_program: a statement, partial if it had syntax errors."""
+    __slots__ = ('start', 'end', 'statement', 'syntax_errors', 'declared', 'deps', 'free_deps',
+                 'symbols', 'states', 'assigned', 'errors', 'checked', 'slot_base', 'slots_used',
+                 'nested')
+
+    def __init__(self, start: int, end: int, statement: Statement,
+                 syntax_errors: List[ParseError]):
+        self.start = start  # Token index of the first token
+        self.end = end  # Token index after the last token (also read as lookahead)
+        self.statement = statement
+        self.syntax_errors = syntax_errors
+        self.declared = declared_names(statement, set())
+        # Every name in the statement, and those it resolves globally if it checks cleanly
+        self.deps = set(collect_names(statement, Counter())) | self.declared
+        self.free_deps = free_names(statement, [], set())
+        self.symbols: Dict[str, Symbol] = {}  # Global symbols this step defined
+        self.states: Dict[str, Tuple] = {}  # Their (value, initialized) right after it
+        self.assigned: Set[str] = set()  # Earlier global symbols it assigned to
+        self.errors: List[Any] = []  # Its semantic errors
+        self.checked = False
+        self.slot_base = 0  # First global frame slot it used when last checked
+        self.slots_used = 0  # Global frame slots its declarations take
+        self.nested: List[Symbol] = []  # Its nested_globals(), which hold slots but are not in symbols
+
+    def dependencies(self) -> Set[str]:
+        # A failed local declaration lets later uses of the name resolve globally
+        return self.free_deps if self.checked and not self.errors else self.deps
+
+class IncrementalCompiler:
+    """Front end that updates its results after each edit of the source."""
+
+    def __init__(self, source: str = '', engine: str = 'char'):
+        self.engine = engine
+        self.lines: List[str] = ['']
+        self.tokens: List[Token] = [Token(TokenType.EOF, None, 1, 1)]
+        self.steps: List[TopLevelStep] = []
+        self.dirty: Optional[Tuple[int, int]] = None  # Lines not yet re-scanned (current numbering)
+        self.line_delta = 0  # Line count now minus when self.tokens were last scanned
+        self.pending_names: Set[str] = set()  # Changed names not yet re-checked
+        self.last_update: Dict[str, int] = {}
+        self.record = self.replace_lines(1, 1, source.split('\n'))
+
+    @property
+    def source(self) -> str:
+        return '\n'.join(self.lines)
+
+    def apply_edit(self, edit: TextEdit) -> CompilationRecord:
+        """Apply a text edit and return the updated compilation."""
+        prefix = self.lines[edit.start_line - 1][:edit.start_column - 1]
+        suffix = self.lines[edit.end_line - 1][edit.end_column - 1:]
+        new_lines = (prefix + edit.text + suffix).split('\n')
+        return self.replace_lines(edit.start_line, edit.end_line, new_lines)
+
+    def update_source(self, source: str) -> CompilationRecord:
+        """Replace the whole text, re-processing only the lines that differ."""
+        new_lines = source.split('\n')
+        old_lines = self.lines
+        limit = min(len(old_lines), len(new_lines))
+        head = 0
+        while head < limit and old_lines[head] == new_lines[head]:
+            head += 1
+        if head == len(old_lines) == len(new_lines):
+            return self.record
+        tail = 0
+        while (tail < limit - head
+               and old_lines[len(old_lines) - 1 - tail] == new_lines[len(new_lines) - 1 - tail]):
+            tail += 1
+        # Always replace at least one line so the edited range is never empty on both sides
+        if head == len(old_lines) - tail:
+            if tail:
+                tail -= 1
+            else:
+                head -= 1
+        return self.replace_lines(head + 1, len(old_lines) - tail,
+                                  new_lines[head:len(new_lines) - tail])
+
+    def replace_lines(self, first: int, last: int, new_lines: List[str]) -> CompilationRecord:
+        """Replace lines first..last (1-based, inclusive) with new_lines."""
+        line_delta = len(new_lines) - (last - first + 1)
+        self.lines[first - 1:last] = new_lines
+        new_last = first + len(new_lines) - 1
+
+        # Merge with a range left over from an edit that did not scan
+        if self.dirty is None:
+            low, high = first, new_last
+        else:
+            old_low, old_high = self.dirty
+            if old_high < first:
+                mapped_high = old_high
+            elif old_high > last:
+                mapped_high = old_high + line_delta
+            else:
+                mapped_high = new_last
+            low, high = min(old_low, first), max(mapped_high, new_last)
+        self.dirty = (low, high)
+        self.line_delta += line_delta
+
+        self.record = self.resync()
+        return self.record
+
+    def resync(self) -> CompilationRecord:
+        low, high = self.dirty
+        line_count = len(self.lines)
+        old_high = high - self.line_delta
+        at_end = high >= line_count
+        if at_end and low > 1:
+            # Whether the previous line ends in a NEWLINE token depends on what follows it
+            low -= 1
+
+        # Lexing: re-scan the dirty lines only
+        if low > high:
+            region: List[Token] = []
+        else:
+            text = '\n'.join(self.lines[low - 1:high]) + ('' if at_end else '\n')
+            try:
+                region = list(create_scanner(text, self.engine).iter_tokens())
+            except LexicalError as e:
+                error = LexicalError(e.message, e.line + low - 1, e.column)
+                self.last_update = {'lines_scanned': high - low + 1, 'statements_parsed': 0,
+                                    'statements_checked': 0}
+                return CompilationRecord([], None, None, [str(error)], 'lexical')
+            if not at_end:
+                region.pop()  # EOF of the fragment
+            if low > 1:
+                for token in region:
+                    token.line += low - 1
+
+        tokens = self.tokens
+        start = bisect_by(tokens, attrgetter('line'), low)
+        stop = len(tokens) if at_end else bisect_by(tokens, attrgetter('line'), old_high + 1, start)
+        token_delta = len(region) - (stop - start)
+        tokens[start:stop] = region
+        if self.line_delta:
+            for index in range(start + len(region), len(tokens)):
+                tokens[index].line += self.line_delta
+        self.dirty = None
+        self.line_delta = 0
+
+        parsed = self.reparse(start, start + len(region), token_delta)
+        checked = 0
+        if any(step.syntax_errors for step in self.steps):
+            errors = [format_parse_error(error) for step in self.steps for error in step.syntax_errors]
+            program = Program([step.statement for step in self.steps])
+            record = CompilationRecord(list(tokens), program, None, errors, 'syntax')
+        else:
+            record, checked = self.check()
+        self.last_update = {'lines_scanned': max(high - low + 1, 0),
+                            'statements_parsed': parsed, 'statements_checked': checked}
+        return record
+
+    def reparse(self, start: int, stop: int, token_delta: int) -> int:
+        """Re-parse the top-level steps touching tokens[start:stop]. Returns how many were parsed."""
+        steps = self.steps
+        # A step also reads the token at its end (e.g. to look for 'else')
+        first = bisect_by(steps, attrgetter('end'), start)
+        parser = Parser(self.tokens)
+        parser.current = steps[first - 1].end if first else 0
+        if first and steps[first - 1].syntax_errors:
+            # The parser drops an error at the token of the previous one (tokens before start are kept)
+            parser.last_error_token = steps[first - 1].syntax_errors[-1].token
+
+        new_steps = []
+        resume = len(steps)
+        while True:
+            while parser.match(TokenType.NEWLINE):
+                pass
+            if parser.check(TokenType.EOF):
+                break
+            position = parser.current
+            if position >= stop:
+                # Past the edit: stop once we are back on an old statement boundary
+                old_position = position - token_delta
+                index = bisect_by(steps, attrgetter('start'), old_position, first)
+                if (index < len(steps) and steps[index].start == old_position
+                        and not self.error_carries_over(steps, index, parser)):
+                    resume = index
+                    break
+            reported = len(parser.diagnostics)
+            statement = parser.parse_statement_or_error()
+            new_steps.append(TopLevelStep(position, parser.current, statement,
+                                          parser.diagnostics[reported:]))
+
+        for step in steps[first:resume]:
+            self.pending_names |= step.symbols.keys()
+        tail = steps[resume:]
+        if token_delta:
+            for step in tail:
+                step.start += token_delta
+                step.end += token_delta
+        self.steps = steps[:first] + new_steps + tail
+        return len(new_steps)
+
+    @staticmethod
+    def error_carries_over(steps: List[TopLevelStep], index: int, parser: Parser) -> bool:
+        """True if an error at the start of steps[index] is, or was, dropped as a repeat of the one before."""
+        boundary = parser.current_token()
+        if parser.last_error_token is boundary:
+            return True
+        previous = steps[index - 1].syntax_errors if index else []
+        return bool(previous) and previous[-1].token is boundary
+
+    def check(self) -> Tuple[CompilationRecord, int]:
+        """Rebuild the global scope, re-checking only the steps affected by changed names."""
+        checker = TypeChecker()
+        table = checker.symbol_table
+        changed = set(self.pending_names)
+        errors = []
+        checked = 0
+        for step in self.steps:
+            if step.checked and changed.isdisjoint(step.dependencies()):
+                # Reuse: restore its symbols as it left them, then replay its assignments
+                for name, symbol in step.symbols.items():
+                    symbol.value, symbol.initialized = step.states[name]
+                slot_base = table.frames[0]
+                table.restore(step.symbols, step.slot_base, step.slots_used, step.nested)
+                step.slot_base = slot_base
+                for name in step.assigned:
+                    table.assign(name, True)
+            else:
+                watched = {name: table.symbols[name] for name in step.deps if name in table.symbols}
+                saved = {name: symbol.value for name, symbol in watched.items()}
+                for symbol in watched.values():
+                    symbol.value = UNASSIGNED
+                checker.errors = []
+                step.slot_base = table.frames[0]
+                try:
+                    checker.visit(step.statement)
+                except Exception:
+                    return self.check_all(), len(self.steps)
+                step.slots_used = table.frames[0] - step.slot_base
+                if step.slots_used and not isinstance(step.statement, VarDeclaration):
+                    step.nested = nested_globals(step.statement, [])
+                else:
+                    step.nested = []
+                step.assigned = set()
+                for name, symbol in watched.items():
+                    if symbol.value is UNASSIGNED:
+                        symbol.value = saved[name]
+                    else:
+                        step.assigned.add(name)
+                symbols = {name: table.symbols[name] for name in step.declared
+                           if name in table.symbols and name not in watched}
+                if not step.checked or symbol_signature(symbols) != symbol_signature(step.symbols):
+                    changed |= symbols.keys() | step.symbols.keys()
+                step.symbols = symbols
+                step.states = {name: (symbol.value, symbol.initialized) for name, symbol in symbols.items()}
+                step.errors = checker.errors
+                step.checked = True
+                checked += 1
+            errors.extend(step.errors)
+        self.pending_names = set()
+
+        program = Program([step.statement for step in self.steps])
+        if errors:
+            return CompilationRecord(list(self.tokens), program, None, errors, 'semantic'), checked
+        return CompilationRecord(list(self.tokens), program, table), checked
+
+    def check_all(self) -> CompilationRecord:
+        """Fall back to checking the whole program, leaving every step to be re-checked."""
+        for step in self.steps:
+            step.checked = False
+        program = Program([step.statement for step in self.steps])
+        type_checker = TypeChecker()
+        if not type_checker.analyze(program):
+            return CompilationRecord(list(self.tokens), program, None, type_checker.errors, 'semantic')
+        return CompilationRecord(list(self.tokens), program, type_checker.symbol_table)
+
+# Test incremental compilation
+if __name__ == "__main__":
+    import time
+
+    lines = []
+    for i in range(2000):
+        lines.append(f"int value{i} = {i};")
+        lines.append(f"function int twice{i}(int n) {{")
+        lines.append(f"    return n * 2 + value{i};")
+        lines.append("}")
+        lines.append(f"print(twice{i}(value{i}));")
+    compiler = IncrementalCompiler('\n'.join(lines))
+    print(f"Initial build: {len(compiler.lines)} lines, success: {compiler.record.success}")
+
+    for description, edit in [
+        ("change a literal", TextEdit(5001, 17, 5001, 21, "42")),
+        ("break a statement", TextEdit(5001, 19, 5001, 20, "")),
+        ("fix it again", TextEdit(5001, 19, 5001, 19, ";")),
+        ("change a declared type", TextEdit(5001, 1, 5001, 4, "float")),
+    ]:
+        start = time.perf_counter()
+        record = compiler.apply_edit(edit)
+        elapsed = time.perf_counter() - start
+        outcome = 'ok' if record.success else f"{record.failed_phase}: {record.errors[0]}"
+        print(f"{description:<24} {elapsed * 1000:7.2f} ms  {compiler.last_update}  {outcome}")
@@ -0,0 +1,219 @@
+"""
+Compilation Instrumentation for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+The compilation pipeline (MiniLangCompiler.compile) reports every phase
+to a list of CompilerHook objects: its wall-clock time, its tracemalloc
+peak (only while tracemalloc is tracing), and the token, AST node, symbol
+and error counts it produced.
+
+Hooks can be passed to the pipeline directly, registered process-wide with
+register_hook(), or named in the MINILANG_HOOKS environment variable as a
+comma-separated list of "module:factory" entries. The last two let the web
+app or a metrics exporter collect the same numbers without code changes.
+"""
+
+import importlib
+import os
+import time
+import tracemalloc
+import warnings
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional
+from optimizer import count_nodes
+
+@dataclass
+class PhaseMetrics:
+    """What one compilation phase cost and produced."""
+    phase: str  # 'lexical', 'syntax', 'constant_folding', 'semantic' or 'dead_code'
+    wall_time: float = 0.0  # Seconds
+    peak_memory: Optional[int] = None  # Bytes above the phase's starting point
+    tokens: int = 0
+    nodes: int = 0
+    symbols: int = 0
+    errors: int = 0
+
+class CompilerHook:
+    """Receives pipeline events. Subclasses override only what they need."""
+
+    def compile_started(self, source: str) -> None:
+        pass
+
+    def phase_started(self, phase: str) -> None:
+        pass
+
+    def phase_finished(self, metrics: PhaseMetrics) -> None:
+        pass
+
+    def compile_finished(self, success: bool, phases: List[PhaseMetrics]) -> None:
+        pass
+
+_registered_hooks: List[CompilerHook] = []
+_environment_hooks: Optional[List[CompilerHook]] = None
+
+def register_hook(hook: CompilerHook) -> None:
+    """Report every compilation in this process to hook."""
+    _registered_hooks.append(hook)
+
+def unregister_hook(hook: CompilerHook) -> None:
+    _registered_hooks.remove(hook)
+
+def load_environment_hooks() -> List[CompilerHook]:
+    """Create the hooks named in MINILANG_HOOKS (once per process)."""
+    global _environment_hooks
+    if _environment_hooks is None:
+        _environment_hooks = []
+        for entry in os.environ.get('MINILANG_HOOKS', '').split(','):
+            entry = entry.strip()
+            if not entry:
+                continue
+            module_name, _, factory_name = entry.partition(':')
+            try:
+                factory = getattr(importlib.import_module(module_name), factory_name)
+                _environment_hooks.append(factory())
+            except Exception as e:
+                # A broken exporter must not stop compilation
+                warnings.warn(f"Ignoring MINILANG_HOOKS entry '{entry}': {e}")
+    return _environment_hooks
+
+def active_hooks(hooks: Iterable[CompilerHook] = ()) -> List[CompilerHook]:
+    """The given hooks plus every process-wide one."""
+    return list(hooks) + _registered_hooks + load_environment_hooks()
+
+class Instrumentation:
+    """Times the phases of one compilation and forwards them to the hooks."""
+
+    def __init__(self, hooks: Iterable[CompilerHook] = ()):
+        self.hooks = active_hooks(hooks)
+        self.phases: List[PhaseMetrics] = []
+        self.current: Optional[PhaseMetrics] = None
+        self.start_time = 0.0
+        self.baseline_memory = 0
+
+    def dispatch(self, event: str, *args: Any) -> None:
+        """Call event on every hook, warning about hooks that raise."""
+        for hook in self.hooks:
+            try:
+                getattr(hook, event)(*args)
+            except Exception as e:
+                # A broken exporter must not stop compilation
+                warnings.warn(f"Ignoring error in {type(hook).__name__}.{event}: {e}")
+
+    def compile_started(self, source: str) -> None:
+        self.dispatch('compile_started', source)
+
+    def start(self, phase: str) -> None:
+        self.dispatch('phase_started', phase)
+        self.current = PhaseMetrics(phase)
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self.baseline_memory = tracemalloc.get_traced_memory()[0]
+        self.start_time = time.perf_counter()
+
+    def finish(self, tokens: int = 0, ast: Any = None, symbol_table: Any = None,
+               errors: int = 0) -> PhaseMetrics:
+        """Close the current phase. Counting happens after the clock stops."""
+        wall_time = time.perf_counter() - self.start_time
+        metrics = self.current
+        metrics.wall_time = wall_time
+        if tracemalloc.is_tracing():
+            metrics.peak_memory = max(0, tracemalloc.get_traced_memory()[1] - self.baseline_memory)
+        metrics.tokens = tokens
+        metrics.errors = errors
+        if self.hooks:
+            # Walking the AST costs time, so nodes are only counted for a listener
+            metrics.nodes = count_nodes(ast) if ast is not None else 0
+            metrics.symbols = len(symbol_table.symbols) if symbol_table is not None else 0
+        self.phases.append(metrics)
+        self.current = None
+        self.dispatch('phase_finished', metrics)
+        return metrics
+
+    def compile_finished(self, success: bool) -> None:
+        self.dispatch('compile_finished', success, self.phases)
+
+class PhaseProfiler(CompilerHook):
+    """Collects the metrics of each compilation, tracing memory while it runs."""
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.phases: List[PhaseMetrics] = []
+        self.success: Optional[bool] = None
+        self.started_tracing = False
+
+    def compile_started(self, source: str) -> None:
+        self.phases = []
+        self.success = None
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+
+    def phase_finished(self, metrics: PhaseMetrics) -> None:
+        self.phases.append(metrics)
+
+    def compile_finished(self, success: bool, phases: List[PhaseMetrics]) -> None:
+        self.success = success
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    def report(self) -> str:
+        """Table of the last compilation's phases."""
+        if not self.phases:
+            return "Profile: no phases ran (served from the compile cache)."
+        lines = [
+            f"{'phase':<18} {'time ms':>9} {'peak KiB':>9} {'tokens':>7} {'nodes':>7} {'symbols':>7} {'errors':>6}",
+            "-" * 69,
+        ]
+        for metrics in self.phases:
+            peak = f"{metrics.peak_memory / 1024:.1f}" if metrics.peak_memory is not None else "-"
+            lines.append(f"{metrics.phase:<18} {metrics.wall_time * 1000:>9.2f} {peak:>9} "
+                         f"{metrics.tokens:>7} {metrics.nodes:>7} {metrics.symbols:>7} {metrics.errors:>6}")
+        total = sum(metrics.wall_time for metrics in self.phases)
+        lines.append("-" * 69)
+        lines.append(f"{'total':<18} {total * 1000:>9.2f}")
+        if self.trace_memory:
+            lines.append("(times include tracemalloc overhead)")
+        return "\n".join(lines)
+
+# Test the instrumentation hooks
+if __name__ == "__main__":
+    import sys
+    from pathlib import Path
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    import instrumentation  # The registry the pipeline sees (this file runs as __main__)
+    from compiler import MiniLangCompiler
+
+    class CountingHook(CompilerHook):
+        """Example exporter: totals time per phase across compilations."""
+        def __init__(self):
+            self.totals = {}
+
+        def phase_finished(self, metrics: PhaseMetrics) -> None:
+            self.totals[metrics.phase] = self.totals.get(metrics.phase, 0.0) + metrics.wall_time
+
+    test_code = '''
+    function int square(int n) {
+        return n * n;
+    }
+    int total = 0;
+    for (int i = 0; i < 10; i = i + 1) {
+        total = total + square(i) * 1;
+    }
+    print(total);
+    '''
+
+    profiler = PhaseProfiler()
+    MiniLangCompiler(opt_level=2, hooks=[profiler]).compile(test_code)
+    print(profiler.report())
+
+    exporter = CountingHook()
+    instrumentation.register_hook(exporter)
+    for _ in range(20):
+        MiniLangCompiler().compile(test_code)
+    instrumentation.unregister_hook(exporter)
+    print()
+    print("Registered hook totals over 20 compilations:")
+    for phase, seconds in exporter.totals.items():
+        print(f"  {phase:<10} {seconds * 1000:.2f} ms")
@@ -0,0 +1,415 @@
+"""
+Tree-walking Interpreter for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+Executes a type-checked AST directly. Scoping follows TypeChecker: blocks,
+for loops and function bodies open a new scope, while the bodies of if,
+while and do-while run in the enclosing scope.
+
+Visit methods with nested nodes are generators (see ASTVisitor), so
+MiniLang calls and nesting do not consume Python stack; like the VM, the
+interpreter stops at max_call_depth active calls.
+
+A step is one completed loop iteration (charged where the bytecode VM
+takes its backward jump: after the body, and after a do-while condition
+that repeats) or one function call. Both backends count the same steps.
+"""
+
+import io
+import time
+from typing import Any, Dict, List, Optional
+from ast_nodes import *
+
+class MiniLangRuntimeError(Exception):
+    """Exception raised for errors while executing a MiniLang program."""
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(f"Runtime Error: {message}")
+
+class ExecutionLimitError(MiniLangRuntimeError):
+    """Raised when a program exceeds its step or time budget."""
+    pass
+
+class ReturnSignal(Exception):
+    """Unwinds the Python stack from a return statement to its call."""
+    def __init__(self, value: Any):
+        self.value = value
+
+# Value a variable holds before it is first assigned
+DEFAULT_VALUES = {'int': 0, 'float': 0.0, 'bool': False}
+
+def coerce(value_type: str, value: Any) -> Any:
+    """Apply MiniLang's only implicit conversion: int to float."""
+    if value_type == 'float' and type(value) is int:
+        return float(value)
+    return value
+
+def format_value(value: Any) -> str:
+    """Format a runtime value the way print() shows it."""
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    try:
+        return str(value)
+    except ValueError:
+        # Python refuses to convert ints past sys.get_int_max_str_digits() digits
+        raise MiniLangRuntimeError("Integer too large to print") from None
+
+def int_divide(left: int, right: int) -> int:
+    """Integer division truncating toward zero."""
+    quotient = abs(left) // abs(right)
+    return quotient if (left >= 0) == (right >= 0) else -quotient
+
+# Expressions with no nested nodes, which the interpreter reads directly
+LEAF_NODES = (Identifier, IntegerLiteral, FloatLiteral, BooleanLiteral)
+NESTED = object()  # Interpreter.direct_value(): the expression has to be visited
+
+def binary_operation(operator: str, left: Any, right: Any) -> Any:
+    """Apply an arithmetic or comparison operator to evaluated operands."""
+    if operator == '+':
+        return left + right
+    if operator == '-':
+        return left - right
+    if operator == '*':
+        return left * right
+    if operator == '/':
+        if right == 0:
+            raise MiniLangRuntimeError("Division by zero")
+        if type(left) is int and type(right) is int:
+            return int_divide(left, right)
+        return left / right
+    if operator == '<':
+        return left < right
+    if operator == '>':
+        return left > right
+    if operator == '<=':
+        return left <= right
+    if operator == '>=':
+        return left >= right
+    if operator == '==':
+        return left == right
+    if operator == '!=':
+        return left != right
+    raise MiniLangRuntimeError(f"Unknown binary operator: {operator}")
+
+def unary_operation(operator: str, operand: Any) -> Any:
+    if operator == 'not':
+        return not operand
+    if operator == '-':
+        return -operand
+    raise MiniLangRuntimeError(f"Unknown unary operator: {operator}")
+
+class Environment:
+    """Runtime variable storage for one scope."""
+
+    def __init__(self, parent: Optional['Environment'] = None):
+        self.values: Dict[str, Any] = {}
+        self.types: Dict[str, str] = {}
+        self.parent = parent
+
+    def define(self, name: str, value_type: str, value: Any) -> None:
+        """Create (or re-create, on loop re-entry) a variable in this scope."""
+        self.values[name] = value
+        self.types[name] = value_type
+
+    def find(self, name: str) -> 'Environment':
+        """Find the scope that holds name."""
+        env = self
+        while env is not None:
+            if name in env.values:
+                return env
+            env = env.parent
+        raise MiniLangRuntimeError(f"Undefined variable: {name}")
+
+    def get(self, name: str) -> Any:
+        return self.find(name).values[name]
+
+    def set(self, name: str, value: Any) -> None:
+        env = self.find(name)
+        env.values[name] = coerce(env.types[name], value)
+
+class Function:
+    """A declared function together with the scope it was declared in."""
+
+    def __init__(self, declaration: FunctionDeclaration, closure: Environment):
+        self.declaration = declaration
+        self.closure = closure
+
+class Interpreter(ASTVisitor):
+    """Executes MiniLang programs, capturing everything they print."""
+
+    def __init__(self, max_steps: int = 1_000_000, time_limit: float = 5.0,
+                 max_call_depth: int = 10_000):
+        self.max_steps = max_steps
+        self.time_limit = time_limit
+        self.max_call_depth = max_call_depth
+        self.call_depth = 0
+        self.output = io.StringIO()
+        self.errors: List[str] = []
+        self.steps = 0
+        self.globals = Environment()
+        self.env = self.globals
+        self.deadline = None
+
+    def execute(self, ast: Program) -> bool:
+        """Run the program. Returns True if it finished without runtime errors."""
+        self.errors = []
+        self.steps = 0
+        self.call_depth = 0
+        self.globals = Environment()
+        self.env = self.globals
+        self.deadline = time.perf_counter() + self.time_limit if self.time_limit else None
+        try:
+            self.visit(ast)
+            return True
+        except MiniLangRuntimeError as e:
+            self.errors.append(str(e))
+        except ReturnSignal:
+            self.errors.append(str(MiniLangRuntimeError("'return' outside of a function")))
+        except RecursionError:
+            self.errors.append(str(MiniLangRuntimeError("Maximum recursion depth exceeded")))
+        except OverflowError:
+            # An int too large for a float, in a conversion or mixed arithmetic
+            self.errors.append(str(MiniLangRuntimeError("Integer too large to convert to float")))
+        return False
+
+    def get_output(self) -> str:
+        """Everything the program printed so far."""
+        return self.output.getvalue()
+
+    def step(self) -> None:
+        """Charge one loop iteration or call against the step and time limits."""
+        self.steps += 1
+        if self.max_steps and self.steps > self.max_steps:
+            raise ExecutionLimitError(f"Step limit of {self.max_steps} exceeded")
+        if self.deadline is not None and self.steps & 1023 == 0 and time.perf_counter() > self.deadline:
+            raise ExecutionLimitError(f"Time limit of {self.time_limit}s exceeded")
+
+    def execute_statements(self, statements: List[Statement]):
+        """Execute statements in the current scope."""
+        for stmt in statements:
+            yield stmt
+
+    def execute_in_scope(self, statements: List[Statement], env: Environment):
+        """Execute statements in env, restoring the current scope afterwards."""
+        previous = self.env
+        self.env = env
+        try:
+            yield from self.execute_statements(statements)
+        finally:
+            self.env = previous
+
+    # Statements
+
+    def visit_program(self, node: Program):
+        yield from self.execute_statements(node.statements)
+
+    # Simple statements run directly when direct_value() can compute their expression
+
+    def visit_var_declaration(self, node: VarDeclaration):
+        if node.value is None:
+            value = DEFAULT_VALUES[node.var_type]
+        else:
+            value = self.direct_value(node.value)
+            if value is NESTED:
+                return self.var_declaration_nested(node)
+        self.define(node, value)
+
+    def var_declaration_nested(self, node: VarDeclaration):
+        self.define(node, (yield node.value))
+
+    def define(self, node: VarDeclaration, value: Any) -> None:
+        self.env.define(node.name, node.var_type, coerce(node.var_type, value))
+
+    def visit_assignment(self, node: Assignment):
+        value = self.direct_value(node.value)
+        if value is NESTED:
+            return self.assignment_nested(node)
+        self.env.set(node.name, value)
+
+    def assignment_nested(self, node: Assignment):
+        self.env.set(node.name, (yield node.value))
+
+    def visit_print_statement(self, node: PrintStatement):
+        value = self.direct_value(node.expression)
+        if value is NESTED:
+            return self.print_nested(node)
+        self.write_value(value)
+
+    def print_nested(self, node: PrintStatement):
+        self.write_value((yield node.expression))
+
+    def write_value(self, value: Any) -> None:
+        self.output.write(format_value(value))
+        self.output.write('\n')
+
+    def visit_if_statement(self, node: IfStatement):
+        if (yield node.condition) is True:
+            yield from self.execute_statements(node.then_statements)
+        elif node.else_statements:
+            yield from self.execute_statements(node.else_statements)
+
+    def visit_while_statement(self, node: WhileStatement):
+        while (yield node.condition) is True:
+            yield from self.execute_statements(node.body)
+            self.step()
+
+    def visit_for_statement(self, node: ForStatement):
+        previous = self.env
+        self.env = Environment(previous)
+        try:
+            if node.init:
+                yield node.init
+            while node.condition is None or (yield node.condition) is True:
+                yield from self.execute_statements(node.body)
+                if node.update:
+                    yield node.update
+                self.step()
+        finally:
+            self.env = previous
+
+    def visit_do_while_statement(self, node: DoWhileStatement):
+        while True:
+            yield from self.execute_statements(node.body)
+            if (yield node.condition) is not True:
+                break
+            self.step()
+
+    def visit_block(self, node: Block):
+        yield from self.execute_in_scope(node.statements, Environment(self.env))
+
+    def visit_function_declaration(self, node: FunctionDeclaration):
+        self.env.define(node.name, node.return_type, Function(node, self.env))
+
+    def visit_return_statement(self, node: ReturnStatement):
+        raise ReturnSignal((yield node.value) if node.value is not None else None)
+
+    # Expressions
+
+    def visit_function_call(self, node: FunctionCall):
+        function = self.env.get(node.name)
+        if not isinstance(function, Function):
+            raise MiniLangRuntimeError(f"'{node.name}' is not a function")
+        declaration = function.declaration
+        if len(node.arguments) != len(declaration.parameters):
+            raise MiniLangRuntimeError(
+                f"Function '{node.name}' expects {len(declaration.parameters)} arguments, "
+                f"got {len(node.arguments)}")
+
+        # Arguments are evaluated in the caller's scope
+        call_env = Environment(function.closure)
+        for (param_type, param_name), arg in zip(declaration.parameters, node.arguments):
+            call_env.define(param_name, param_type, coerce(param_type, (yield arg)))
+
+        self.step()
+        if self.call_depth >= self.max_call_depth:
+            raise MiniLangRuntimeError("Maximum recursion depth exceeded")
+        self.call_depth += 1
+        try:
+            yield from self.execute_in_scope(declaration.body, call_env)
+        except ReturnSignal as signal:
+            if signal.value is not None:
+                return coerce(declaration.return_type, signal.value)
+        finally:
+            self.call_depth -= 1
+        return DEFAULT_VALUES[declaration.return_type]
+
+    def leaf_value(self, node: Expression) -> Any:
+        """Value of an identifier or literal."""
+        if type(node) is Identifier:
+            return self.env.get(node.name)
+        return node.value
+
+    def direct_value(self, node: Expression) -> Any:
+        """Value of a leaf, or of an arithmetic or comparison operation on two
+        leaves, computed without a generator; NESTED for anything else."""
+        node_type = type(node)
+        if node_type in LEAF_NODES:
+            return self.leaf_value(node)
+        if node_type is BinaryOp:
+            operator = node.operator
+            if operator != 'and' and operator != 'or' and \
+                    type(node.left) in LEAF_NODES and type(node.right) in LEAF_NODES:
+                return binary_operation(operator, self.leaf_value(node.left), self.leaf_value(node.right))
+        return NESTED
+
+    def visit_binary_op(self, node: BinaryOp):
+        value = self.direct_value(node)
+        return self.binary_op_nested(node) if value is NESTED else value
+
+    def binary_op_nested(self, node: BinaryOp):
+        operator = node.operator
+
+        # Logical operators short-circuit
+        if operator == 'and':
+            return (yield node.left) and (yield node.right)
+        if operator == 'or':
+            return (yield node.left) or (yield node.right)
+
+        left = yield node.left
+        right = yield node.right
+        return binary_operation(operator, left, right)
+
+    def visit_unary_op(self, node: UnaryOp):
+        if type(node.operand) in LEAF_NODES:
+            return unary_operation(node.operator, self.leaf_value(node.operand))
+        return self.unary_op_nested(node)
+
+    def unary_op_nested(self, node: UnaryOp):
+        return unary_operation(node.operator, (yield node.operand))
+
+    def visit_identifier(self, node: Identifier):
+        return self.env.get(node.name)
+
+    def visit_integer_literal(self, node: IntegerLiteral):
+        return node.value
+
+    def visit_float_literal(self, node: FloatLiteral):
+        return node.value
+
+    def visit_boolean_literal(self, node: BooleanLiteral):
+        return node.value
+
+# Test the interpreter
+if __name__ == "__main__":
+    from scanner import Scanner
+    from parser import Parser
+    from semantic_analyzer import TypeChecker
+
+    test_code = '''
+    function int factorial(int n) {
+        if (n <= 1) {
+            return 1;
+        } else {
+            int result = n * factorial(n - 1);
+            return result;
+        }
+    }
+
+    int sum = 0;
+    for (int i = 1; i <= 10; i = i + 1) {
+        sum = sum + i;
+    }
+    print(sum);
+    print(factorial(5));
+
+    float half = 7 / 2;
+    print(half);
+    print(7.0 / 2);
+    print(not (sum > 50));
+    '''
+
+    tokens = Scanner(test_code).tokenize()
+    ast = Parser(tokens).parse()
+
+    if ast and TypeChecker().analyze(ast):
+        interpreter = Interpreter()
+        success = interpreter.execute(ast)
+        print("Program output:")
+        print("=" * 50)
+        print(interpreter.get_output(), end="")
+        if not success:
+            for error in interpreter.errors:
+                print(error)
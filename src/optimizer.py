@@ -0,0 +1,617 @@
+"""
+AST Optimizer for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+ConstantFolder runs between parsing and semantic analysis. Literal-only
+subexpressions are folded into a single literal and identity operations
+(x * 1, x + 0, b and true, ...) are reduced to their non-literal operand.
+
+Because the pass runs before type checking, it tracks declared types in
+its own symbol table, mirroring TypeChecker's scoping rules, and only
+rewrites an expression when the result has the same type TypeChecker
+would have given the original. Ill-typed expressions are left alone so
+every semantic error is still reported.
+
+DeadCodeEliminator runs after semantic analysis, so dead code is still
+type-checked and diagnostics do not depend on the optimization level.
+"""
+
+import math
+from collections import Counter
+from typing import Any, Container, Dict, List, Optional, Tuple
+from ast_nodes import *
+from symbol_table import ScopedSymbolTable
+from semantic_analyzer import binary_op_type, unary_op_type
+from interpreter import int_divide
+
+LITERAL_TYPES = {IntegerLiteral: 'int', FloatLiteral: 'float', BooleanLiteral: 'bool'}
+
+# (operator, literal type, literal value) -> operand types the identity is exact for.
+# Floats are excluded from x + 0 because -0.0 + 0 is 0.0.
+LEFT_IDENTITIES = {
+    ('+', 'int', 0): ('int',),
+    ('*', 'int', 1): ('int', 'float'),
+    ('*', 'float', 1.0): ('float',),
+    ('and', 'bool', True): ('bool',),
+    ('or', 'bool', False): ('bool',),
+}
+# Also valid with the literal on the right: x - 0, x / 1
+RIGHT_IDENTITIES = dict(LEFT_IDENTITIES)
+RIGHT_IDENTITIES.update({
+    ('-', 'int', 0): ('int', 'float'),
+    ('-', 'float', 0.0): ('float',),
+    ('/', 'int', 1): ('int', 'float'),
+    ('/', 'float', 1.0): ('float',),
+})
+
+# The tree walks below keep their pending nodes on explicit stacks, so they
+# work at any nesting depth (like the parser and TypeChecker)
+
+def count_nodes(node: Any) -> int:
+    """Count the AST nodes reachable from node."""
+    count = 0
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, ASTNode):
+            count += 1
+            stack.extend(item.subnodes())
+    return count
+
+def collect_names(node: Any, names: Counter) -> Counter:
+    """Count every use of a name: reads, assignments and calls."""
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, ASTNode):
+            if isinstance(item, (Identifier, Assignment, FunctionCall)):
+                names[item.name] += 1
+            stack.extend(item.subnodes())
+    return names
+
+def is_pure(expr: Optional[Expression], defined: Container[str] = ()) -> bool:
+    """True if evaluating expr can neither call a function nor fail at runtime.
+
+    Reading a name only counts as pure if it is in defined: a declaration in
+    an if or loop body that did not run leaves the name undefined at runtime.
+    """
+    stack = [expr]
+    while stack:
+        expr = stack.pop()
+        if expr is None or type(expr) in LITERAL_TYPES:
+            continue
+        if isinstance(expr, Identifier):
+            if expr.name not in defined:
+                return False
+            continue
+        if isinstance(expr, UnaryOp):
+            stack.append(expr.operand)
+        elif isinstance(expr, BinaryOp):
+            if expr.operator == '/' and not (type(expr.right) in LITERAL_TYPES and expr.right.value != 0):
+                return False  # May divide by zero
+            stack.append(expr.left)
+            stack.append(expr.right)
+        else:
+            return False
+    return True
+
+def declares_names(statements: List[Statement]) -> bool:
+    """True if statements declare a name in the enclosing scope.
+
+    If, while and do-while bodies share the enclosing scope, so a declaration
+    inside one stays visible after it; removing it would leave later uses
+    unresolved instead of failing at runtime as they do today.
+    """
+    stack = list(statements)
+    while stack:
+        stmt = stack.pop()
+        if isinstance(stmt, (VarDeclaration, FunctionDeclaration)):
+            return True
+        if isinstance(stmt, IfStatement):
+            stack.extend(stmt.then_statements)
+            stack.extend(stmt.else_statements or [])
+        elif isinstance(stmt, (WhileStatement, DoWhileStatement)):
+            stack.extend(stmt.body)
+    return False
+
+class DefinedNames:
+    """The names declared on every path to a statement: those declared before
+    it in its own statement list, then those defined on every path to the list."""
+
+    __slots__ = ('first', 'position', 'parent')
+
+    def __init__(self, first: Dict[str, int], position: int, parent: Optional['DefinedNames'] = None):
+        self.first = first          # Name -> index of its first declaration in the list
+        self.position = position    # Index of the statement in the list
+        self.parent = parent
+
+    def __contains__(self, name: str) -> bool:
+        names = self
+        while names is not None:
+            if names.first.get(name, names.position) < names.position:
+                return True
+            names = names.parent
+        return False
+
+def first_declarations(statements: List[Statement]) -> Dict[str, int]:
+    """Map each name declared directly in statements to the index of its first declaration."""
+    first = {}
+    for index, stmt in enumerate(statements):
+        if isinstance(stmt, (VarDeclaration, FunctionDeclaration)):
+            first.setdefault(stmt.name, index)
+    return first
+
+# Folded int literals stay below str()'s limit of 4300 digits (about 14,284 bits)
+MAX_FOLDED_INT_BITS = 14_000
+
+def is_negative_zero(value: Any) -> bool:
+    return type(value) is float and value == 0 and math.copysign(1.0, value) < 0
+
+def rebuilt(node: Expression, **changes: Any) -> Expression:
+    """node with the given fields, as a new node if any of them changed.
+
+    Expressions are not changed in place: with Parser(hash_cons=True) one
+    node stands for several equal subexpressions, and a hashed node keeps
+    its hash (see ASTNode).
+    """
+    for name, value in changes.items():
+        old = getattr(node, name)
+        if value is not old and not (value.__class__ is list and len(value) == len(old)
+                                     and all(a is b for a, b in zip(value, old))):
+            break
+    else:
+        return node
+    values = {name: getattr(node, name) for name in node._field_names}
+    values.update(changes)
+    return node.__class__(**values)
+
+def forget_hashes(ast: Program) -> None:
+    """Drop the cached hashes of the program and its statements, which the passes change in place."""
+    stack = [ast]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (Program, Statement)):
+            try:
+                del node._hash
+            except AttributeError:
+                pass
+            stack.extend(node.subnodes())
+
+def make_literal(value: Any, value_type: str) -> Expression:
+    """Build the literal node for a folded value."""
+    if value_type == 'int':
+        return IntegerLiteral(value)
+    if value_type == 'float':
+        return FloatLiteral(float(value))
+    return BooleanLiteral(value)
+
+def evaluate_binary(operator: str, left: Any, right: Any) -> Any:
+    """Evaluate a binary operation on literal values, or return None if it must stay at runtime."""
+    if operator == '+':
+        return left + right
+    if operator == '-':
+        return left - right
+    if operator == '*':
+        return left * right
+    if operator == '/':
+        if right == 0:
+            return None  # Leave division by zero to be reported at runtime
+        if type(left) is int and type(right) is int:
+            return int_divide(left, right)
+        return left / right
+    if operator == '<':
+        return left < right
+    if operator == '>':
+        return left > right
+    if operator == '<=':
+        return left <= right
+    if operator == '>=':
+        return left >= right
+    if operator == '==':
+        return left == right
+    if operator == '!=':
+        return left != right
+    if operator == 'and':
+        return left and right
+    if operator == 'or':
+        return left or right
+    return None
+
+class ConstantFolder(ASTVisitor):
+    """
+    Folds constant expressions. Expression visits return (node, type).
+
+    Statements are updated in place; an expression whose operands fold is
+    replaced by a new node (see rebuilt).
+
+    Visits of nodes with nested nodes are generators (see ASTVisitor), so
+    programs of any nesting depth can be folded.
+    """
+
+    def __init__(self):
+        self.scope = ScopedSymbolTable()
+        self.nodes_removed = 0
+
+    def optimize(self, ast: Program) -> Program:
+        """Fold the program in place and record how many nodes were removed."""
+        before = count_nodes(ast)
+        self.scope = ScopedSymbolTable()
+        self.visit(ast)
+        forget_hashes(ast)
+        self.nodes_removed = before - count_nodes(ast)
+        return ast
+
+    def fold(self, expr: Optional[Expression]) -> Tuple[Optional[Expression], Optional[str]]:
+        """Fold an expression, returning the replacement node and its static type."""
+        if expr is None:
+            return None, None
+        return self.visit(expr)
+
+    def folded(self, expr: Optional[Expression]):
+        """fold() inside a visit generator: node, type = yield from self.folded(expr)."""
+        if expr is None:
+            return None, None
+        return (yield expr)
+
+    def visit_in_child_scope(self, statements: List[Statement]):
+        self.scope.enter_scope()
+        try:
+            yield from statements
+        finally:
+            self.scope.exit_scope()
+
+    # Statements
+
+    def visit_program(self, node: Program):
+        yield from node.statements
+
+    def visit_var_declaration(self, node: VarDeclaration):
+        node.value, value_type = yield from self.folded(node.value)
+        if self.scope.lookup_current(node.name) is not None:
+            return
+        # TypeChecker leaves the variable undeclared if the initializer does not fit
+        if value_type and value_type != node.var_type and not (node.var_type == 'float' and value_type == 'int'):
+            return
+        self.scope.define(node.name, node.var_type, value=True)
+
+    def visit_assignment(self, node: Assignment):
+        node.value, _ = yield node.value
+
+    def visit_print_statement(self, node: PrintStatement):
+        node.expression, _ = yield node.expression
+
+    def visit_if_statement(self, node: IfStatement):
+        node.condition, _ = yield node.condition
+        yield from node.then_statements
+        if node.else_statements:
+            yield from node.else_statements
+
+    def visit_while_statement(self, node: WhileStatement):
+        node.condition, _ = yield node.condition
+        yield from node.body
+
+    def visit_for_statement(self, node: ForStatement):
+        self.scope.enter_scope()
+        try:
+            if node.init:
+                yield node.init
+            node.condition, _ = yield from self.folded(node.condition)
+            if node.update:
+                yield node.update
+            yield from node.body
+        finally:
+            self.scope.exit_scope()
+
+    def visit_do_while_statement(self, node: DoWhileStatement):
+        yield from node.body
+        node.condition, _ = yield node.condition
+
+    def visit_block(self, node: Block):
+        yield from self.visit_in_child_scope(node.statements)
+
+    def visit_function_declaration(self, node: FunctionDeclaration):
+        if self.scope.lookup_current(node.name) is None:
+            self.scope.define_function(node.name, node.return_type,
+                                       [param_type for param_type, _ in node.parameters])
+
+        self.scope.enter_function()
+        try:
+            for param_type, param_name in node.parameters:
+                self.scope.define(param_name, param_type, value=True)
+            yield from node.body
+        finally:
+            self.scope.exit_function()
+
+    def visit_return_statement(self, node: ReturnStatement):
+        node.value, _ = yield from self.folded(node.value)
+
+    # Expressions
+
+    def visit_function_call(self, node: FunctionCall):
+        arguments = []
+        for arg in node.arguments:
+            arg, _ = yield arg
+            arguments.append(arg)
+        node = rebuilt(node, arguments=arguments)
+        symbol = self.scope.lookup(node.name)
+        return node, (symbol.type if symbol and symbol.is_function else None)
+
+    def visit_binary_op(self, node: BinaryOp):
+        left, left_type = yield node.left
+        right, right_type = yield node.right
+        if left_type is None or right_type is None:
+            return rebuilt(node, left=left, right=right), None
+
+        result_type = binary_op_type(node.operator, left_type, right_type)
+        if result_type is None:
+            # Ill-typed: keep it for TypeChecker to report
+            return rebuilt(node, left=left, right=right), None
+
+        left_literal = type(left) in LITERAL_TYPES
+        right_literal = type(right) in LITERAL_TYPES
+
+        if left_literal and right_literal:
+            try:
+                value = evaluate_binary(node.operator, left.value, right.value)
+            except OverflowError:
+                value = None  # An int too large for a float: reported at runtime
+            if type(value) is int and value.bit_length() > MAX_FOLDED_INT_BITS:
+                value = None  # Too long for str(): printing it is reported at runtime
+            if value is not None and (result_type != 'float' or math.isfinite(value)):
+                return make_literal(value, result_type), result_type
+            return rebuilt(node, left=left, right=right), result_type
+
+        # Identities keep the non-literal operand, which must already have the result type
+        if right_literal and left_type == result_type:
+            key = (node.operator, LITERAL_TYPES[type(right)], right.value)
+            if left_type in RIGHT_IDENTITIES.get(key, ()) and not is_negative_zero(right.value):
+                return left, result_type
+        if left_literal and right_type == result_type:
+            key = (node.operator, LITERAL_TYPES[type(left)], left.value)
+            if right_type in LEFT_IDENTITIES.get(key, ()) and not is_negative_zero(left.value):
+                return right, result_type
+
+        return rebuilt(node, left=left, right=right), result_type
+
+    def visit_unary_op(self, node: UnaryOp):
+        operand, operand_type = yield node.operand
+        if operand_type is None:
+            return rebuilt(node, operand=operand), None
+
+        result_type = unary_op_type(node.operator, operand_type)
+        if result_type is None or type(operand) not in LITERAL_TYPES:
+            return rebuilt(node, operand=operand), result_type
+
+        value = operand.value
+        return make_literal(not value if node.operator == 'not' else -value, result_type), result_type
+
+    def visit_identifier(self, node: Identifier):
+        symbol = self.scope.lookup(node.name)
+        return node, (symbol.type if symbol else None)
+
+    def visit_integer_literal(self, node: IntegerLiteral):
+        return node, 'int'
+
+    def visit_float_literal(self, node: FloatLiteral):
+        return node, 'float'
+
+    def visit_boolean_literal(self, node: BooleanLiteral):
+        return node, 'bool'
+
+class DeadCodeEliminator(ASTVisitor):
+    """
+    Prunes statements that can never run. Statement visits return their replacement list.
+
+    Visits of statements with bodies are generators (see ASTVisitor), so
+    programs of any nesting depth can be pruned.
+    """
+
+    def __init__(self):
+        self.nodes_removed = 0
+
+    def optimize(self, ast: Program) -> Program:
+        """Prune the program in place and record how many nodes were removed."""
+        before = count_nodes(ast)
+        self.visit(ast)
+        self.remove_unused_declarations(ast)
+        forget_hashes(ast)
+        self.nodes_removed = before - count_nodes(ast)
+        return ast
+
+    def prune(self, statements: List[Statement]):
+        """Rewrite a statement list, dropping everything after a return (use with yield from)."""
+        result = []
+        for index, stmt in enumerate(statements):
+            for replacement in (yield stmt):
+                result.append(replacement)
+                if isinstance(replacement, ReturnStatement) and not declares_names(statements[index + 1:]):
+                    return result
+        return result
+
+    def remove_unused_declarations(self, ast: Program) -> None:
+        """Drop side-effect-free declarations of names that are never used, until none are left."""
+        removed = True
+        while removed:
+            names = collect_names(ast, Counter())
+            removed = False
+            for statements, defined in statement_lists(ast):
+                first = first_declarations(statements)
+                kept = [stmt for index, stmt in enumerate(statements)
+                        if not (isinstance(stmt, VarDeclaration) and not names[stmt.name]
+                                and is_pure(stmt.value, DefinedNames(first, index, defined)))]
+                if len(kept) != len(statements):
+                    statements[:] = kept
+                    removed = True
+
+    # Statements
+
+    def visit_program(self, node: Program):
+        node.statements = yield from self.prune(node.statements)
+        return [node]
+
+    def visit_var_declaration(self, node: VarDeclaration):
+        return [node]
+
+    def visit_assignment(self, node: Assignment):
+        return [node]
+
+    def visit_print_statement(self, node: PrintStatement):
+        return [node]
+
+    def visit_if_statement(self, node: IfStatement):
+        # If bodies run in the enclosing scope, so a constant branch can be spliced in
+        if isinstance(node.condition, BooleanLiteral):
+            live, dead = node.then_statements, node.else_statements or []
+            if not node.condition.value:
+                live, dead = dead, live
+            if not declares_names(dead):
+                return (yield from self.prune(live))
+        node.then_statements = yield from self.prune(node.then_statements)
+        if node.else_statements:
+            node.else_statements = yield from self.prune(node.else_statements)
+        return [node]
+
+    def visit_while_statement(self, node: WhileStatement):
+        if isinstance(node.condition, BooleanLiteral) and not node.condition.value \
+                and not declares_names(node.body):
+            return []
+        node.body = yield from self.prune(node.body)
+        return [node]
+
+    def visit_for_statement(self, node: ForStatement):
+        if isinstance(node.condition, BooleanLiteral) and not node.condition.value:
+            # Only the initializer runs, in the loop's own scope
+            if node.init is None or isinstance(node.init, VarDeclaration) and is_pure(node.init.value):
+                return []
+            return [Block([node.init])]
+        node.body = yield from self.prune(node.body)
+        return [node]
+
+    def visit_do_while_statement(self, node: DoWhileStatement):
+        node.body = yield from self.prune(node.body)
+        if isinstance(node.condition, BooleanLiteral) and not node.condition.value:
+            return node.body  # Runs exactly once, in the enclosing scope
+        return [node]
+
+    def visit_block(self, node: Block):
+        node.statements = yield from self.prune(node.statements)
+        return [node]
+
+    def visit_function_declaration(self, node: FunctionDeclaration):
+        node.body = yield from self.prune(node.body)
+        return [node]
+
+    def visit_return_statement(self, node: ReturnStatement):
+        return [node]
+
+    def visit_function_call(self, node: FunctionCall):
+        # A call used as a statement; it may have side effects, so it always stays
+        return [node]
+
+    # Expressions are left to ConstantFolder
+
+    def visit_binary_op(self, node: BinaryOp):
+        return node
+
+    def visit_unary_op(self, node: UnaryOp):
+        return node
+
+    def visit_identifier(self, node: Identifier):
+        return node
+
+    def visit_integer_literal(self, node: IntegerLiteral):
+        return node
+
+    def visit_float_literal(self, node: FloatLiteral):
+        return node
+
+    def visit_boolean_literal(self, node: BooleanLiteral):
+        return node
+
+def statement_lists(node: Any):
+    """Yield every statement list in the tree, each before the lists nested in it,
+    with the DefinedNames on every path to the start of the list (or None)."""
+    stack = [(node, None)]
+    while stack:
+        node, defined = stack.pop()
+        if isinstance(node, (Program, Block)):
+            lists = [node.statements]
+        elif isinstance(node, (WhileStatement, DoWhileStatement)):
+            lists = [node.body]
+        elif isinstance(node, ForStatement):
+            lists = [node.body]
+            if isinstance(node.init, VarDeclaration):
+                defined = DefinedNames({node.init.name: -1}, 0, defined)
+        elif isinstance(node, FunctionDeclaration):
+            lists = [node.body]
+            # The closure holds everything defined before the declaration
+            defined = DefinedNames({name: -1 for _, name in node.parameters}, 0, defined)
+        elif isinstance(node, IfStatement):
+            lists = [node.then_statements, node.else_statements or []]
+        else:
+            continue
+        for statements in lists:
+            yield statements, defined
+            # The caller may have rewritten the list in place by now
+            first = first_declarations(statements)
+            for index in reversed(range(len(statements))):
+                stack.append((statements[index], DefinedNames(first, index, defined)))
+
+def fold_constants(ast: Program) -> Tuple[Program, int]:
+    """Fold constants in ast. Returns the program and the number of nodes removed."""
+    folder = ConstantFolder()
+    return folder.optimize(ast), folder.nodes_removed
+
+def eliminate_dead_code(ast: Program) -> Tuple[Program, int]:
+    """Prune unreachable code in a type-checked ast. Returns the program and the number of nodes removed."""
+    eliminator = DeadCodeEliminator()
+    return eliminator.optimize(ast), eliminator.nodes_removed
+
+# Test the optimizer
+if __name__ == "__main__":
+    from scanner import Scanner
+    from parser import Parser
+    from clean_vertical_ast import print_clean_vertical_ast
+
+    test_code = '''
+    int a = 3 * 4 + 1;
+    float b = 7 / 2 + 0.5;
+    bool flag = not true or 2 < 3;
+    int x = a * 1 + 0;
+    float y = b - 0.0;
+    bool c = flag and true;
+    print(1 / 0);
+
+    int unused = x * 2;
+    if (1 > 2) {
+        print(a);
+    } else {
+        print(x);
+    }
+    while (false) {
+        print(y);
+    }
+
+    function int f(int n) {
+        return n + 1;
+        print(n);
+    }
+    print(f(x));
+    f(2 * 3);
+    '''
+
+    tokens = Scanner(test_code).tokenize()
+    ast = Parser(tokens).parse()
+
+    if ast:
+        ast, removed = fold_constants(ast)
+        print(f"Constant folding removed {removed} nodes")
+        ast, removed = eliminate_dead_code(ast)
+        print(f"Dead code elimination removed {removed} nodes")
+        print("=" * 50)
+        print_clean_vertical_ast(ast, "simple")
@@ -17,16 +17,42 @@ expression ::= logical_or
 logical_or ::= logical_and ('or' logical_and)*
 logical_and ::= equality ('and' equality)*
 equality ::= relational (('==' | '!=') relational)*
-relational ::= additive (('>' | '<') additive)*
+relational ::= additive (('>' | '<' | '>=' | '<=') additive)*
 additive ::= multiplicative (('+' | '-') multiplicative)*
 multiplicative ::= unary (('*' | '/') unary)*
 unary ::= ('not' | '-') unary | primary
 primary ::= IDENTIFIER | INTEGER_LITERAL | FLOAT_LITERAL | BOOLEAN_LITERAL | '(' expression ')'
 type ::= 'int' | 'float' | 'bool'
+
+The binary operator levels (logical_or to multiplicative) are not parsed by
+a function each but by one Pratt loop over the binding powers in
+BINARY_OPERATORS, which builds the same left-associative trees.
+
+Nothing recurses per level of nesting: expressions keep their pending
+operators, parentheses and calls on an explicit stack, and compound
+statements are generators that parse_statement_or_error runs on another.
+Programs may nest as deep as memory allows, whatever the recursion limit.
+
+Syntax errors are recovered from in panic mode, with synchronizing sets
+taken from the grammar:
+- statement: skip to just past a ';' or to a token that starts a statement
+  (a keyword or '{') or ends one ('}', end of input). The statement becomes
+  an ErrorStatement and its enclosing block carries on.
+- block: a '}' missing at the end of the input is reported and the block
+  keeps the statements read so far.
+- expression: skip to a token that may follow an expression (')', ';',
+  ',' or a statement boundary), stepping over balanced parentheses. The
+  expression becomes an ErrorExpression and the statement carries on.
+An error reported at the token of the previous report is a consequence of
+it and is dropped. parse() returns the partial Program together with every
+error in errors (and as ParseError objects in diagnostics).
 """
 
-from typing import List, Optional
+from collections import deque
+from types import GeneratorType
+from typing import Dict, Generator, Iterable, List, Optional, Set, Union
 from tokens import Token, TokenType
+from scanner import LexicalError
 from ast_nodes import *
 
 class ParseError(Exception):
@@ -36,13 +62,66 @@ class ParseError(Exception):
         self.token = token
         super().__init__(f"Parse Error at line {token.line}, column {token.column}: {message}")
 
+# First tokens of every statement except assignments and calls, which start
+# with an IDENTIFIER and so cannot be told apart from the middle of an expression
+STATEMENT_KEYWORDS = frozenset({
+    TokenType.FUNCTION, TokenType.INT, TokenType.FLOAT, TokenType.BOOL, TokenType.RETURN,
+    TokenType.PRINT, TokenType.IF, TokenType.WHILE, TokenType.FOR, TokenType.DO,
+})
+# Where statement-level recovery stops (before the token)
+STATEMENT_SYNC = STATEMENT_KEYWORDS | {TokenType.LEFT_BRACE, TokenType.RIGHT_BRACE, TokenType.EOF}
+# Where expression-level recovery stops: what may follow an expression
+EXPRESSION_SYNC = STATEMENT_SYNC | {TokenType.RIGHT_PAREN, TokenType.SEMICOLON, TokenType.COMMA}
+
+# Binding power and operator of every binary operator token, loosest first.
+# All of them are left-associative.
+BINARY_OPERATORS = {
+    TokenType.OR: (1, 'or'),
+    TokenType.AND: (2, 'and'),
+    TokenType.EQUAL: (3, '=='),
+    TokenType.NOT_EQUAL: (3, '!='),
+    TokenType.GREATER_THAN: (4, '>'),
+    TokenType.LESS_THAN: (4, '<'),
+    TokenType.GREATER_EQUAL: (4, '>='),
+    TokenType.LESS_EQUAL: (4, '<='),
+    TokenType.PLUS: (5, '+'),
+    TokenType.MINUS: (5, '-'),
+    TokenType.MULTIPLY: (6, '*'),
+    TokenType.DIVIDE: (6, '/'),
+}
+# Prefix operators bind tighter than any binary operator
+PREFIX_OPERATORS = {TokenType.NOT: 'not', TokenType.MINUS: '-'}
+LITERAL_NODES = {
+    TokenType.BOOLEAN_LITERAL: BooleanLiteral,
+    TokenType.INTEGER_LITERAL: IntegerLiteral,
+    TokenType.FLOAT_LITERAL: FloatLiteral,
+}
+
+# Kinds of the frames parse_expression keeps for constructs waiting for an operand
+UNARY_FRAME, BINARY_FRAME, GROUP_FRAME, CALL_FRAME = range(4)
+
+# A compound statement being parsed: yields where it needs a nested statement,
+# is sent that statement, and returns the finished node
+StatementParser = Generator[None, Statement, Statement]
+
 class Parser:
-    """Recursive descent parser for MiniLang."""
+    """
+    Recursive descent parser for MiniLang.
+    
+    With hash_cons, equal expressions are built once and shared (see
+    share): a program that repeats its constant subexpressions then holds
+    one node for each, not one per occurrence.
+    """
     
-    def __init__(self, tokens: List[Token]):
+    def __init__(self, tokens: List[Token], hash_cons: bool = False):
         self.tokens = tokens
         self.current = 0
         self.errors = []  # Track parsing errors
+        self.diagnostics: List[ParseError] = []  # The same errors, with their tokens
+        self.last_error_token: Optional[Token] = None
+        # Each shared expression by its class and fields, operands by id (see share)
+        self.shared_nodes: Optional[Dict[tuple, Expression]] = {} if hash_cons else None
+        self.shared_ids: Set[int] = set()  # ids of the shared expressions
     
     def current_token(self) -> Token:
         """Get the current token."""
@@ -63,6 +142,10 @@ class Parser:
             self.current += 1
         return self.tokens[self.current - 1]
     
+    def previous_token(self) -> Token:
+        """Get the most recently consumed token."""
+        return self.tokens[self.current - 1]
+    
     def check(self, token_type: TokenType) -> bool:
         """Check if current token is of the given type."""
         return self.current_token().type == token_type
@@ -81,32 +164,28 @@ class Parser:
             return self.advance()
         raise ParseError(message, self.current_token())
     
+    def report(self, error: ParseError) -> None:
+        """Record a syntax error unless it sits on the token of the previous one."""
+        if error.token is self.last_error_token:
+            return
+        self.last_error_token = error.token
+        self.errors.append(str(error))
+        self.diagnostics.append(error)
+    
     def synchronize(self):
-        """Recover from parser error by finding the next statement."""
-        self.advance()
-        while not self.check(TokenType.EOF):
-            if self.tokens[self.current - 1].type == TokenType.SEMICOLON:
-                return
-            if self.current_token().type in [TokenType.IF, TokenType.WHILE, 
-                                           TokenType.INT, TokenType.FLOAT, TokenType.BOOL,
-                                           TokenType.PRINT]:
+        """Recover from parser error by skipping to the next statement boundary."""
+        while self.current_token().type not in STATEMENT_SYNC:
+            if self.advance().type == TokenType.SEMICOLON:
                 return
-            self.advance()
     
     def parse(self) -> Program:
-        """Parse the tokens into an AST."""
-        try:
-            statements = self.parse_program()
-            # If there were any errors during parsing, return None
-            if self.errors:
-                for error in self.errors:
-                    print(f"Parser Error: {error}")
-                return None
-            return Program(statements)
-        except ParseError as e:
-            print(f"Parser Error: {e}")
-            self.errors.append(str(e))
-            return None
+        """
+        Parse the tokens into an AST.
+        
+        Always returns a Program; if errors is not empty, it is a partial
+        tree containing ErrorStatement and ErrorExpression nodes.
+        """
+        return Program(self.parse_program())
     
     def parse_program(self) -> List[Statement]:
         """Parse the entire program."""
@@ -116,21 +195,72 @@ class Parser:
             # Skip newlines
             if self.match(TokenType.NEWLINE):
                 continue
-            
+            statements.append(self.parse_statement_or_error())
+        
+        return statements
+    
+    def parse_statement_or_error(self) -> Statement:
+        """
+        Parse a statement, or report its error and skip it (statement-level recovery).
+        
+        The compound statements being parsed are kept on an explicit stack:
+        each is resumed with the nested statement it yielded for, and a
+        ParseError ends only the innermost one.
+        """
+        frames = []  # (StatementParser, start token index), innermost last
+        while True:
+            start = self.current
             try:
-                stmt = self.parse_statement()
-                if stmt:
-                    statements.append(stmt)
+                statement = self.parse_statement()
             except ParseError as e:
-                # Record the error
-                self.errors.append(str(e))
-                print(f"Parser Error: {e}")
-                self.synchronize()
-        
+                statement = self.recover(e, start)
+            if type(statement) is GeneratorType:
+                frames.append((statement, start))
+                statement = None  # Starts it
+            while frames:
+                compound, start = frames[-1]
+                try:
+                    compound.send(statement)
+                    break  # It needs a nested statement
+                except StopIteration as done:
+                    statement = done.value
+                except ParseError as e:
+                    statement = self.recover(e, start)
+                frames.pop()
+            else:
+                return statement
+    
+    def recover(self, error: ParseError, start: int) -> ErrorStatement:
+        """Report error and skip the rest of the statement that began at token index start."""
+        self.report(error)
+        self.synchronize()
+        if self.current == start:
+            self.advance()  # The offending token ends a statement, e.g. a stray '}'
+        return ErrorStatement(error.message)
+    
+    @staticmethod
+    def body_statements(statement: Statement) -> List[Statement]:
+        """The body of an if, while, for or do, which is one statement or a block."""
+        return statement.statements if isinstance(statement, Block) else [statement]
+    
+    def parse_statement_list(self) -> Generator[None, Statement, List[Statement]]:
+        """Parse statements up to the closing '}' of a block or function body."""
+        statements = []
+        while not self.check(TokenType.RIGHT_BRACE) and not self.check(TokenType.EOF):
+            if self.match(TokenType.NEWLINE):
+                continue
+            statements.append((yield))
         return statements
     
-    def parse_statement(self) -> Statement:
-        """Parse a statement."""
+    def expect_closing_brace(self, message: str) -> None:
+        """Consume the '}' ending a statement list; at the end of input report it missing instead (block-level recovery)."""
+        if self.check(TokenType.RIGHT_BRACE):
+            self.advance()
+        else:
+            self.report(ParseError(message, self.current_token()))
+    
+    def parse_statement(self) -> Union[Statement, StatementParser]:
+        """Parse a simple statement, or return the parser of a compound one."""
         # Function declaration
         if self.check(TokenType.FUNCTION):
             return self.parse_function_declaration()
@@ -213,36 +343,33 @@ class Parser:
         
         return PrintStatement(expression)
     
-    def parse_if_statement(self) -> IfStatement:
+    def parse_if_statement(self) -> StatementParser:
         """Parse if statement: 'if' '(' expression ')' statement ('else' statement)?"""
         self.advance()  # consume 'if'
         self.consume(TokenType.LEFT_PAREN, "Expected '(' after 'if'")
         condition = self.parse_expression()
         self.consume(TokenType.RIGHT_PAREN, "Expected ')' after if condition")
         
-        then_stmt = self.parse_statement()
-        then_statements = [then_stmt] if not isinstance(then_stmt, Block) else then_stmt.statements
+        then_statements = self.body_statements((yield))
         
         else_statements = None
         if self.match(TokenType.ELSE):
-            else_stmt = self.parse_statement()
-            else_statements = [else_stmt] if not isinstance(else_stmt, Block) else else_stmt.statements
+            else_statements = self.body_statements((yield))
         
         return IfStatement(condition, then_statements, else_statements)
     
-    def parse_while_statement(self) -> WhileStatement:
+    def parse_while_statement(self) -> StatementParser:
         """Parse while statement: 'while' '(' expression ')' statement"""
         self.advance()  # consume 'while'
         self.consume(TokenType.LEFT_PAREN, "Expected '(' after 'while'")
         condition = self.parse_expression()
         self.consume(TokenType.RIGHT_PAREN, "Expected ')' after while condition")
         
-        body_stmt = self.parse_statement()
-        body = [body_stmt] if not isinstance(body_stmt, Block) else body_stmt.statements
+        body = self.body_statements((yield))
         
         return WhileStatement(condition, body)
     
-    def parse_for_statement(self) -> ForStatement:
+    def parse_for_statement(self) -> StatementParser:
         """Parse for statement: 'for' '(' init ';' condition ';' update ')' statement"""
         self.advance()  # consume 'for'
         self.consume(TokenType.LEFT_PAREN, "Expected '(' after 'for'")
@@ -284,17 +411,15 @@ class Parser:
         self.consume(TokenType.RIGHT_PAREN, "Expected ')' after for header")
         
         # Parse body
-        body_stmt = self.parse_statement()
-        body = [body_stmt] if not isinstance(body_stmt, Block) else body_stmt.statements
+        body = self.body_statements((yield))
         
         return ForStatement(init, condition, update, body)
     
-    def parse_do_while_statement(self) -> DoWhileStatement:
+    def parse_do_while_statement(self) -> StatementParser:
         """Parse do-while statement: 'do' statement 'while' '(' expression ')' ';'"""
         self.advance()  # consume 'do'
         
-        body_stmt = self.parse_statement()
-        body = [body_stmt] if not isinstance(body_stmt, Block) else body_stmt.statements
+        body = self.body_statements((yield))
         
         self.consume(TokenType.WHILE, "Expected 'while' after do body")
         self.consume(TokenType.LEFT_PAREN, "Expected '(' after 'while'")
@@ -304,7 +429,7 @@ class Parser:
         
         return DoWhileStatement(body, condition)
     
-    def parse_function_declaration(self) -> FunctionDeclaration:
+    def parse_function_declaration(self) -> StatementParser:
         """Parse function declaration: 'function' type IDENTIFIER '(' params ')' '{' statements '}'"""
         self.advance()  # consume 'function'
         
@@ -334,12 +459,8 @@ class Parser:
         
         # Parse body
         self.consume(TokenType.LEFT_BRACE, "Expected '{' after function header")
-        body = []
-        while not self.check(TokenType.RIGHT_BRACE) and not self.check(TokenType.EOF):
-            if self.match(TokenType.NEWLINE):
-                continue
-            body.append(self.parse_statement())
-        self.consume(TokenType.RIGHT_BRACE, "Expected '}' after function body")
+        body = yield from self.parse_statement_list()
+        self.expect_closing_brace("Expected '}' after function body")
         
         return FunctionDeclaration(return_type, name, parameters, body)
     
@@ -370,148 +491,219 @@ class Parser:
         
         return FunctionCall(name, arguments)
     
-    def parse_block(self) -> Block:
+    def parse_block(self) -> StatementParser:
         """Parse block: '{' statement_list '}'"""
         self.advance()  # consume '{'
-        
-        statements = []
-        while not self.check(TokenType.RIGHT_BRACE) and not self.check(TokenType.EOF):
-            if self.match(TokenType.NEWLINE):
-                continue
-            statements.append(self.parse_statement())
-        
-        self.consume(TokenType.RIGHT_BRACE, "Expected '}' after block")
+        statements = yield from self.parse_statement_list()
+        self.expect_closing_brace("Expected '}' after block")
         return Block(statements)
     
     def parse_expression(self) -> Expression:
-        """Parse expression (start with lowest precedence)."""
-        return self.parse_logical_or()
-    
-    def parse_logical_or(self) -> Expression:
-        """Parse logical OR: logical_and ('or' logical_and)*"""
-        expr = self.parse_logical_and()
-        
-        while self.match(TokenType.OR):
-            operator = 'or'
-            right = self.parse_logical_and()
-            expr = BinaryOp(expr, operator, right)
-        
-        return expr
-    
-    def parse_logical_and(self) -> Expression:
-        """Parse logical AND: equality ('and' equality)*"""
-        expr = self.parse_equality()
-        
-        while self.match(TokenType.AND):
-            operator = 'and'
-            right = self.parse_equality()
-            expr = BinaryOp(expr, operator, right)
-        
-        return expr
+        """
+        Parse expression.
+        
+        Pratt parsing: one loop climbs the binding powers in BINARY_OPERATORS
+        instead of a function per precedence level. An operator, parenthesis
+        or call still waiting for an operand is pushed as a frame, and popped
+        (reduced) once the operand is complete, i.e. once the next token is
+        not an operator that binds tighter than min_power.
+        """
+        operators = BINARY_OPERATORS
+        shared_ids = self.shared_ids if self.shared_nodes is not None else None
+        frames = []  # (kind, min_power to restore, ...), innermost last
+        min_power = 0
+        while True:
+            # Operand: prefix operators and '(' push frames until a primary is read
+            token = self.current_token()
+            token_type = token.type
+            operator = PREFIX_OPERATORS.get(token_type)
+            if operator is not None:
+                self.advance()
+                frames.append((UNARY_FRAME, min_power, operator))
+                continue
+            if token_type == TokenType.LEFT_PAREN:
+                self.advance()
+                frames.append((GROUP_FRAME, min_power))
+                min_power = 0
+                continue
+            if token_type == TokenType.IDENTIFIER and self.peek_token().type == TokenType.LEFT_PAREN:
+                self.advance()
+                self.advance()  # consume '('
+                if self.check(TokenType.RIGHT_PAREN) or self.check(TokenType.EOF):
+                    self.consume(TokenType.RIGHT_PAREN, "Expected ')' after arguments")
+                    expr = FunctionCall(token.value, [])
+                else:
+                    frames.append((CALL_FRAME, min_power, token.value, []))
+                    min_power = 0
+                    continue
+            else:
+                expr = self.parse_primary()
+            
+            # Fold expr into the frames it completes
+            while True:
+                while frames and frames[-1][0] == UNARY_FRAME:
+                    # Prefix operators bind tighter than any binary operator
+                    operator = frames.pop()[2]
+                    if shared_ids is not None and id(expr) in shared_ids:
+                        expr = self.share((UnaryOp, operator, id(expr)), UnaryOp, operator, expr)
+                    else:
+                        expr = UnaryOp(operator, expr)
+                entry = operators.get(self.current_token().type)
+                if entry is not None and entry[0] > min_power:
+                    # Its right operand comes next
+                    self.advance()
+                    frames.append((BINARY_FRAME, min_power, expr, entry[1]))
+                    min_power = entry[0]
+                    break
+                if not frames:
+                    return expr
+                frame = frames.pop()
+                kind = frame[0]
+                min_power = frame[1]
+                if kind == BINARY_FRAME:
+                    left = frame[2]
+                    if shared_ids is not None and id(left) in shared_ids and id(expr) in shared_ids:
+                        expr = self.share((BinaryOp, id(left), frame[3], id(expr)), BinaryOp, left, frame[3], expr)
+                    else:
+                        expr = BinaryOp(left, frame[3], expr)
+                elif kind == GROUP_FRAME:
+                    self.consume(TokenType.RIGHT_PAREN, "Expected ')' after expression")
+                else:
+                    arguments = frame[3]
+                    arguments.append(expr)
+                    if not self.check(TokenType.RIGHT_PAREN):
+                        self.consume(TokenType.COMMA, "Expected ',' between arguments")
+                    if not self.check(TokenType.RIGHT_PAREN) and not self.check(TokenType.EOF):
+                        # The next argument comes next
+                        frames.append(frame)
+                        min_power = 0
+                        break
+                    self.consume(TokenType.RIGHT_PAREN, "Expected ')' after arguments")
+                    expr = FunctionCall(frame[2], arguments)
     
-    def parse_equality(self) -> Expression:
-        """Parse equality: relational (('==' | '!=') relational)*"""
-        expr = self.parse_relational()
+    def parse_primary(self) -> Expression:
+        """Parse a primary without parts: IDENTIFIER | INTEGER_LITERAL | FLOAT_LITERAL | BOOLEAN_LITERAL"""
+        token = self.current_token()
+        token_type = token.type
         
-        while self.match(TokenType.EQUAL, TokenType.NOT_EQUAL):
-            operator = '==' if self.tokens[self.current - 1].type == TokenType.EQUAL else '!='
-            right = self.parse_relational()
-            expr = BinaryOp(expr, operator, right)
+        # Literals
+        literal = LITERAL_NODES.get(token_type)
+        if literal is not None:
+            self.advance()
+            if self.shared_nodes is not None:
+                return self.share((literal, token.value), literal, token.value)
+            return literal(token.value)
         
-        return expr
+        if token_type == TokenType.IDENTIFIER:
+            self.advance()
+            return Identifier(token.value)
+        
+        # Expression-level recovery
+        error = ParseError(f"Unexpected token in expression: {self.current_token().value}",
+                           self.current_token())
+        self.report(error)
+        self.skip_expression()
+        return ErrorExpression(error.message)
+    
+    def share(self, key: tuple, node_class: type, *fields) -> Expression:
+        """
+        Return the shared node_class(*fields) for key, building it the first
+        time key is seen.
+        
+        Only literals and operators over shared operands are shared, so an
+        operand in the key can stand for itself by id. A name is never
+        shared: TypeChecker records on its node the symbol it resolves to,
+        which can differ from one occurrence to the next. Since TypeChecker
+        types each node once, an ill-typed expression that is repeated is
+        also reported once. Passes that rewrite nodes in place
+        (ConstantFolder) rewrite every occurrence at once, which is the
+        same rewrite as each would get on its own.
+        """
+        node = self.shared_nodes.get(key)
+        if node is None:
+            node = self.shared_nodes[key] = node_class(*fields)
+            self.shared_ids.add(id(node))
+        return node
+    
+    def skip_expression(self) -> None:
+        """Skip to a token that may follow an expression, stepping over balanced parentheses."""
+        depth = 0
+        while True:
+            token_type = self.current_token().type
+            if token_type == TokenType.LEFT_PAREN:
+                depth += 1
+            elif token_type == TokenType.RIGHT_PAREN and depth:
+                depth -= 1
+            elif token_type in EXPRESSION_SYNC:
+                return
+            self.advance()
+
+class StreamingParser(Parser):
+    """
+    Parser that pulls tokens lazily from an iterator (e.g. Scanner.iter_tokens()).
+    
+    Only the current token plus a bounded lookahead window are kept in memory,
+    so scanning and parsing run in constant token memory however long the
+    source is. A LexicalError raised by the token source stops the parse and
+    is recorded in lexical_errors.
+    """
+    
+    def __init__(self, tokens: Iterable[Token], lookahead: int = 1):
+        super().__init__([])
+        self.source = iter(tokens)
+        self.lookahead = lookahead
+        self.window = deque()  # Current token followed by lookahead tokens
+        self.previous = None
+        self.eof_token = None
+        self.lexical_errors = []
+    
+    def _fill(self, size: int) -> None:
+        """Pull tokens from the source until the window holds size tokens."""
+        window = self.window
+        while len(window) < size and self.eof_token is None:
+            token = next(self.source, None)
+            if token is None:
+                # Source ended without an EOF token; synthesize one
+                last = window[-1] if window else self.previous
+                token = Token(TokenType.EOF, None, last.line if last else 1, last.column if last else 1)
+            if token.type == TokenType.EOF:
+                self.eof_token = token
+            window.append(token)
     
-    def parse_relational(self) -> Expression:
-        """Parse relational: additive (('>' | '<' | '>=' | '<=') additive)*"""
-        expr = self.parse_additive()
-        
-        while self.match(TokenType.GREATER_THAN, TokenType.LESS_THAN, TokenType.GREATER_EQUAL, TokenType.LESS_EQUAL):
-            token_type = self.tokens[self.current - 1].type
-            if token_type == TokenType.GREATER_THAN:
-                operator = '>'
-            elif token_type == TokenType.LESS_THAN:
-                operator = '<'
-            elif token_type == TokenType.GREATER_EQUAL:
-                operator = '>='
-            else:  # LESS_EQUAL
-                operator = '<='
-            right = self.parse_additive()
-            expr = BinaryOp(expr, operator, right)
-        
-        return expr
+    def current_token(self) -> Token:
+        """Get the current token."""
+        if not self.window:
+            self._fill(1)
+        return self.window[0]
     
-    def parse_additive(self) -> Expression:
-        """Parse additive: multiplicative (('+' | '-') multiplicative)*"""
-        expr = self.parse_multiplicative()
-        
-        while self.match(TokenType.PLUS, TokenType.MINUS):
-            operator = '+' if self.tokens[self.current - 1].type == TokenType.PLUS else '-'
-            right = self.parse_multiplicative()
-            expr = BinaryOp(expr, operator, right)
-        
-        return expr
+    def peek_token(self, offset: int = 1) -> Token:
+        """Peek at a future token within the lookahead window."""
+        if offset > self.lookahead:
+            raise ValueError(f"Lookahead of {offset} exceeds the window size {self.lookahead}")
+        self._fill(offset + 1)
+        if offset < len(self.window):
+            return self.window[offset]
+        return self.eof_token
     
-    def parse_multiplicative(self) -> Expression:
-        """Parse multiplicative: unary (('*' | '/') unary)*"""
-        expr = self.parse_unary()
-        
-        while self.match(TokenType.MULTIPLY, TokenType.DIVIDE):
-            operator = '*' if self.tokens[self.current - 1].type == TokenType.MULTIPLY else '/'
-            right = self.parse_unary()
-            expr = BinaryOp(expr, operator, right)
-        
-        return expr
+    def advance(self) -> Token:
+        """Move to the next token and return the previous one."""
+        token = self.current_token()
+        if token.type != TokenType.EOF:
+            self.previous = self.window.popleft()
+            self.current += 1
+        return self.previous if self.previous is not None else token
     
-    def parse_unary(self) -> Expression:
-        """Parse unary: ('not' | '-') unary | primary"""
-        if self.match(TokenType.NOT, TokenType.MINUS):
-            operator = 'not' if self.tokens[self.current - 1].type == TokenType.NOT else '-'
-            expr = self.parse_unary()
-            return UnaryOp(operator, expr)
-        
-        return self.parse_primary()
+    def previous_token(self) -> Token:
+        """Get the most recently consumed token."""
+        return self.previous
     
-    def parse_primary(self) -> Expression:
-        """Parse primary: IDENTIFIER | INTEGER_LITERAL | FLOAT_LITERAL | BOOLEAN_LITERAL | '(' expression ')'"""
-        
-        # Boolean literal
-        if self.check(TokenType.BOOLEAN_LITERAL):
-            value = self.advance().value
-            return BooleanLiteral(value)
-        
-        # Integer literal
-        if self.check(TokenType.INTEGER_LITERAL):
-            value = self.advance().value
-            return IntegerLiteral(value)
-        
-        # Float literal
-        if self.check(TokenType.FLOAT_LITERAL):
-            value = self.advance().value
-            return FloatLiteral(value)
-        
-        # Identifier or function call
-        if self.check(TokenType.IDENTIFIER):
-            name = self.advance().value
-            
-            # Check if it's a function call
-            if self.match(TokenType.LEFT_PAREN):
-                arguments = []
-                while not self.check(TokenType.RIGHT_PAREN) and not self.check(TokenType.EOF):
-                    arguments.append(self.parse_expression())
-                    if not self.check(TokenType.RIGHT_PAREN):
-                        self.consume(TokenType.COMMA, "Expected ',' between arguments")
-                self.consume(TokenType.RIGHT_PAREN, "Expected ')' after arguments")
-                return FunctionCall(name, arguments)
-            
-            return Identifier(name)
-        
-        # Parenthesized expression
-        if self.match(TokenType.LEFT_PAREN):
-            expr = self.parse_expression()
-            self.consume(TokenType.RIGHT_PAREN, "Expected ')' after expression")
-            return expr
-        
-        raise ParseError(f"Unexpected token in expression: {self.current_token().value}", 
-                        self.current_token())
+    def parse(self) -> Program:
+        """Parse tokens as they are scanned into an AST."""
+        try:
+            return super().parse()
+        except LexicalError as e:
+            self.lexical_errors.append(str(e))
+            return None
 
 # Test the parser
 if __name__ == "__main__":
@@ -5,8 +5,8 @@ Course: CS-4031 - Compiler Construction
 """
 
 import re
-from typing import List, Optional
-from tokens import Token, TokenType, KEYWORDS, TWO_CHAR_OPERATORS, SINGLE_CHAR_TOKENS
+from typing import Iterator, List, Optional
+from tokens import Token, TokenBuffer, TokenType, KEYWORDS, TWO_CHAR_OPERATORS, SINGLE_CHAR_TOKENS
 
 class LexicalError(Exception):
     """Exception raised for lexical analysis errors."""
@@ -181,30 +181,250 @@ class Scanner:
         # End of file
         return Token(TokenType.EOF, None, self.line, self.column)
     
+    def iter_tokens(self) -> Iterator[Token]:
+        """Yield tokens one at a time, ending with EOF. Raises LexicalError."""
+        while True:
+            token = self.get_next_token()
+            yield token
+            if token.type == TokenType.EOF:
+                return
+    
     def tokenize(self) -> List[Token]:
         """Tokenize the entire source code."""
         self.tokens = []
         self.errors = []  # Reset errors
         
         try:
-            while True:
-                token = self.get_next_token()
-                self.tokens.append(token)
-                if token.type == TokenType.EOF:
-                    break
-            
+            self.tokens.extend(self.iter_tokens())
             return self.tokens
         
         except LexicalError as e:
             self.errors.append(str(e))
-            print(f"Lexical Analysis Error: {e}")
             return []
     
+    def tokenize_compact(self) -> TokenBuffer:
+        """Tokenize the entire source code into a compact TokenBuffer."""
+        self.tokens = []
+        self.errors = []  # Reset errors
+        
+        try:
+            return TokenBuffer.from_tokens(self.iter_tokens(), self.source_code)
+        
+        except LexicalError as e:
+            self.errors.append(str(e))
+            return TokenBuffer(self.source_code)
+    
     def print_tokens(self) -> None:
         """Print all tokens for debugging."""
         for token in self.tokens:
             print(token)
 
+def _build_master_pattern() -> "re.Pattern":
+    """Build one alternation regex covering every token class in tokens.py."""
+    single_chars = ''.join(re.escape(ch) for ch in SINGLE_CHAR_TOKENS)
+    two_chars = '|'.join(re.escape(op) for op in TWO_CHAR_OPERATORS)
+    # Leading blanks are folded into every match so they cost no extra step.
+    # NAME continues with \w, which matches exactly str.isalnum() plus '_'.
+    return re.compile(
+        r'[ \t\r]*(?:'
+        r'(?P<NAME>[A-Za-z_]\w*)'
+        r'|(?P<NUMBER>[0-9][0-9.]*)'
+        r'|(?P<COMMENT>//[^\n]*)'
+        '|(?P<OP>' + two_chars + '|[' + single_chars + '])'
+        r'|(?P<NEWLINE>\n)'
+        r')'
+    )
+
+MASTER_PATTERN = _build_master_pattern()
+_NAME = MASTER_PATTERN.groupindex['NAME']
+_NUMBER = MASTER_PATTERN.groupindex['NUMBER']
+_COMMENT = MASTER_PATTERN.groupindex['COMMENT']
+_OP = MASTER_PATTERN.groupindex['OP']
+
+# Operator lexeme -> token type, two-character operators included
+OPERATOR_TOKENS = {**SINGLE_CHAR_TOKENS, **TWO_CHAR_OPERATORS}
+
+class RegexScanner(Scanner):
+    """
+    Table-driven scanner that matches whole lexemes with MASTER_PATTERN.
+    
+    Produces exactly the same tokens, positions and errors as Scanner.
+    The regex covers ASCII input; anything it cannot decide on its own
+    (unknown or non-ASCII characters, malformed numbers) is handed back to
+    the character-level Scanner methods at that position.
+    """
+    
+    def _fallback_token(self, position: int, line: int, line_start: int) -> Token:
+        """Scan one token with the character-level scanner."""
+        self.position = position
+        self.line = line
+        self.column = position - line_start + 1
+        return Scanner.get_next_token(self)
+    
+    def iter_tokens(self) -> Iterator[Token]:
+        """Yield tokens one at a time, ending with EOF. Raises LexicalError."""
+        source = self.source_code
+        length = len(source)
+        match_at = MASTER_PATTERN.match
+        keywords = KEYWORDS
+        operators = OPERATOR_TOKENS
+        identifier = TokenType.IDENTIFIER
+        boolean = TokenType.BOOLEAN_LITERAL
+        position = 0
+        line = 1
+        line_start = 0  # Offset of the first character of the current line
+        
+        while position < length:
+            match = match_at(source, position)
+            if match is not None:
+                kind = match.lastindex
+                start, end = match.span(kind)
+                
+                if kind == _NAME:
+                    text = source[start:end]
+                    token_type = keywords.get(text, identifier)
+                    if token_type is boolean:
+                        yield Token(boolean, text == 'true', line, start - line_start + 1)
+                    else:
+                        yield Token(token_type, text, line, start - line_start + 1)
+                    position = end
+                    continue
+                
+                if kind == _OP:
+                    text = source[start:end]
+                    yield Token(operators[text], text, line, start - line_start + 1)
+                    position = end
+                    continue
+                
+                if kind == _COMMENT:
+                    position = end
+                    continue
+                
+                if kind == _NUMBER:
+                    text = source[start:end]
+                    # Malformed numbers and digits running into non-ASCII
+                    # text are reported by the character-level scanner
+                    if not (text.endswith('.') or text.count('.') > 1
+                            or (end < length and source[end] >= '\x80')):
+                        if '.' in text:
+                            yield Token(TokenType.FLOAT_LITERAL, float(text), line, start - line_start + 1)
+                        else:
+                            yield Token(TokenType.INTEGER_LITERAL, int(text), line, start - line_start + 1)
+                        position = end
+                        continue
+                
+                else:  # NEWLINE
+                    yield Token(TokenType.NEWLINE, '\\n', line, start - line_start + 1)
+                    line += 1
+                    line_start = position = end
+                    continue
+            
+            # Unmatched input: let the character-level scanner decide
+            token = self._fallback_token(position, line, line_start)
+            position = self.position
+            line = self.line
+            line_start = position - self.column + 1
+            if token.type == TokenType.EOF:
+                break
+            yield token
+        
+        self.position = position
+        self.line = line
+        self.column = position - line_start + 1
+        yield Token(TokenType.EOF, None, line, self.column)
+
+    def tokenize_compact(self) -> TokenBuffer:
+        """Tokenize straight into a TokenBuffer without building Token objects."""
+        self.tokens = []
+        self.errors = []  # Reset errors
+        
+        source = self.source_code
+        length = len(source)
+        buffer = TokenBuffer(source)
+        types, starts, ends = buffer.types, buffer.starts, buffer.ends
+        lines, columns = buffer.lines, buffer.columns
+        match_at = MASTER_PATTERN.match
+        keywords = KEYWORDS
+        operators = OPERATOR_TOKENS
+        identifier = TokenType.IDENTIFIER.value
+        keyword_codes = {text: token_type.value for text, token_type in keywords.items()}
+        operator_codes = {text: token_type.value for text, token_type in operators.items()}
+        integer_code = TokenType.INTEGER_LITERAL.value
+        float_code = TokenType.FLOAT_LITERAL.value
+        newline_code = TokenType.NEWLINE.value
+        position = 0
+        line = 1
+        line_start = 0  # Offset of the first character of the current line
+        
+        try:
+            while position < length:
+                match = match_at(source, position)
+                if match is not None:
+                    kind = match.lastindex
+                    start, end = match.span(kind)
+                    
+                    if kind == _NAME:
+                        code = keyword_codes.get(source[start:end], identifier)
+                    elif kind == _OP:
+                        code = operator_codes[source[start:end]]
+                    elif kind == _COMMENT:
+                        position = end
+                        continue
+                    elif kind == _NUMBER:
+                        text = source[start:end]
+                        if (text.endswith('.') or text.count('.') > 1
+                                or (end < length and source[end] >= '\x80')):
+                            code = None  # Reported by the character-level scanner
+                        else:
+                            code = float_code if '.' in text else integer_code
+                    else:  # NEWLINE
+                        code = newline_code
+                    
+                    if code is not None:
+                        types.append(code)
+                        starts.append(start)
+                        ends.append(end)
+                        lines.append(line)
+                        columns.append(start - line_start + 1)
+                        position = end
+                        if code == newline_code:
+                            line += 1
+                            line_start = end
+                        continue
+                
+                # Unmatched input: let the character-level scanner decide
+                token = self._fallback_token(position, line, line_start)
+                position = self.position
+                if token.type == TokenType.EOF:
+                    break
+                buffer.append(token.type, position - (self.column - token.column), position,
+                              token.line, token.column)
+                line = self.line
+                line_start = position - self.column + 1
+        
+        except LexicalError as e:
+            self.errors.append(str(e))
+            return TokenBuffer(source)
+        
+        self.position = position
+        self.line = line
+        self.column = position - line_start + 1
+        buffer.append(TokenType.EOF, position, position, line, self.column)
+        return buffer
+
+# Available scanning engines, selectable by name
+SCANNER_ENGINES = {
+    'char': Scanner,
+    'regex': RegexScanner,
+}
+
+def create_scanner(source_code: str, engine: str = 'char') -> Scanner:
+    """Create a scanner for source_code using the named engine."""
+    if engine not in SCANNER_ENGINES:
+        raise ValueError(f"Unknown scanner engine: {engine} "
+                         f"(expected one of {', '.join(SCANNER_ENGINES)})")
+    return SCANNER_ENGINES[engine](source_code)
+
 # Example usage and test
 if __name__ == "__main__":
     # Test with the example MiniLang code from the proposal
@@ -4,9 +4,9 @@ Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
 Course: CS-4031 - Compiler Construction
 """
 
-from typing import List, Optional, Any
+from typing import Any, Callable, Dict, List, Optional
 from ast_nodes import *
-from symbol_table import SymbolTable, Symbol
+from symbol_table import ScopedSymbolTable, SymbolTable, Symbol
 
 class SemanticError(Exception):
     """Exception raised for semantic analysis errors."""
@@ -16,23 +16,92 @@ class SemanticError(Exception):
         self.column = column
         super().__init__(f"Semantic Error at line {line}, column {column}: {message}")
 
+    def __reduce__(self):
+        # Rebuild from the original fields so cached errors survive pickling
+        return (SemanticError, (self.message, self.line, self.column))
+
+ARITHMETIC_OPERATORS = ('+', '-', '*', '/')
+RELATIONAL_OPERATORS = ('>', '<', '>=', '<=')
+EQUALITY_OPERATORS = ('==', '!=')
+LOGICAL_OPERATORS = ('and', 'or')
+NUMERIC_TYPES = ('int', 'float')
+
+def binary_op_type(operator: str, left_type: str, right_type: str) -> Optional[str]:
+    """Result type of a binary operation, or None if the operands are invalid."""
+    # Arithmetic operators (+, -, *, /)
+    if operator in ARITHMETIC_OPERATORS:
+        if left_type == 'int' and right_type == 'int':
+            return 'int'
+        if left_type in NUMERIC_TYPES and right_type in NUMERIC_TYPES:
+            return 'float'
+        return None
+    
+    # Relational operators (>, <, >=, <=)
+    if operator in RELATIONAL_OPERATORS:
+        if left_type in NUMERIC_TYPES and right_type in NUMERIC_TYPES:
+            return 'bool'
+        return None
+    
+    # Equality operators (==, !=)
+    if operator in EQUALITY_OPERATORS:
+        if left_type == right_type:
+            return 'bool'
+        if left_type in NUMERIC_TYPES and right_type in NUMERIC_TYPES:
+            return 'bool'
+        return None
+    
+    # Logical operators (and, or)
+    if operator in LOGICAL_OPERATORS:
+        if left_type == 'bool' and right_type == 'bool':
+            return 'bool'
+        return None
+    
+    return None
+
+def unary_op_type(operator: str, operand_type: str) -> Optional[str]:
+    """Result type of a unary operation, or None if the operand is invalid."""
+    if operator == 'not':
+        return 'bool' if operand_type == 'bool' else None
+    if operator == '-':
+        return operand_type if operand_type in NUMERIC_TYPES else None
+    return None
+
 class TypeChecker(ASTVisitor):
-    """Semantic analyzer that performs type checking and symbol table management."""
+    """
+    Semantic analyzer that performs type checking and symbol table management.
+    
+    Besides reporting errors it annotates the AST: every expression it types
+    gets inferred_type, and every declaration, assignment, call and
+    identifier gets the Symbol its name resolved to (see NamedNode).
+    
+    The walk does not recurse per level of nesting. Statements with a body
+    are visited by generators that yield their nested statements (see
+    ASTVisitor), and operators and calls are typed after their operands on
+    an explicit stack, so any program the parser accepts can be checked.
+    """
     
     def __init__(self):
-        self.symbol_table = SymbolTable()
+        self.symbol_table = ScopedSymbolTable()
         self.errors: List[SemanticError] = []
-        self.current_scope = self.symbol_table
+        self.expression_types: Dict[int, Optional[str]] = {}  # id(node) -> type, see get_expression_type
+        # Typing of expressions without operands dispatches on the node class
+        # instead of an isinstance chain; the others go to type_operations
+        self.expression_typers: Dict[type, Callable[[Any], Optional[str]]] = {
+            IntegerLiteral: self.type_literal,
+            FloatLiteral: self.type_literal,
+            BooleanLiteral: self.type_literal,
+            Identifier: self.type_identifier,
+        }
     
     def add_error(self, message: str, line: int = 0, column: int = 0):
         """Add a semantic error to the list."""
         error = SemanticError(message, line, column)
         self.errors.append(error)
-        print(f"Semantic Error: {error}")
     
     def analyze(self, ast: Program) -> bool:
         """Analyze the AST for semantic errors. Returns True if no errors."""
         self.errors = []
+        self.expression_types = {}
         try:
             self.visit(ast)
             return len(self.errors) == 0
@@ -41,108 +110,178 @@ class TypeChecker(ASTVisitor):
             return False
     
     def get_expression_type(self, expr: Expression) -> Optional[str]:
-        """Get the type of an expression."""
-        if isinstance(expr, IntegerLiteral):
-            return 'int'
-        elif isinstance(expr, FloatLiteral):
-            return 'float'
-        elif isinstance(expr, BooleanLiteral):
-            return 'bool'
-        elif isinstance(expr, Identifier):
-            symbol = self.current_scope.lookup(expr.name)
-            if symbol:
-                return symbol.type
-            else:
-                self.add_error(f"Undefined variable: {expr.name}")
-                return None
-        elif isinstance(expr, BinaryOp):
-            return self.get_binary_op_type(expr)
-        elif isinstance(expr, UnaryOp):
-            return self.get_unary_op_type(expr)
-        elif isinstance(expr, FunctionCall):
-            # Visit the function call to check semantics
-            self.visit_function_call(expr)
-            # Return the function's return type
-            symbol = self.current_scope.lookup(expr.name)
-            if symbol and symbol.is_function:
-                return symbol.type
-            return None
-        else:
-            self.add_error(f"Unknown expression type: {type(expr).__name__}")
-            return None
-    
-    def get_binary_op_type(self, expr: BinaryOp) -> Optional[str]:
-        """Get the result type of a binary operation."""
-        left_type = self.get_expression_type(expr.left)
-        right_type = self.get_expression_type(expr.right)
+        """
+        Get the type of an expression, typing its subexpressions first.
         
-        if left_type is None or right_type is None:
-            return None
+        Each node is typed at most once per analysis: the result is cached
+        under the node's id, so a node reached again (a subtree shared by
+        several parents) costs one lookup and does not report its errors a
+        second time. Operators also record their type in inferred_type;
+        literals, identifiers and calls derive theirs from their class or
+        resolved symbol.
+        """
+        key = id(expr)
+        types = self.expression_types
+        if key in types:
+            return types[key]
+        typer = self.expression_typers.get(expr.__class__)
+        if typer is None:
+            return self.type_operations(expr)
+        expr_type = types[key] = typer(expr)
+        return expr_type
+    
+    def type_operations(self, root: Expression) -> Optional[str]:
+        """
+        Type root, an operator or call, after its untyped subexpressions.
         
-        # Arithmetic operators (+, -, *, /)
-        if expr.operator in ['+', '-', '*', '/']:
-            if left_type == 'int' and right_type == 'int':
-                return 'int'
-            elif (left_type in ['int', 'float']) and (right_type in ['int', 'float']):
-                return 'float'
-            else:
-                self.add_error(f"Invalid operand types for {expr.operator}: {left_type} and {right_type}")
-                return None
+        A post-order walk on an explicit stack rather than by recursion, so
+        the depth of an expression is not bounded by the recursion limit.
+        The stack holds expressions still to type, (node,) below the operands
+        of node to type it once they are typed, and (call, i) below argument
+        i of call to check it once it is typed.
         
-        # Relational operators (>, <, >=, <=)
-        elif expr.operator in ['>', '<', '>=', '<=']:
-            if (left_type in ['int', 'float']) and (right_type in ['int', 'float']):
-                return 'bool'
+        Errors come out in the same order as from a recursive walk: a call
+        reports a bad callee before typing its arguments and checks each
+        argument right after typing it.
+        """
+        types = self.expression_types
+        typers = self.expression_typers
+        stack = [root]
+        while stack:
+            item = stack.pop()
+            cls = item.__class__
+            if cls is tuple:
+                node = item[0]
+                cls = node.__class__
+                if len(item) == 2:
+                    index = item[1]
+                    self.check_argument(node, index, node.symbol.param_types[index],
+                                        types[id(node.arguments[index])])
+                elif cls is BinaryOp:
+                    types[id(node)] = self.type_binary_op(node)
+                elif cls is UnaryOp:
+                    types[id(node)] = self.type_unary_op(node)
+                else:
+                    types[id(node)] = node.symbol.type if node.symbol is not None else None
+                continue
+            
+            key = id(item)
+            if key in types:
+                continue
+            typer = typers.get(cls)
+            if typer is not None:
+                types[key] = typer(item)
+            elif cls is BinaryOp:
+                # Operands without operands of their own are typed here rather than pushed
+                left = item.left
+                typer = typers.get(left.__class__)
+                if typer is None:
+                    stack += ((item,), item.right, left)
+                    continue
+                if id(left) not in types:
+                    types[id(left)] = typer(left)
+                right = item.right
+                typer = typers.get(right.__class__)
+                if typer is None:
+                    stack += ((item,), right)
+                    continue
+                if id(right) not in types:
+                    types[id(right)] = typer(right)
+                types[key] = self.type_binary_op(item)
+            elif cls is UnaryOp:
+                stack += ((item,), item.operand)
+            elif cls is FunctionCall:
+                stack.append((item,))
+                if self.resolve_call(item):
+                    arguments = item.arguments
+                    for index in range(len(arguments) - 1, -1, -1):
+                        stack += ((item, index), arguments[index])
             else:
-                self.add_error(f"Invalid operand types for {expr.operator}: {left_type} and {right_type}")
-                return None
+                types[key] = self.type_unknown(item)
+        return types[id(root)]
+    
+    def type_literal(self, expr: Expression) -> Optional[str]:
+        return expr.inferred_type
+    
+    def type_identifier(self, expr: Identifier) -> Optional[str]:
+        symbol = expr.symbol = self.symbol_table.lookup(expr.name)
+        if symbol is None:
+            self.add_error(f"Undefined variable: {expr.name}")
+            return None
+        return symbol.type
+    
+    def resolve_call(self, node: FunctionCall) -> bool:
+        """Check the callee of a call; True if its arguments are to be typed and checked."""
+        # Check if function is declared
+        symbol = self.symbol_table.lookup(node.name)
+        node.symbol = symbol if symbol is not None and symbol.is_function else None
+        if symbol is None:
+            self.add_error(f"Undefined function: {node.name}")
+            return False
         
-        # Equality operators (==, !=)
-        elif expr.operator in ['==', '!=']:
-            if left_type == right_type:
-                return 'bool'
-            elif (left_type in ['int', 'float']) and (right_type in ['int', 'float']):
-                return 'bool'
-            else:
-                self.add_error(f"Cannot compare {left_type} with {right_type}")
-                return None
+        if not symbol.is_function:
+            self.add_error(f"'{node.name}' is not a function")
+            return False
         
-        # Logical operators (and, or)
-        elif expr.operator in ['and', 'or']:
-            if left_type == 'bool' and right_type == 'bool':
-                return 'bool'
-            else:
-                self.add_error(f"Logical operator {expr.operator} requires boolean operands, got {left_type} and {right_type}")
-                return None
+        # Check argument count
+        if symbol.param_types and len(node.arguments) != len(symbol.param_types):
+            self.add_error(f"Function '{node.name}' expects {len(symbol.param_types)} arguments, got {len(node.arguments)}")
+            return False
+        return bool(symbol.param_types)
+    
+    def check_argument(self, node: FunctionCall, index: int, expected_type: str,
+                       arg_type: Optional[str]):
+        """Check the type of a call's argument once it is typed."""
+        if arg_type and not self.can_assign(expected_type, arg_type):
+            self.add_error(f"Argument {index+1} of function '{node.name}': expected {expected_type}, got {arg_type}")
+    
+    def type_binary_op(self, expr: BinaryOp) -> Optional[str]:
+        """Get the result type of a binary operation."""
+        # Its operands are typed first, by type_operations
+        types = self.expression_types
+        left_type = types[id(expr.left)]
+        right_type = types[id(expr.right)]
         
+        if left_type is None or right_type is None:
+            result_type = None
         else:
-            self.add_error(f"Unknown binary operator: {expr.operator}")
-            return None
+            result_type = binary_op_type(expr.operator, left_type, right_type)
+            if result_type is None:
+                self.report_binary_op_error(expr.operator, left_type, right_type)
+        expr.inferred_type = result_type
+        return result_type
+    
+    def report_binary_op_error(self, operator: str, left_type: str, right_type: str):
+        if operator in ARITHMETIC_OPERATORS or operator in RELATIONAL_OPERATORS:
+            self.add_error(f"Invalid operand types for {operator}: {left_type} and {right_type}")
+        elif operator in EQUALITY_OPERATORS:
+            self.add_error(f"Cannot compare {left_type} with {right_type}")
+        elif operator in LOGICAL_OPERATORS:
+            self.add_error(f"Logical operator {operator} requires boolean operands, got {left_type} and {right_type}")
+        else:
+            self.add_error(f"Unknown binary operator: {operator}")
     
-    def get_unary_op_type(self, expr: UnaryOp) -> Optional[str]:
+    def type_unary_op(self, expr: UnaryOp) -> Optional[str]:
         """Get the result type of a unary operation."""
-        operand_type = self.get_expression_type(expr.operand)
+        operand_type = self.expression_types[id(expr.operand)]  # Typed first, by type_operations
         
         if operand_type is None:
-            return None
-        
-        if expr.operator == 'not':
-            if operand_type == 'bool':
-                return 'bool'
-            else:
-                self.add_error(f"Logical NOT operator requires boolean operand, got {operand_type}")
-                return None
-        
-        elif expr.operator == '-':
-            if operand_type in ['int', 'float']:
-                return operand_type
-            else:
-                self.add_error(f"Unary minus operator requires numeric operand, got {operand_type}")
-                return None
-        
+            result_type = None
         else:
-            self.add_error(f"Unknown unary operator: {expr.operator}")
-            return None
+            result_type = unary_op_type(expr.operator, operand_type)
+            if result_type is None:
+                if expr.operator == 'not':
+                    self.add_error(f"Logical NOT operator requires boolean operand, got {operand_type}")
+                elif expr.operator == '-':
+                    self.add_error(f"Unary minus operator requires numeric operand, got {operand_type}")
+                else:
+                    self.add_error(f"Unknown unary operator: {expr.operator}")
+        expr.inferred_type = result_type
+        return result_type
+    
+    def type_unknown(self, expr: Any) -> Optional[str]:
+        self.add_error(f"Unknown expression type: {expr.__class__.__name__}")
+        return None
     
     def can_assign(self, target_type: str, source_type: str) -> bool:
         """Check if source type can be assigned to target type."""
@@ -157,13 +296,14 @@ class TypeChecker(ASTVisitor):
     
     def visit_program(self, node: Program):
         """Visit the program node."""
-        for stmt in node.statements:
-            self.visit(stmt)
+        yield from node.statements
     
     def visit_var_declaration(self, node: VarDeclaration):
         """Visit variable declaration node."""
+        node.symbol = None  # Until the declaration succeeds
+        
         # Check if variable is already declared in current scope
-        if node.name in self.current_scope.symbols:
+        if self.symbol_table.lookup_current(node.name) is not None:
             self.add_error(f"Variable '{node.name}' already declared in this scope")
             return
         
@@ -175,16 +315,17 @@ class TypeChecker(ASTVisitor):
                 return
         
         # Add variable to symbol table
-        self.current_scope.define(
+        self.symbol_table.define(
             node.name, 
             node.var_type, 
             value=(node.value is not None)
         )
+        node.symbol = self.symbol_table.lookup_current(node.name)
     
     def visit_assignment(self, node: Assignment):
         """Visit assignment node."""
         # Check if variable is declared
-        symbol = self.current_scope.lookup(node.name)
+        symbol = node.symbol = self.symbol_table.lookup(node.name)
         if symbol is None:
             self.add_error(f"Undefined variable: {node.name}")
             return
@@ -196,7 +337,7 @@ class TypeChecker(ASTVisitor):
             return
         
         # Mark variable as initialized
-        self.current_scope.assign(node.name, True)
+        self.symbol_table.assign(node.name, True)
     
     def visit_print_statement(self, node: PrintStatement):
         """Visit print statement node."""
@@ -211,13 +352,11 @@ class TypeChecker(ASTVisitor):
             self.add_error(f"If condition must be boolean, got {condition_type}")
         
         # Visit then statements
-        for stmt in node.then_statements:
-            self.visit(stmt)
+        yield from node.then_statements
         
         # Visit else statements if present
         if node.else_statements:
-            for stmt in node.else_statements:
-                self.visit(stmt)
+            yield from node.else_statements
     
     def visit_while_statement(self, node: WhileStatement):
         """Visit while statement node."""
@@ -227,19 +366,17 @@ class TypeChecker(ASTVisitor):
             self.add_error(f"While condition must be boolean, got {condition_type}")
         
         # Visit body statements
-        for stmt in node.body:
-            self.visit(stmt)
+        yield from node.body
     
     def visit_for_statement(self, node: ForStatement):
         """Visit for statement node."""
         # Create new scope for the for loop
-        old_scope = self.current_scope
-        self.current_scope = self.current_scope.create_child_scope()
+        self.symbol_table.enter_scope()
         
         try:
             # Visit initialization
             if node.init:
-                self.visit(node.init)
+                yield node.init
             
             # Check condition type
             if node.condition:
@@ -249,20 +386,18 @@ class TypeChecker(ASTVisitor):
             
             # Visit update
             if node.update:
-                self.visit(node.update)
+                yield node.update
             
             # Visit body statements
-            for stmt in node.body:
-                self.visit(stmt)
+            yield from node.body
         finally:
             # Restore previous scope
-            self.current_scope = old_scope
+            self.symbol_table.exit_scope()
     
     def visit_do_while_statement(self, node: DoWhileStatement):
         """Visit do-while statement node."""
         # Visit body statements first (executed at least once)
-        for stmt in node.body:
-            self.visit(stmt)
+        yield from node.body
         
         # Check condition type
         condition_type = self.get_expression_type(node.condition)
@@ -272,60 +407,51 @@ class TypeChecker(ASTVisitor):
     def visit_block(self, node: Block):
         """Visit block node (creates new scope)."""
         # Create new scope for the block
-        old_scope = self.current_scope
-        self.current_scope = self.current_scope.create_child_scope()
+        self.symbol_table.enter_scope()
         
         try:
             # Visit all statements in the block
-            for stmt in node.statements:
-                self.visit(stmt)
+            yield from node.statements
         finally:
             # Restore previous scope
-            self.current_scope = old_scope
+            self.symbol_table.exit_scope()
     
     def visit_function_declaration(self, node: FunctionDeclaration):
         """Visit function declaration node."""
+        node.symbol = None  # Until the declaration succeeds
+        
         # Check if function is already declared in current scope
-        if node.name in self.current_scope.symbols:
+        if self.symbol_table.lookup_current(node.name) is not None:
             self.add_error(f"Function '{node.name}' already declared in this scope")
             return
         
-        # Add function to symbol table
+        # Add function to symbol table (functions are always "initialized")
         # parameters is a list of (type, name) tuples
         param_types = [param[0] for param in node.parameters]
-        self.current_scope.define(
-            node.name,
-            node.return_type,
-            value=True  # Functions are always "initialized"
-        )
-        # Update the symbol to mark it as a function
-        symbol = self.current_scope.symbols[node.name]
-        symbol.is_function = True
-        symbol.param_types = param_types
+        self.symbol_table.define_function(node.name, node.return_type, param_types)
+        node.symbol = self.symbol_table.lookup_current(node.name)
         
-        # Create new scope for function body
-        old_scope = self.current_scope
-        self.current_scope = self.current_scope.create_child_scope()
+        # Create new scope (and frame) for function body
+        self.symbol_table.enter_function()
         
         try:
             # Add parameters to function scope
             # parameters is a list of (type, name) tuples
             for param_type, param_name in node.parameters:
-                if param_name in self.current_scope.symbols:
+                if self.symbol_table.lookup_current(param_name) is not None:
                     self.add_error(f"Parameter '{param_name}' already declared")
                 else:
-                    self.current_scope.define(
+                    self.symbol_table.define(
                         param_name,
                         param_type,
                         value=True  # Parameters are considered initialized
                     )
             
             # Visit function body
-            for stmt in node.body:
-                self.visit(stmt)
+            yield from node.body
         finally:
             # Restore previous scope
-            self.current_scope = old_scope
+            self.symbol_table.exit_function()
     
     def visit_return_statement(self, node: ReturnStatement):
         """Visit return statement node."""
@@ -336,42 +462,20 @@ class TypeChecker(ASTVisitor):
     
     def visit_function_call(self, node: FunctionCall):
         """Visit function call node."""
-        # Check if function is declared
-        symbol = self.current_scope.lookup(node.name)
-        if symbol is None:
-            self.add_error(f"Undefined function: {node.name}")
-            return
-        
-        if not symbol.is_function:
-            self.add_error(f"'{node.name}' is not a function")
-            return
-        
-        # Check argument count
-        if symbol.param_types and len(node.arguments) != len(symbol.param_types):
-            self.add_error(f"Function '{node.name}' expects {len(symbol.param_types)} arguments, got {len(node.arguments)}")
-            return
-        
-        # Check argument types
-        if symbol.param_types:
-            for i, (arg, expected_type) in enumerate(zip(node.arguments, symbol.param_types)):
-                arg_type = self.get_expression_type(arg)
-                if arg_type and not self.can_assign(expected_type, arg_type):
-                    self.add_error(f"Argument {i+1} of function '{node.name}': expected {expected_type}, got {arg_type}")
+        self.get_expression_type(node)
     
     def visit_binary_op(self, node: BinaryOp):
         """Visit binary operation node."""
-        # Type checking is done in get_binary_op_type
-        self.get_binary_op_type(node)
+        self.get_expression_type(node)
     
     def visit_unary_op(self, node: UnaryOp):
         """Visit unary operation node."""
-        # Type checking is done in get_unary_op_type
-        self.get_unary_op_type(node)
+        self.get_expression_type(node)
     
     def visit_identifier(self, node: Identifier):
         """Visit identifier node."""
         # Check if variable is declared
-        symbol = self.current_scope.lookup(node.name)
+        symbol = node.symbol = self.symbol_table.lookup(node.name)
         if symbol is None:
             self.add_error(f"Undefined variable: {node.name}")
         elif not symbol.initialized:
@@ -388,23 +492,6 @@ class TypeChecker(ASTVisitor):
     def visit_boolean_literal(self, node: BooleanLiteral):
         """Visit boolean literal node."""
         pass  # No semantic checking needed for literals
-    
-    def visit(self, node: ASTNode):
-        """Generic visit method that dispatches to specific visit methods."""
-        # Convert camelCase to snake_case
-        class_name = node.__class__.__name__
-        # Insert underscore before capital letters
-        import re
-        method_name = re.sub('([A-Z])', r'_\1', class_name).lower()
-        # Remove leading underscore
-        if method_name.startswith('_'):
-            method_name = method_name[1:]
-        method_name = f"visit_{method_name}"
-        
-        if hasattr(self, method_name):
-            return getattr(self, method_name)(node)
-        else:
-            raise Exception(f"No visit method for {node.__class__.__name__}")
 
 # Test the semantic analyzer
 if __name__ == "__main__":
@@ -478,5 +565,35 @@ if __name__ == "__main__":
             
             if not success2:
                 print(f"✓ Found {len(analyzer2.errors)} semantic errors as expected!")
+                for error in analyzer2.errors:
+                    print(f"  - {error}")
             else:
-                print("✗ Should have found semantic errors!")
\ No newline at end of file
+                print("✗ Should have found semantic errors!")
+    
+    # Each call is resolved and its argument checked exactly once, so the
+    # work grows linearly with the nesting depth of f(f(...f(1)...))
+    print("\n\nTesting nested calls:")
+    print("=" * 50)
+    
+    class CountingTypeChecker(TypeChecker):
+        """TypeChecker that counts the calls it resolves and the arguments it checks."""
+        
+        def __init__(self):
+            super().__init__()
+            self.computations = 0
+        
+        def resolve_call(self, node):
+            self.computations += 1
+            return super().resolve_call(node)
+        
+        def check_argument(self, *args):
+            self.computations += 1
+            super().check_argument(*args)
+    
+    for depth in (10, 100, 1000, 10000):
+        source = "function int f(int x) { return x; }\nprint(" + "f(" * depth + "1" + ")" * depth + ");"
+        ast3 = Parser(Scanner(source).tokenize()).parse()
+        analyzer3 = CountingTypeChecker()
+        assert analyzer3.analyze(ast3), analyzer3.errors
+        assert analyzer3.computations == 2 * depth, (depth, analyzer3.computations)
+        print(f"✓ Depth {depth}: {analyzer3.computations} type computations")
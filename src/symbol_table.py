@@ -2,9 +2,18 @@
 Symbol Table for MiniLang compiler.
 Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
 Course: CS-4031 - Compiler Construction
+
+SymbolTable is one scope linked to its parent. ScopedSymbolTable holds all
+scopes of an analysis at once: nested-scope bindings go on a per-name stack,
+entering a scope opens an undo log, exiting pops every binding the log
+recorded, and a lookup costs the same at any nesting depth. It also numbers variables
+with (depth, slot) addresses: depth is the function nesting level of the
+frame that stores the variable (0 for the program's globals) and slot its
+index in that frame. Block scopes share the frame of their function, and
+slots are never reused, so a frame's size is its number of declarations.
 """
 
-from typing import Dict, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Set
 from dataclasses import dataclass
 
 @dataclass
@@ -18,6 +27,9 @@ class Symbol:
     initialized: bool = False
     is_function: bool = False
     param_types: Optional[list] = None  # List of parameter types for functions
+    slot: Optional[int] = None  # Index in its frame (functions: left to code generation)
+    depth: Optional[int] = None  # Function nesting level of the frame holding the slot
+    scope_depth: Optional[int] = None  # Block nesting level of the scope that binds it (0: global)
 
 class SymbolTable:
     """Symbol table for tracking variable declarations and their types."""
@@ -90,4 +102,113 @@ class SymbolTable:
             if symbol.initialized:
                 result += f" = {symbol.value}"
             result += f" (line {symbol.line})\n"
-        return result
\ No newline at end of file
+        return result
+
+class ScopedSymbolTable(SymbolTable):
+    """
+    All scopes of one analysis with O(1) lookup and slot numbering.
+    
+    Globals live in symbols, so after an analysis the table reads like a
+    SymbolTable for the program's globals. Bindings made in nested scopes
+    are stacked in bindings, on top of any global of the same name.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.bindings: Dict[str, List[Symbol]] = {}  # Nested-scope bindings, innermost last
+        self.scopes: List[Set[str]] = []  # Undo log: names bound in each open nested scope
+        self.frames: List[int] = [0]  # Next free slot of each open frame
+    
+    @property
+    def scope_depth(self) -> int:
+        """Block nesting level of the current scope (0: global)."""
+        return len(self.scopes)
+    
+    @property
+    def frame_depth(self) -> int:
+        return len(self.frames) - 1
+    
+    def enter_scope(self) -> None:
+        self.scopes.append(set())
+    
+    def exit_scope(self) -> None:
+        """Drop every binding made since the matching enter_scope()."""
+        bindings = self.bindings
+        for name in self.scopes.pop():
+            stack = bindings[name]
+            stack.pop()
+            if not stack:
+                del bindings[name]
+    
+    def enter_function(self) -> None:
+        """Open the scope and frame of a function body."""
+        self.enter_scope()
+        self.frames.append(0)
+    
+    def exit_function(self) -> int:
+        """Close a function body and return its frame size."""
+        self.exit_scope()
+        return self.frames.pop()
+    
+    def bind(self, symbol: Symbol) -> None:
+        if self.scopes:
+            self.scopes[-1].add(symbol.name)
+            self.bindings.setdefault(symbol.name, []).append(symbol)
+        else:
+            self.symbols[symbol.name] = symbol
+    
+    def define(self, name: str, symbol_type: str, line: int = 0, column: int = 0, value: Any = None) -> bool:
+        """Define a variable in the current scope and give it the next slot of the current frame."""
+        if self.lookup_current(name) is not None:
+            return False
+        
+        slot = self.frames[-1]
+        self.frames[-1] = slot + 1
+        self.bind(Symbol(name=name, type=symbol_type, value=value, line=line, column=column,
+                         initialized=(value is not None), slot=slot, depth=len(self.frames) - 1,
+                         scope_depth=len(self.scopes)))
+        return True
+    
+    def define_function(self, name: str, return_type: str, param_types: list,
+                        line: int = 0, column: int = 0) -> bool:
+        """Define a function in the current scope. Functions take no frame slot."""
+        if self.lookup_current(name) is not None:
+            return False
+        
+        self.bind(Symbol(name=name, type=return_type, value=True, line=line, column=column,
+                         initialized=True, is_function=True, param_types=param_types,
+                         depth=len(self.frames) - 1, scope_depth=len(self.scopes)))
+        return True
+    
+    def lookup(self, name: str) -> Optional[Symbol]:
+        """The innermost visible binding of name."""
+        stack = self.bindings.get(name)
+        return stack[-1] if stack else self.symbols.get(name)
+    
+    def lookup_current(self, name: str) -> Optional[Symbol]:
+        """The binding of name made in the current scope, if any."""
+        if self.scopes:
+            return self.bindings[name][-1] if name in self.scopes[-1] else None
+        return self.symbols.get(name)
+    
+    def restore(self, symbols: Dict[str, Symbol], slot_base: int, slots_used: int,
+                nested: Iterable[Symbol] = ()) -> None:
+        """
+        Re-bind global symbols kept from an earlier analysis.
+        
+        They, together with the nested-scope variables of the global frame
+        declared alongside them, held the global slots slot_base ..
+        slot_base + slots_used - 1, and are moved to the next free ones.
+        """
+        shift = self.frames[0] - slot_base
+        if shift:
+            for symbol in symbols.values():
+                if symbol.slot is not None and not symbol.is_function:
+                    symbol.slot += shift
+            for symbol in nested:
+                symbol.slot += shift
+        self.symbols.update(symbols)
+        self.frames[0] += slots_used
+    
+    def create_child_scope(self) -> 'SymbolTable':
+        raise TypeError("ScopedSymbolTable scopes are opened with enter_scope()")
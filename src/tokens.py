@@ -4,9 +4,11 @@ Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
 Course: CS-4031 - Compiler Construction
 """
 
+import re
+from array import array
 from enum import Enum, auto
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 class TokenType(Enum):
     # Data Types
@@ -73,6 +75,8 @@ class TokenType(Enum):
 
 @dataclass
 class Token:
+    __slots__ = ('type', 'value', 'line', 'column')  # No per-instance __dict__
+    
     type: TokenType
     value: Any
     line: int
@@ -127,4 +131,131 @@ SINGLE_CHAR_TOKENS = {
     ')': TokenType.RIGHT_PAREN,
     '{': TokenType.LEFT_BRACE,
     '}': TokenType.RIGHT_BRACE,
-}
\ No newline at end of file
+}
+
+# Token type code (the enum value) -> TokenType, indexable by code
+TOKEN_TYPES: List[Optional[TokenType]] = [None] * (max(t.value for t in TokenType) + 1)
+for _token_type in TokenType:
+    TOKEN_TYPES[_token_type.value] = _token_type
+
+class TokenBuffer:
+    """
+    Compact struct-of-arrays token store.
+    
+    Each token costs one type code byte plus four unsigned ints (start and
+    end offsets into the source, line and column) instead of a Token object
+    with its own value. Values are sliced back out of the source on demand.
+    
+    The buffer reads like a list of Tokens: len(), indexing (including -1)
+    and iteration all produce Token objects, so Parser, display_tokens and
+    friends work unchanged. type_at()/value_at() avoid building a Token.
+    """
+    
+    __slots__ = ('source', 'types', 'starts', 'ends', 'lines', 'columns', '_last')
+    
+    def __init__(self, source: str):
+        self.source = source
+        # Parsers read the same token several times in a row; keep the last one.
+        # (index, token) is replaced as a whole, so threads sharing a cached
+        # buffer never pair an index with another token.
+        self._last = (None, None)
+        self.types = array('B')
+        self.starts = array('I')
+        self.ends = array('I')
+        self.lines = array('I')
+        self.columns = array('I')
+    
+    @classmethod
+    def from_tokens(cls, tokens: Iterable[Token], source: str) -> 'TokenBuffer':
+        """Pack tokens (a list or a lazy iterator) scanned from source."""
+        buffer = cls(source)
+        line_starts = [0]
+        line_starts.extend(match.end() for match in re.finditer('\n', source))
+        append = buffer.append
+        length = len(source)
+        
+        for token in tokens:
+            token_type = token.type
+            start = line_starts[token.line - 1] + token.column - 1
+            if token_type == TokenType.NEWLINE:
+                end = start + 1
+            elif token_type == TokenType.EOF:
+                end = start
+            elif token_type == TokenType.INTEGER_LITERAL or token_type == TokenType.FLOAT_LITERAL:
+                # The run of digits and dots it was read from, by Scanner.read_number's rule
+                # (str.isdigit(), so not only ASCII digits)
+                end = start + 1
+                while end < length and (source[end].isdigit() or source[end] == '.'):
+                    end += 1
+            elif token_type == TokenType.BOOLEAN_LITERAL:
+                end = start + (4 if token.value else 5)
+            else:
+                end = start + len(token.value)
+            append(token_type, start, end, token.line, token.column)
+        
+        return buffer
+    
+    def append(self, token_type: TokenType, start: int, end: int, line: int, column: int) -> None:
+        """Append one token given its source span and position."""
+        self._last = (None, None)
+        self.types.append(token_type.value)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+        self.columns.append(column)
+    
+    def type_at(self, index: int) -> TokenType:
+        """Get the type of the token at index."""
+        return TOKEN_TYPES[self.types[index]]
+    
+    def value_at(self, index: int) -> Any:
+        """Get the value of the token at index, decoded from the source."""
+        token_type = TOKEN_TYPES[self.types[index]]
+        if token_type == TokenType.EOF:
+            return None
+        if token_type == TokenType.NEWLINE:
+            return '\\n'
+        text = self.source[self.starts[index]:self.ends[index]]
+        if token_type == TokenType.INTEGER_LITERAL:
+            return int(text)
+        if token_type == TokenType.FLOAT_LITERAL:
+            return float(text)
+        if token_type == TokenType.BOOLEAN_LITERAL:
+            return text == 'true'
+        return text
+    
+    def __len__(self) -> int:
+        return len(self.types)
+    
+    def __getitem__(self, index):
+        last_index, last_token = self._last
+        if index == last_index:
+            return last_token
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        token = Token(TOKEN_TYPES[self.types[index]], self.value_at(index),
+                      self.lines[index], self.columns[index])
+        self._last = (index, token)
+        return token
+    
+    def __iter__(self) -> Iterator[Token]:
+        for index in range(len(self.types)):
+            yield self[index]
+    
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Tokens as dicts, in the shape CPPCompilerBridge returns (EOF excluded)."""
+        return [
+            {
+                "type": TOKEN_TYPES[code].name,
+                "value": str(self.value_at(index)),
+                "line": self.lines[index],
+                "column": self.columns[index],
+            }
+            for index, code in enumerate(self.types)
+            if code != TokenType.EOF.value
+        ]
+    
+    def nbytes(self) -> int:
+        """Bytes used by the token columns (excluding the shared source)."""
+        return sum(column.itemsize * len(column)
+                   for column in (self.types, self.starts, self.ends, self.lines, self.columns))
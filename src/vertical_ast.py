@@ -35,34 +35,7 @@ class VerticalTreeVisualizer(ASTVisitor):
     
     def _get_node_info(self, node: ASTNode) -> str:
         """Get display text for a node."""
-        if isinstance(node, Program):
-            return "PROGRAM"
-        elif isinstance(node, VarDeclaration):
-            return f"{node.var_type} {node.name}"
-        elif isinstance(node, Assignment):
-            return f"= {node.name}"
-        elif isinstance(node, PrintStatement):
-            return "PRINT"
-        elif isinstance(node, IfStatement):
-            return "IF"
-        elif isinstance(node, WhileStatement):
-            return "WHILE"
-        elif isinstance(node, Block):
-            return "BLOCK"
-        elif isinstance(node, BinaryOp):
-            return f"OP({node.operator})"
-        elif isinstance(node, UnaryOp):
-            return f"UN({node.operator})"
-        elif isinstance(node, Identifier):
-            return node.name
-        elif isinstance(node, IntegerLiteral):
-            return str(node.value)
-        elif isinstance(node, FloatLiteral):
-            return str(node.value)
-        elif isinstance(node, BooleanLiteral):
-            return str(node.value)
-        else:
-            return node.__class__.__name__
+        return self.visit(node)
     
     def _draw_connections(self, parent_x: int, children_positions: List[int], level: int) -> List[str]:
         """Draw connection lines from parent to children."""
@@ -230,21 +203,21 @@ class VerticalTreeVisualizer(ASTVisitor):
         
         print("=" * 60)
     
-    # Implement required visitor methods (not used in this implementation)
-    def visit_program(self, node: Program): pass
-    def visit_var_declaration(self, node: VarDeclaration): pass
-    def visit_assignment(self, node: Assignment): pass
-    def visit_print_statement(self, node: PrintStatement): pass
-    def visit_if_statement(self, node: IfStatement): pass
-    def visit_while_statement(self, node: WhileStatement): pass
-    def visit_block(self, node: Block): pass
-    def visit_binary_op(self, node: BinaryOp): pass
-    def visit_unary_op(self, node: UnaryOp): pass
-    def visit_identifier(self, node: Identifier): pass
-    def visit_integer_literal(self, node: IntegerLiteral): pass
-    def visit_float_literal(self, node: FloatLiteral): pass
-    def visit_boolean_literal(self, node: BooleanLiteral): pass
-    def visit(self, node: ASTNode): pass
+    # Visitor methods return the display text for each node type
+    def visit_program(self, node: Program): return "PROGRAM"
+    def visit_var_declaration(self, node: VarDeclaration): return f"{node.var_type} {node.name}"
+    def visit_assignment(self, node: Assignment): return f"= {node.name}"
+    def visit_print_statement(self, node: PrintStatement): return "PRINT"
+    def visit_if_statement(self, node: IfStatement): return "IF"
+    def visit_while_statement(self, node: WhileStatement): return "WHILE"
+    def visit_block(self, node: Block): return "BLOCK"
+    def visit_binary_op(self, node: BinaryOp): return f"OP({node.operator})"
+    def visit_unary_op(self, node: UnaryOp): return f"UN({node.operator})"
+    def visit_identifier(self, node: Identifier): return node.name
+    def visit_integer_literal(self, node: IntegerLiteral): return str(node.value)
+    def visit_float_literal(self, node: FloatLiteral): return str(node.value)
+    def visit_boolean_literal(self, node: BooleanLiteral): return str(node.value)
+    def generic_visit(self, node: ASTNode): return node.__class__.__name__
 
 def print_vertical_ast_tree(ast: Program):
     """Print the AST as a vertical tree structure."""
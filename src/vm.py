@@ -0,0 +1,272 @@
+"""
+Stack Virtual Machine for MiniLang compiler.
+Author: Shozab Mehdi (22k-4522), Taha Sharif (22k-4145)
+Course: CS-4031 - Compiler Construction
+
+Runs a BytecodeProgram produced by bytecode.py. Each CodeObject is decoded
+once into a flat list of (opcode, argument) pairs with jump targets
+rebased to list indices; the dispatch loop then works on plain ints.
+Calls push frames on an explicit stack, so deep MiniLang recursion does
+not consume Python stack.
+"""
+
+import io
+import time
+from typing import List
+from bytecode import BytecodeProgram, CodeObject, Op, HAS_ARG, ARG_SIZE
+from interpreter import MiniLangRuntimeError, ExecutionLimitError, format_value, int_divide
+
+JUMP_OPS = (Op.JUMP, Op.JUMP_IF_FALSE, Op.JUMP_IF_FALSE_OR_POP, Op.JUMP_IF_TRUE_OR_POP)
+
+def decode(function: CodeObject) -> List[int]:
+    """Flatten bytecode into [op, arg, op, arg, ...] with jumps rebased to list indices."""
+    code = function.code
+    index_of = {}  # Byte offset -> list index
+    decoded = []
+    offset = 0
+    while offset < len(code):
+        index_of[offset] = len(decoded)
+        op = code[offset]
+        if op >= HAS_ARG:
+            arg = int.from_bytes(code[offset + 1:offset + 1 + ARG_SIZE], 'little')
+            offset += 1 + ARG_SIZE
+        else:
+            arg = 0
+            offset += 1
+        decoded.append(op)
+        decoded.append(arg)
+    index_of[offset] = len(decoded)
+
+    for i in range(0, len(decoded), 2):
+        if decoded[i] in JUMP_OPS:
+            decoded[i + 1] = index_of[decoded[i + 1]]
+    return decoded
+
+class VirtualMachine:
+    """Executes bytecode, capturing everything the program prints."""
+
+    def __init__(self, max_steps: int = 1_000_000, time_limit: float = 5.0,
+                 max_call_depth: int = 10_000):
+        self.max_steps = max_steps
+        self.time_limit = time_limit
+        self.max_call_depth = max_call_depth
+        self.output = io.StringIO()
+        self.errors: List[str] = []
+        self.steps = 0
+
+    def execute(self, program: BytecodeProgram) -> bool:
+        """Run the program. Returns True if it finished without runtime errors."""
+        self.errors = []
+        self.steps = 0
+        try:
+            self.run(program)
+            return True
+        except MiniLangRuntimeError as e:
+            self.errors.append(str(e))
+            return False
+        except OverflowError:
+            # I2F or I2F_LEFT on an int too large for a float
+            self.errors.append(str(MiniLangRuntimeError("Integer too large to convert to float")))
+            return False
+
+    def get_output(self) -> str:
+        """Everything the program printed so far."""
+        return self.output.getvalue()
+
+    def run(self, program: BytecodeProgram) -> None:
+        """The dispatch loop. Steps are charged per loop back-edge and per call, like Interpreter."""
+        functions = [decode(function) for function in program.functions]
+        num_params = [function.num_params for function in program.functions]
+        num_locals = [function.num_locals for function in program.functions]
+        slot_names = [function.slot_names for function in program.functions]
+        constants = program.constants
+        write = self.output.write
+        max_steps = self.max_steps
+        max_call_depth = self.max_call_depth
+        deadline = time.perf_counter() + self.time_limit if self.time_limit else None
+        steps = 0
+
+        LOAD_CONST, LOAD_LOCAL, STORE_LOCAL = Op.LOAD_CONST.value, Op.LOAD_LOCAL.value, Op.STORE_LOCAL.value
+        LOAD_GLOBAL, STORE_GLOBAL = Op.LOAD_GLOBAL.value, Op.STORE_GLOBAL.value
+        JUMP, JUMP_IF_FALSE = Op.JUMP.value, Op.JUMP_IF_FALSE.value
+        JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP = Op.JUMP_IF_FALSE_OR_POP.value, Op.JUMP_IF_TRUE_OR_POP.value
+        CALL, RETURN, PRINT, POP, HALT = Op.CALL.value, Op.RETURN.value, Op.PRINT.value, Op.POP.value, Op.HALT.value
+        ADD_INT, SUB_INT, MUL_INT, DIV_INT = Op.ADD_INT.value, Op.SUB_INT.value, Op.MUL_INT.value, Op.DIV_INT.value
+        ADD_FLOAT, SUB_FLOAT, MUL_FLOAT, DIV_FLOAT = Op.ADD_FLOAT.value, Op.SUB_FLOAT.value, Op.MUL_FLOAT.value, Op.DIV_FLOAT.value
+        LESS, GREATER, LESS_EQUAL, GREATER_EQUAL = Op.LESS.value, Op.GREATER.value, Op.LESS_EQUAL.value, Op.GREATER_EQUAL.value
+        EQUAL, NOT_EQUAL, NOT = Op.EQUAL.value, Op.NOT_EQUAL.value, Op.NOT.value
+        NEG_INT, NEG_FLOAT, I2F, I2F_LEFT = Op.NEG_INT.value, Op.NEG_FLOAT.value, Op.I2F.value, Op.I2F_LEFT.value
+
+        globals_ = [None] * num_locals[0]
+        frames = []  # Saved (code, pc, locals, names) of each caller
+        code = functions[0]
+        names = slot_names[0]
+        locals_ = globals_
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        pc = 0
+
+        try:
+            while True:
+                op = code[pc]
+                arg = code[pc + 1]
+                pc += 2
+
+                if op == LOAD_LOCAL:
+                    value = locals_[arg]
+                    if value is None:
+                        # Its declaration sits in a branch that did not run
+                        raise MiniLangRuntimeError(f"Undefined variable: {names[arg]}")
+                    push(value)
+                elif op == LOAD_CONST:
+                    push(constants[arg])
+                elif op == LOAD_GLOBAL:
+                    value = globals_[arg]
+                    if value is None:
+                        raise MiniLangRuntimeError(f"Undefined variable: {slot_names[0][arg]}")
+                    push(value)
+                elif op == STORE_LOCAL:
+                    locals_[arg] = pop()
+                elif op == STORE_GLOBAL:
+                    globals_[arg] = pop()
+                elif op == ADD_INT or op == ADD_FLOAT:
+                    right = pop()
+                    stack[-1] += right
+                elif op == SUB_INT or op == SUB_FLOAT:
+                    right = pop()
+                    stack[-1] -= right
+                elif op == MUL_INT or op == MUL_FLOAT:
+                    right = pop()
+                    stack[-1] *= right
+                elif op == LESS:
+                    right = pop()
+                    stack[-1] = stack[-1] < right
+                elif op == LESS_EQUAL:
+                    right = pop()
+                    stack[-1] = stack[-1] <= right
+                elif op == GREATER:
+                    right = pop()
+                    stack[-1] = stack[-1] > right
+                elif op == GREATER_EQUAL:
+                    right = pop()
+                    stack[-1] = stack[-1] >= right
+                elif op == EQUAL:
+                    right = pop()
+                    stack[-1] = stack[-1] == right
+                elif op == NOT_EQUAL:
+                    right = pop()
+                    stack[-1] = stack[-1] != right
+                elif op == JUMP_IF_FALSE:
+                    if pop() is not True:
+                        pc = arg
+                elif op == JUMP:
+                    if arg < pc:
+                        steps += 1
+                        if steps > max_steps and max_steps:
+                            raise ExecutionLimitError(f"Step limit of {max_steps} exceeded")
+                        if deadline is not None and steps & 1023 == 0 and time.perf_counter() > deadline:
+                            raise ExecutionLimitError(f"Time limit of {self.time_limit}s exceeded")
+                    pc = arg
+                elif op == CALL:
+                    steps += 1
+                    if steps > max_steps and max_steps:
+                        raise ExecutionLimitError(f"Step limit of {max_steps} exceeded")
+                    if deadline is not None and steps & 1023 == 0 and time.perf_counter() > deadline:
+                        raise ExecutionLimitError(f"Time limit of {self.time_limit}s exceeded")
+                    if len(frames) >= max_call_depth:
+                        raise MiniLangRuntimeError("Maximum recursion depth exceeded")
+                    count = num_params[arg]
+                    if count:
+                        new_locals = stack[-count:]
+                        del stack[-count:]
+                    else:
+                        new_locals = []
+                    extra = num_locals[arg] - count
+                    if extra:
+                        new_locals.extend([None] * extra)
+                    frames.append((code, pc, locals_, names))
+                    code = functions[arg]
+                    names = slot_names[arg]
+                    locals_ = new_locals
+                    pc = 0
+                elif op == RETURN:
+                    if not frames:
+                        raise MiniLangRuntimeError("'return' outside of a function")
+                    code, pc, locals_, names = frames.pop()
+                elif op == DIV_INT:
+                    right = pop()
+                    if right == 0:
+                        raise MiniLangRuntimeError("Division by zero")
+                    stack[-1] = int_divide(stack[-1], right)
+                elif op == DIV_FLOAT:
+                    right = pop()
+                    if right == 0:
+                        raise MiniLangRuntimeError("Division by zero")
+                    stack[-1] /= right
+                elif op == JUMP_IF_FALSE_OR_POP:
+                    if stack[-1] is not True:
+                        pc = arg
+                    else:
+                        pop()
+                elif op == JUMP_IF_TRUE_OR_POP:
+                    if stack[-1] is True:
+                        pc = arg
+                    else:
+                        pop()
+                elif op == NOT:
+                    stack[-1] = not stack[-1]
+                elif op == NEG_INT or op == NEG_FLOAT:
+                    stack[-1] = -stack[-1]
+                elif op == I2F:
+                    stack[-1] = float(stack[-1])
+                elif op == I2F_LEFT:
+                    stack[-2] = float(stack[-2])
+                elif op == PRINT:
+                    write(format_value(pop()))
+                    write('\n')
+                elif op == POP:
+                    pop()
+                elif op == HALT:
+                    return
+                else:
+                    raise MiniLangRuntimeError(f"Unknown opcode: {op}")
+        finally:
+            self.steps = steps
+
+# Test the virtual machine
+if __name__ == "__main__":
+    from scanner import Scanner
+    from parser import Parser
+    from semantic_analyzer import TypeChecker
+    from bytecode import compile_to_bytecode
+
+    test_code = '''
+    function int factorial(int n) {
+        if (n <= 1) {
+            return 1;
+        }
+        return n * factorial(n - 1);
+    }
+
+    int sum = 0;
+    for (int i = 1; i <= 10; i = i + 1) {
+        sum = sum + i;
+    }
+    print(sum);
+    print(factorial(5));
+    print(7 / 2);
+    print(7 / 2.0);
+    '''
+
+    tokens = Scanner(test_code).tokenize()
+    ast = Parser(tokens).parse()
+
+    if ast and TypeChecker().analyze(ast):
+        vm = VirtualMachine()
+        success = vm.execute(compile_to_bytecode(ast))
+        print("Program output:")
+        print("=" * 50)
+        print(vm.get_output(), end="")
+        for error in vm.errors:
+            print(error)
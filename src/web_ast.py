@@ -45,34 +45,37 @@ class WebTreeVisualizer:
             return node.__class__.__name__
     
     def _build_tree(self, node, level=0, is_last=True, prefix=""):
-        """Build tree recursively."""
-        name = self._get_node_name(node)
-        
-        # Create the line for this node
-        if level == 0:
-            # Root node
-            line = name
-        else:
-            # Child nodes
-            connector = "└── " if is_last else "├── "
-            line = prefix + connector + name
-        
-        self.lines.append(line)
-        
-        # Get children
-        children = self._get_children(node)
-        
-        if children:
-            # Calculate new prefix for children
+        """Build the tree depth-first on an explicit stack, so any depth can be drawn."""
+        stack = [(node, level, is_last, prefix)]
+        while stack:
+            node, level, is_last, prefix = stack.pop()
+            name = self._get_node_name(node)
+            
+            # Create the line for this node
             if level == 0:
-                new_prefix = ""
+                # Root node
+                line = name
             else:
-                new_prefix = prefix + ("    " if is_last else "│   ")
+                # Child nodes
+                connector = "└── " if is_last else "├── "
+                line = prefix + connector + name
+            
+            self.lines.append(line)
+            
+            # Get children
+            children = self._get_children(node)
             
-            # Process each child
-            for i, child in enumerate(children):
-                is_last_child = (i == len(children) - 1)
-                self._build_tree(child, level + 1, is_last_child, new_prefix)
+            if children:
+                # Calculate new prefix for children
+                if level == 0:
+                    new_prefix = ""
+                else:
+                    new_prefix = prefix + ("    " if is_last else "│   ")
+                
+                # Push the children last first, so the first is drawn next
+                last = len(children) - 1
+                for i in range(last, -1, -1):
+                    stack.append((children[i], level + 1, i == last, new_prefix))
     
     def _get_children(self, node):
         """Get child nodes."""
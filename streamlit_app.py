@@ -11,6 +11,7 @@ import streamlit as st
 import sys
 from pathlib import Path
 import io
+import os
 import base64
 from typing import Dict, List
 
@@ -26,6 +27,9 @@ from semantic_analyzer import TypeChecker
 from clean_vertical_ast import print_clean_vertical_ast
 from web_ast import get_web_ast_string
 from compiler import MiniLangCompiler
+from interpreter import Interpreter
+from compile_cache import CompileCache
+from tokens import TokenBuffer
 
 # Page configuration
 st.set_page_config(
@@ -421,20 +425,31 @@ def display_tokens(tokens):
     if not tokens:
         return
     
+    if isinstance(tokens, TokenBuffer):
+        # Cached compilations keep a TokenBuffer: read its columns without building Tokens
+        rows = tokens.to_dicts()
+    else:
+        rows = [{"type": token.type.name, "value": str(token.value), "line": token.line, "column": token.column}
+                for token in tokens if token.type.name != 'EOF']  # Skip EOF token
+    
     token_data = []
-    for i, token in enumerate(tokens):
-        if token.type.name != 'EOF':  # Skip EOF token
-            token_data.append({
-                "Index": i + 1,
-                "Type": token.type.name,
-                "Value": str(token.value),
-                "Line": token.line,
-                "Column": token.column
-            })
+    for i, row in enumerate(rows):
+        token_data.append({
+            "Index": i + 1,
+            "Type": row["type"],
+            "Value": row["value"],
+            "Line": row["line"],
+            "Column": row["column"]
+        })
     
     if token_data:
         st.dataframe(token_data, width="stretch")
 
+@st.cache_resource
+def get_compile_cache() -> CompileCache:
+    """One compile cache shared by every session of the app."""
+    return CompileCache(max_entries=256, cache_dir=os.environ.get("MINILANG_CACHE_DIR"))
+
 def capture_ast_output(ast):
     """Capture AST output as clean string for web display."""
     return get_web_ast_string(ast)
@@ -502,6 +517,7 @@ def main():
         show_tokens = st.checkbox("Show Token Analysis", value=True)
         show_ast = st.checkbox("Show AST Tree", value=True)
         show_symbol_table = st.checkbox("Show Symbol Table", value=True)
+        run_program = st.checkbox("Run Program", value=False)
         
         st.header("📖 Language Reference")
         with st.expander("Data Types"):
@@ -574,17 +590,22 @@ function int add(int a, int b) {
         """, unsafe_allow_html=True)
         
         if compile_button and source_code.strip():
-            # Create compiler instance
-            compiler = MiniLangCompiler()
+            # Identical submissions are served from the cache without re-running any phase
+            compile_cache = get_compile_cache()
+            misses_before = compile_cache.misses
+            with st.spinner("Compiling source code..."):
+                record = MiniLangCompiler(cache=compile_cache).compile(source_code)
+            
+            if compile_cache.misses == misses_before:
+                stats = compile_cache.stats()
+                st.caption(f"⚡ Served from compile cache ({stats['hits'] + stats['disk_hits']} hits, "
+                           f"{stats['misses']} misses, {stats['evictions']} evictions)")
             
             # Phase 1: Lexical Analysis
             st.markdown('<div class="phase-header">Phase 1: Lexical Analysis</div>', unsafe_allow_html=True)
             
-            with st.spinner("Tokenizing source code..."):
-                scanner = Scanner(source_code)
-                tokens = scanner.tokenize()
-            
-            if tokens:
+            tokens = record.tokens
+            if record.failed_phase != 'lexical':
                 st.markdown('<div class="success-box">✅ Lexical analysis completed successfully!</div>', unsafe_allow_html=True)
                 st.info(f"Generated {len(tokens)} tokens")
                 
@@ -595,9 +616,9 @@ function int add(int a, int b) {
                 st.markdown('<div class="error-box">❌ Lexical analysis failed!</div>', unsafe_allow_html=True)
                 
                 # Display scanner errors
-                if scanner.errors:
-                    st.error(f"Found {len(scanner.errors)} lexical error(s):")
-                    for i, error in enumerate(scanner.errors, 1):
+                if record.errors:
+                    st.error(f"Found {len(record.errors)} lexical error(s):")
+                    for i, error in enumerate(record.errors, 1):
                         st.markdown(f"**{i}.** {error}")
                 
                 st.stop()
@@ -605,11 +626,8 @@ function int add(int a, int b) {
             # Phase 2: Syntax Analysis
             st.markdown('<div class="phase-header">Phase 2: Syntax Analysis</div>', unsafe_allow_html=True)
             
-            with st.spinner("Parsing tokens into AST..."):
-                parser = Parser(tokens)
-                ast = parser.parse()
-            
-            if ast:
+            ast = record.ast
+            if record.failed_phase != 'syntax':
                 st.markdown('<div class="success-box">✅ Syntax analysis completed successfully!</div>', unsafe_allow_html=True)
                 st.info("Abstract Syntax Tree (AST) generated")
                 
@@ -627,9 +645,9 @@ function int add(int a, int b) {
                 st.markdown('<div class="error-box">❌ Syntax analysis failed!</div>', unsafe_allow_html=True)
                 
                 # Display parser errors
-                if parser.errors:
-                    st.error(f"Found {len(parser.errors)} syntax error(s):")
-                    for i, error in enumerate(parser.errors, 1):
+                if record.errors:
+                    st.error(f"Found {len(record.errors)} syntax error(s):")
+                    for i, error in enumerate(record.errors, 1):
                         st.markdown(f"**{i}.** {error}")
                 
                 st.stop()
@@ -637,26 +655,34 @@ function int add(int a, int b) {
             # Phase 3: Semantic Analysis
             st.markdown('<div class="phase-header">Phase 3: Semantic Analysis</div>', unsafe_allow_html=True)
             
-            with st.spinner("Performing type checking and semantic analysis..."):
-                type_checker = TypeChecker()
-                semantic_success = type_checker.analyze(ast)
-            
-            if semantic_success:
+            if record.success:
                 st.markdown('<div class="success-box">✅ Semantic analysis completed successfully!</div>', unsafe_allow_html=True)
                 st.info("No semantic errors found")
                 
                 if show_symbol_table:
                     with st.expander("View Symbol Table", expanded=False):
-                        display_symbol_table(type_checker.symbol_table)
+                        display_symbol_table(record.symbol_table)
                 
                 # Final success message
                 st.success("🎉 Compilation completed successfully!")
                 
+                if run_program:
+                    st.markdown('<div class="phase-header">Phase 4: Execution</div>', unsafe_allow_html=True)
+                    
+                    with st.spinner("Running program..."):
+                        interpreter = Interpreter()
+                        run_success = interpreter.execute(ast)
+                    
+                    st.code(interpreter.get_output() or "(no output)")
+                    if not run_success:
+                        for error in interpreter.errors:
+                            st.error(error)
+                
             else:
                 st.markdown('<div class="error-box">❌ Semantic analysis failed!</div>', unsafe_allow_html=True)
-                st.error(f"Found {len(type_checker.errors)} semantic errors:")
+                st.error(f"Found {len(record.errors)} semantic errors:")
                 
-                for i, error in enumerate(type_checker.errors, 1):
+                for i, error in enumerate(record.errors, 1):
                     st.error(f"{i}. {error.message}")
         
         elif compile_button: